@@ -0,0 +1,340 @@
+import datetime
+import json
+import logging
+import os
+import re
+from decimal import Decimal
+
+from email_repository import EmailRepository
+from s3 import S3GzipStreamWriter
+
+# Configure logging
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+BUCKET_NAME = os.getenv("BUCKET_NAME")
+
+# Partitions whose whole month is older than this are archived to S3
+EMAIL_RETENTION_MONTHS = int(os.getenv("EMAIL_RETENTION_MONTHS", "12"))
+# Monthly partitions are created this many months ahead of the current one
+EMAIL_PARTITION_PREMAKE_MONTHS = int(os.getenv("EMAIL_PARTITION_PREMAKE_MONTHS", "2"))
+EMAIL_ARCHIVE_S3_KEY_PREFIX = "archives/emails"
+
+# Calculate batch size to avoid RDS Data API 1MB limit
+RDS_DATA_API_SAFE_BATCH_SIZE = 500  # Safe limit to avoid 1MB response size
+# Stop starting new partitions when less time than this is left
+MIN_REMAINING_TIME_MS = 5 * 60 * 1000
+
+PARTITION_BOUND_PATTERN = re.compile(
+    r"FOR VALUES FROM \((?:'(?P<start>[^']+)'|MINVALUE)\) TO \('(?P<end>[^']+)'\)"
+)
+
+
+class DecimalEncoder(json.JSONEncoder):
+    """Custom JSON encoder for Decimal objects."""
+
+    def default(self, o: object) -> object:
+        if isinstance(o, Decimal):
+            return float(o)
+        return super().default(o)
+
+
+def add_months(month_start: datetime.datetime, months: int) -> datetime.datetime:
+    """Return the first instant of the month `months` after month_start."""
+    month_index = month_start.year * 12 + month_start.month - 1 + months
+    return month_start.replace(year=month_index // 12, month=month_index % 12 + 1)
+
+
+def parse_partition_bound(
+    partition_bound: str,
+) -> tuple[datetime.datetime | None, datetime.datetime] | None:
+    """
+    Parse the range of a partition from its bound expression.
+
+    :param partition_bound: e.g. "FOR VALUES FROM ('2026-01-01 00:00:00+00') TO ('2026-02-01 00:00:00+00')"
+    :return: (range_start, range_end), range_start is None for MINVALUE; None
+        for the default partition
+    """
+    match = PARTITION_BOUND_PATTERN.fullmatch(partition_bound)
+    if not match:
+        return None
+    range_start = (
+        datetime.datetime.fromisoformat(match["start"]) if match["start"] else None
+    )
+    return range_start, datetime.datetime.fromisoformat(match["end"])
+
+
+def create_upcoming_partitions(
+    email_repo: EmailRepository,
+    partition_ranges: list[tuple[datetime.datetime | None, datetime.datetime]],
+    current_month: datetime.datetime,
+) -> list[str]:
+    """
+    Create the monthly partitions from the end of the existing ones up to
+    EMAIL_PARTITION_PREMAKE_MONTHS ahead, so that new emails never land in the
+    default partition.
+
+    :param email_repo: The email repository
+    :param partition_ranges: Ranges of the existing partitions
+    :param current_month: First instant of the current month
+    :return: Names of the created partitions
+    """
+    range_start = max([current_month, *(end for _, end in partition_ranges)])
+    horizon = add_months(current_month, EMAIL_PARTITION_PREMAKE_MONTHS + 1)
+
+    created_partitions = []
+    while range_start < horizon:
+        range_end = add_months(range_start, 1)
+        partition_name = f"emails_p{range_start:%Y%m}"
+        if email_repo.has_default_partition_emails(range_start, range_end):
+            # PostgreSQL refuses a partition whose rows sit in the default one
+            logger.warning(
+                "Default partition holds emails of %s, not creating %s",
+                f"{range_start:%Y-%m}",
+                partition_name,
+            )
+        else:
+            email_repo.create_email_partition(partition_name, range_start, range_end)
+            created_partitions.append(partition_name)
+            logger.info("Created partition %s", partition_name)
+        range_start = range_end
+
+    return created_partitions
+
+
+def write_partition_archives(
+    email_repo: EmailRepository,
+    partition_name: str,
+    range_start: datetime.datetime | None,
+    range_end: datetime.datetime,
+) -> int:
+    """
+    Write the emails of a partition range to S3, one gzipped NDJSON object per
+    run, and record the objects in email_archives. The records stay inactive
+    until the rows leave EMAILS.
+
+    :param email_repo: The email repository
+    :param partition_name: Name the archives are recorded under
+    :param range_start: Inclusive lower bound of the range, None for MINVALUE
+    :param range_end: Exclusive upper bound of the range
+    :return: The number of archived emails
+    """
+    archived_count = 0
+    email_archive = None
+    writer = None
+    cursor = None
+    try:
+        while True:
+            emails = email_repo.list_partition_emails(
+                range_start, range_end, RDS_DATA_API_SAFE_BATCH_SIZE, cursor
+            )
+            for email in emails:
+                if email_archive is None or email["run_id"] != email_archive["run_id"]:
+                    if email_archive:
+                        writer.close()
+                        email_repo.upsert_email_archive(email_archive)
+                    email_archive = {
+                        "run_id": email["run_id"],
+                        "partition_name": partition_name,
+                        "s3_object_key": f"{EMAIL_ARCHIVE_S3_KEY_PREFIX}/{partition_name}/{email['run_id']}.ndjson.gz",
+                        "email_count": 0,
+                        "status_counts": {},
+                        # The rows of a run come in (created_at, email_id) order
+                        "first_created_at": email["created_at"],
+                    }
+                    writer = S3GzipStreamWriter(
+                        BUCKET_NAME, email_archive["s3_object_key"]
+                    )
+
+                writer.write(
+                    json.dumps(email, cls=DecimalEncoder, ensure_ascii=False) + "\n"
+                )
+                email_archive["email_count"] += 1
+                email_archive["last_created_at"] = email["created_at"]
+                status_counts = email_archive["status_counts"]
+                status_counts[email["status"]] = (
+                    status_counts.get(email["status"], 0) + 1
+                )
+            archived_count += len(emails)
+
+            if len(emails) < RDS_DATA_API_SAFE_BATCH_SIZE:
+                break
+
+            # Keyset: the next page starts right after the last archived row
+            cursor = {
+                "run_id": emails[-1]["run_id"],
+                "created_at": emails[-1]["created_at"],
+                "email_id": emails[-1]["email_id"],
+            }
+
+        if email_archive:
+            writer.close()
+            email_repo.upsert_email_archive(email_archive)
+            writer = None
+    except Exception:
+        if writer:
+            writer.abort()
+        raise
+
+    return archived_count
+
+
+def archive_partition(
+    email_repo: EmailRepository,
+    partition_name: str,
+    range_start: datetime.datetime | None,
+    range_end: datetime.datetime,
+) -> int:
+    """
+    Archive the emails of a partition to S3, then detach the partition, mark
+    its archives and drop it.
+
+    A run interrupted before the detach leaves the partition attached and its
+    archive records inactive, so the next run simply archives it again. A run
+    interrupted after the detach is finished by finish_detached_partitions.
+
+    :param email_repo: The email repository
+    :param partition_name: Name of the partition
+    :param range_start: Inclusive lower bound of the partition, None for MINVALUE
+    :param range_end: Exclusive upper bound of the partition
+    :return: The number of archived emails
+    """
+    archived_count = write_partition_archives(
+        email_repo, partition_name, range_start, range_end
+    )
+
+    # Reads switch from the partition to the archives between these two steps
+    email_repo.detach_email_partition(partition_name)
+    email_repo.mark_email_archives_archived(partition_name)
+    email_repo.drop_email_partition(partition_name)
+
+    logger.info(
+        "Archived %d emails of partition %s to S3", archived_count, partition_name
+    )
+    return archived_count
+
+
+def finish_detached_partitions(email_repo: EmailRepository) -> list[str]:
+    """
+    Mark the archives of the partitions an interrupted run already detached,
+    then drop them. Both steps are idempotent.
+
+    :param email_repo: The email repository
+    :return: Names of the finished partitions
+    """
+    partition_names = email_repo.list_detached_archived_partitions()
+    for partition_name in partition_names:
+        email_repo.mark_email_archives_archived(partition_name)
+        email_repo.drop_email_partition(partition_name)
+        logger.info("Finished archiving detached partition %s", partition_name)
+    return partition_names
+
+
+def archive_default_partition_month(
+    email_repo: EmailRepository, month_start: datetime.datetime
+) -> int:
+    """
+    Archive the emails of one month held by the default partition. No
+    partition covers that month, so the rows of the range all live in the
+    default partition. They are deleted in the statement that marks their
+    archives, and an interrupted run is simply repeated.
+
+    :param email_repo: The email repository
+    :param month_start: First instant of the month
+    :return: The number of archived emails
+    """
+    month_end = add_months(month_start, 1)
+    partition_name = f"emails_default_{month_start:%Y%m}"
+    archived_count = write_partition_archives(
+        email_repo, partition_name, month_start, month_end
+    )
+    email_repo.delete_archived_default_partition_emails(
+        partition_name, month_start, month_end
+    )
+
+    logger.info(
+        "Archived %d emails of %s from the default partition to S3",
+        archived_count,
+        f"{month_start:%Y-%m}",
+    )
+    return archived_count
+
+
+def lambda_handler(event: dict[str, any], context: object) -> dict[str, any]:
+    """
+    Lambda function handler, run on a schedule, that creates the upcoming
+    monthly EMAILS partitions and archives the expired ones to S3.
+    """
+    if event.get("action") == "PREWARM":
+        logger.info("Received a prewarm request. Skipping business logic.")
+        return {"statusCode": 200, "body": "Successfully warmed up"}
+
+    email_repo = EmailRepository()
+
+    partitions = email_repo.list_email_partitions()
+    if not partitions:
+        logger.warning(
+            "EMAILS is not partitioned, apply migrations/partition-emails.sql first"
+        )
+        return {
+            "statusCode": 200,
+            "body": json.dumps({"message": "EMAILS is not partitioned"}),
+        }
+
+    # Partitions an interrupted run detached are no longer listed below
+    finished_partitions = finish_detached_partitions(email_repo)
+
+    partition_ranges = {}
+    for partition in partitions:
+        partition_range = parse_partition_bound(partition["partition_bound"])
+        if partition_range:
+            partition_ranges[partition["partition_name"]] = partition_range
+
+    now = datetime.datetime.now(datetime.UTC)
+    current_month = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+    created_partitions = create_upcoming_partitions(
+        email_repo, list(partition_ranges.values()), current_month
+    )
+
+    retention_start = add_months(current_month, -EMAIL_RETENTION_MONTHS)
+    expired_partitions = sorted(
+        (
+            (partition_name, range_start, range_end)
+            for partition_name, (range_start, range_end) in partition_ranges.items()
+            if range_end <= retention_start
+        ),
+        key=lambda expired_partition: expired_partition[2],
+    )
+
+    archived_partitions = []
+    for partition_name, range_start, range_end in expired_partitions:
+        if context.get_remaining_time_in_millis() < MIN_REMAINING_TIME_MS:
+            logger.info(
+                "Leaving %d expired partition(s) for the next run",
+                len(expired_partitions) - len(archived_partitions),
+            )
+            break
+        archive_partition(email_repo, partition_name, range_start, range_end)
+        archived_partitions.append(partition_name)
+
+    # Months that had no partition when their emails were written
+    archived_default_months = []
+    for month_start in email_repo.list_default_partition_months(retention_start):
+        if context.get_remaining_time_in_millis() < MIN_REMAINING_TIME_MS:
+            logger.info("Leaving default partition months for the next run")
+            break
+        month_start = datetime.datetime.fromisoformat(month_start).replace(
+            tzinfo=datetime.UTC
+        )
+        archive_default_partition_month(email_repo, month_start)
+        archived_default_months.append(f"{month_start:%Y-%m}")
+
+    result = {
+        "created_partitions": created_partitions,
+        "finished_partitions": finished_partitions,
+        "archived_partitions": archived_partitions,
+        "archived_default_months": archived_default_months,
+    }
+    logger.info("Partition maintenance finished: %s", result)
+    return {"statusCode": 200, "body": json.dumps(result)}
@@ -0,0 +1,126 @@
+import datetime
+import json
+import logging
+import os
+import re
+
+import boto3
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+# "data_api" (default) or "postgres"
+DATABASE_BACKEND = os.getenv("DATABASE_BACKEND", "data_api")
+DATABASE_NAME = os.getenv("DATABASE_NAME")
+# RDS Proxy endpoint in production, a local Postgres in tests
+DATABASE_HOST = os.getenv("DATABASE_HOST")
+DATABASE_PORT = int(os.getenv("DATABASE_PORT", "5432"))
+DATABASE_USER = os.getenv("DATABASE_USER")
+DATABASE_PASSWORD = os.getenv("DATABASE_PASSWORD")
+DATABASE_SSLMODE = os.getenv("DATABASE_SSLMODE", "prefer")
+DATABASE_POOL_MAX_SIZE = int(os.getenv("DATABASE_POOL_MAX_SIZE", "2"))
+RDS_CLUSTER_MASTER_USER_SECRET_ARN = os.getenv("RDS_CLUSTER_MASTER_USER_SECRET_ARN")
+
+# Data API style ':name' placeholders, skipping '::type' casts
+NAMED_PARAMETER_PATTERN = re.compile(r"(?<![:\w]):([A-Za-z_]\w*)")
+# Timestamps are rendered the way the Data API returns them
+DATA_API_TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S.%f"
+
+_postgres_client = None
+
+
+def get_postgres_client():
+    """
+    Return the container-wide PostgresClient when DATABASE_BACKEND is
+    'postgres', None when the repositories should use the RDS Data API.
+    """
+    global _postgres_client
+    if DATABASE_BACKEND != "postgres":
+        return None
+    if _postgres_client is None:
+        _postgres_client = PostgresClient()
+    return _postgres_client
+
+
+class PostgresClient:
+    """Executes Data API style statements over a pooled PostgreSQL connection"""
+
+    def __init__(self):
+        # Only needed by the postgres backend
+        from psycopg.rows import dict_row
+        from psycopg_pool import ConnectionPool
+
+        user, password = self._get_credentials()
+        self._pool = ConnectionPool(
+            conninfo="",
+            min_size=1,
+            max_size=DATABASE_POOL_MAX_SIZE,
+            kwargs={
+                "host": DATABASE_HOST,
+                "port": DATABASE_PORT,
+                "dbname": DATABASE_NAME,
+                "user": user,
+                "password": password,
+                "sslmode": DATABASE_SSLMODE,
+                "autocommit": True,
+                "row_factory": dict_row,
+            },
+            open=True,
+        )
+
+    def execute(self, sql, parameters, fetch=False):
+        """
+        Execute a statement written for the RDS Data API.
+
+        :param sql: SQL with ':name' placeholders
+        :param parameters: Data API parameter list
+        :param fetch: Whether to return the result rows
+        :return: List of rows as dicts if fetch, otherwise None
+        """
+        query = NAMED_PARAMETER_PATTERN.sub(r"%(\1)s", sql.replace("%", "%%"))
+        values = {
+            parameter["name"]: self._to_python_value(parameter)
+            for parameter in parameters or []
+        }
+
+        with self._pool.connection() as connection:
+            with connection.cursor() as cursor:
+                cursor.execute(query, values)
+                if not fetch:
+                    return None
+                rows = cursor.fetchall()
+
+        for row in rows:
+            for column, value in row.items():
+                if isinstance(value, datetime.datetime):
+                    row[column] = self._format_timestamp(value)
+        return rows
+
+    def _to_python_value(self, parameter):
+        """Convert a Data API parameter value to a driver value"""
+        value = parameter["value"]
+        if value.get("isNull"):
+            return None
+        for key in ("stringValue", "longValue", "doubleValue", "booleanValue"):
+            if key in value:
+                # Strings are sent untyped, PostgreSQL infers JSONB/TIMESTAMP
+                # from the column just like the Data API typeHint does
+                return value[key]
+        raise ValueError(f"Unsupported parameter value: {parameter}")
+
+    def _format_timestamp(self, value):
+        """Render a timestamp as the Data API would, in UTC"""
+        if value.tzinfo is not None:
+            value = value.astimezone(datetime.UTC).replace(tzinfo=None)
+        return value.strftime(DATA_API_TIMESTAMP_FORMAT)
+
+    def _get_credentials(self):
+        """Read the user and password from the environment or the cluster secret"""
+        if DATABASE_USER and DATABASE_PASSWORD:
+            return DATABASE_USER, DATABASE_PASSWORD
+
+        secret = boto3.client("secretsmanager").get_secret_value(
+            SecretId=RDS_CLUSTER_MASTER_USER_SECRET_ARN
+        )
+        secret_value = json.loads(secret["SecretString"])
+        return secret_value["username"], secret_value["password"]
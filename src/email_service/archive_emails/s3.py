@@ -0,0 +1,113 @@
+import logging
+import zlib
+
+import boto3
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+# S3 requires every part of a multipart upload except the last one to be at least 5 MiB
+MULTIPART_UPLOAD_PART_SIZE = 8 * 1024 * 1024
+
+s3_client = boto3.client("s3")
+
+
+class S3GzipStreamWriter:
+    """
+    Gzip text as it is written and stream it to S3 as a multipart upload.
+
+    At most one part of compressed data is held in memory at a time, so the
+    memory footprint does not depend on the size of the exported object.
+    """
+
+    def __init__(self, bucket: str, key: str):
+        self._bucket = bucket
+        self._key = key
+        # wbits=31 produces a gzip container instead of a raw zlib stream
+        self._compressor = zlib.compressobj(level=6, wbits=31)
+        self._buffer = bytearray()
+        self._parts = []
+        response = s3_client.create_multipart_upload(
+            Bucket=bucket,
+            Key=key,
+            ContentType="application/gzip",
+        )
+        self._upload_id = response["UploadId"]
+        logger.info("Started multipart upload for s3://%s/%s", bucket, key)
+
+    def write(self, text: str) -> None:
+        """
+        Compress text and upload a part whenever enough data is buffered.
+
+        :param text: The text to append to the object
+        """
+        self._buffer += self._compressor.compress(text.encode("utf-8"))
+        if len(self._buffer) >= MULTIPART_UPLOAD_PART_SIZE:
+            self._upload_part()
+
+    def close(self) -> None:
+        """Flush the compressor, upload the last part and complete the upload."""
+        self._buffer += self._compressor.flush()
+        self._upload_part()
+        s3_client.complete_multipart_upload(
+            Bucket=self._bucket,
+            Key=self._key,
+            UploadId=self._upload_id,
+            MultipartUpload={"Parts": self._parts},
+        )
+        logger.info(
+            "Completed multipart upload for s3://%s/%s with %d part(s)",
+            self._bucket,
+            self._key,
+            len(self._parts),
+        )
+
+    def abort(self) -> None:
+        """Abort the upload so that no incomplete parts are left behind."""
+        try:
+            s3_client.abort_multipart_upload(
+                Bucket=self._bucket, Key=self._key, UploadId=self._upload_id
+            )
+            logger.info(
+                "Aborted multipart upload for s3://%s/%s", self._bucket, self._key
+            )
+        except Exception as e:
+            logger.error("Error aborting multipart upload: %s", e)
+
+    def _upload_part(self) -> None:
+        """Upload the buffered compressed bytes as the next part."""
+        if not self._buffer and self._parts:
+            return
+        part_number = len(self._parts) + 1
+        response = s3_client.upload_part(
+            Bucket=self._bucket,
+            Key=self._key,
+            UploadId=self._upload_id,
+            PartNumber=part_number,
+            Body=bytes(self._buffer),
+        )
+        self._parts.append({"ETag": response["ETag"], "PartNumber": part_number})
+        self._buffer = bytearray()
+
+
+def generate_presigned_download_url(
+    bucket: str, key: str, file_name: str, expires_in: int
+) -> str:
+    """
+    Generate a presigned GET URL for an object.
+
+    :param bucket: The name of the S3 bucket
+    :param key: The key of the object
+    :param file_name: The file name suggested to the browser
+    :param expires_in: Number of seconds the URL stays valid
+    :return: The presigned URL
+    """
+    return s3_client.generate_presigned_url(
+        "get_object",
+        Params={
+            "Bucket": bucket,
+            "Key": key,
+            "ResponseContentDisposition": f'attachment; filename="{file_name}"',
+        },
+        ExpiresIn=expires_in,
+    )
@@ -192,7 +192,7 @@ class EmailRepository:
             sql_string = f"""
                 INSERT INTO emails ({columns_str})
                 VALUES ({placeholders})
-                ON CONFLICT (email_id)
+                ON CONFLICT (email_id, created_at)
                 DO UPDATE SET {update_str}
             """
 
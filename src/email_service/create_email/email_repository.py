@@ -11,6 +11,23 @@ logger.setLevel(logging.INFO)
 
 JSONB_COLUMNS = {"bcc", "cc", "attachment_file_ids", "row_data"}
 TIMESTAMP_COLUMNS = {"created_at", "sent_at", "updated_at"}
+# "denormalized" (default) copies the run-level values into every email row,
+# "normalized" stores only the per-recipient columns and reads the run-level
+# values from runs through the EMAILS_WITH_RUN view
+EMAIL_STORAGE_MODE = os.getenv("EMAIL_STORAGE_MODE", "denormalized")
+RUN_LEVEL_EMAIL_COLUMNS = {
+    "attachment_file_ids",
+    "bcc",
+    "cc",
+    "display_name",
+    "reply_to",
+    "sender_id",
+    "sender_local_part",
+    "sender_username",
+    "spreadsheet_file_id",
+    "subject",
+    "template_file_id",
+}
 
 DATABASE_NAME = os.environ["DATABASE_NAME"]
 RDS_CLUSTER_ARN = os.environ["RDS_CLUSTER_ARN"]
@@ -168,7 +185,10 @@ class EmailRepository:
                 email["created_at"] = now_utc
             email["updated_at"] = now_utc  # Always set/update updated_at
 
-            columns = list(email.keys())
+            if EMAIL_STORAGE_MODE == "normalized":
+                columns = [k for k in email if k not in RUN_LEVEL_EMAIL_COLUMNS]
+            else:
+                columns = list(email.keys())
             columns_str = ", ".join(columns)
             placeholders = ", ".join(f":{k}" for k in columns)
             # Ensure updated_at is part of the update set
@@ -189,10 +209,11 @@ class EmailRepository:
             # update_str = ", ".join(update_clauses)
             # For now, relying on EXCLUDED.updated_at (which we set to now_utc) is fine.
 
+            # created_at is the partition key, so it is part of the primary key
             sql_string = f"""
                 INSERT INTO emails ({columns_str})
                 VALUES ({placeholders})
-                ON CONFLICT (email_id)
+                ON CONFLICT (email_id, created_at)
                 DO UPDATE SET {update_str}
             """
 
@@ -205,9 +226,9 @@ class EmailRepository:
                     )
 
             sql_parameters = []
-            for k, v in email.items():
+            for k in columns:
                 sql_parameters.append(
-                    self._create_param(k, v)
+                    self._create_param(k, email[k])
                 )  # Use the new _create_param
 
             self._execute(sql_string, sql_parameters)
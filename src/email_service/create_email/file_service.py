@@ -1,5 +1,6 @@
 import logging
 import os
+from collections import OrderedDict
 
 import requests
 
@@ -8,10 +9,16 @@ logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
 
+# File records never change after upload, so they are kept for the lifetime of
+# the container instead of being fetched again for every email
+FILE_INFO_CACHE_MAX_SIZE = int(os.getenv("FILE_INFO_CACHE_MAX_SIZE", "256"))
+
+
 class FileService:
     def __init__(self):
         environment = os.getenv("ENVIRONMENT")
         self.base_url = f"https://{environment}-file-service-internal-api-tpet.aws-educate.tw/{environment}"
+        self._file_info_cache = OrderedDict()
 
     def get_file_info(self, file_id, access_token):
         """
@@ -24,6 +31,11 @@ class FileService:
         Returns:
         dict: File information or raises an exception on error
         """
+        file_info = self._file_info_cache.get(file_id)
+        if file_info is not None:
+            self._file_info_cache.move_to_end(file_id)
+            return file_info
+
         api_url = f"{self.base_url}/files/{file_id}"
         headers = {
             "Authorization": f"Bearer {access_token}",
@@ -33,10 +45,15 @@ class FileService:
         try:
             response = requests.get(url=api_url, headers=headers, timeout=25)
             response.raise_for_status()
-            return response.json()
+            file_info = response.json()
         except requests.exceptions.Timeout:
             logger.error("Request timed out for file_id: %s", file_id)
             raise
         except requests.exceptions.RequestException as e:
             logger.error("Error in get_file_info: %s", e)
             raise
+
+        self._file_info_cache[file_id] = file_info
+        if len(self._file_info_cache) > FILE_INFO_CACHE_MAX_SIZE:
+            self._file_info_cache.popitem(last=False)
+        return file_info
@@ -6,7 +6,7 @@ import time_util
 from current_user_util import current_user_util
 from data_util import convert_float_to_decimal
 from email_repository import EmailRepository
-from s3 import read_sheet_data_from_s3
+from s3 import read_sheet_data_from_s3, read_sheet_sidecar_from_s3
 from sqs import delete_sqs_message, get_sqs_message, send_message_to_queue
 
 from file_service import FileService
@@ -118,8 +118,17 @@ def build_recipient_list_from_sqs_message(sqs_message: dict) -> list[dict]:
             sqs_message["spreadsheet_file_id"],
             current_user_util.get_current_user_access_token(),
         )
-        spreadsheet_s3_object_key = spreadsheet_info["s3_object_key"]
-        sheet_data, _ = read_sheet_data_from_s3(spreadsheet_s3_object_key)
+        spreadsheet_sidecar_s3_object_key = spreadsheet_info.get(
+            "spreadsheet_sidecar_s3_object_key"
+        )
+        if spreadsheet_sidecar_s3_object_key:
+            # Parsed once by the file service when the sheet was uploaded
+            sheet_data, _ = read_sheet_sidecar_from_s3(
+                spreadsheet_sidecar_s3_object_key
+            )
+        else:
+            spreadsheet_s3_object_key = spreadsheet_info["s3_object_key"]
+            sheet_data, _ = read_sheet_data_from_s3(spreadsheet_s3_object_key)
         logger.info("Read sheet data from S3: %s", sheet_data)
         return sheet_data
     else:  # DIRECT mode
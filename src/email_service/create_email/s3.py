@@ -39,6 +39,36 @@ def read_sheet_data_from_s3(spreadsheet_file_s3_key):
         raise
 
 
+def read_sheet_sidecar_from_s3(spreadsheet_sidecar_s3_key):
+    """
+    Read the Parquet sidecar the file service stores for uploaded spreadsheets,
+    which returns the same rows as read_sheet_data_from_s3 without parsing
+    Excel XML.
+
+    :param spreadsheet_sidecar_s3_key: The key of the sidecar in the bucket.
+    :return: The rows and the column names.
+    """
+    try:
+        s3 = boto3.client("s3")
+        request = s3.get_object(Bucket=BUCKET_NAME, Key=spreadsheet_sidecar_s3_key)
+        sheet_data = pd.read_parquet(
+            io.BytesIO(request["Body"].read()), engine="pyarrow"
+        )
+        # Parquet reads empty text cells as None where read_excel gives NaN
+        for column in sheet_data.select_dtypes(include="object").columns:
+            sheet_data[column] = sheet_data[column].where(
+                sheet_data[column].notna(), float("nan")
+            )
+        rows = sheet_data.to_dict(orient="records")
+        if sheet_data.empty:
+            return [], 0
+        logger.info("Read sheet sidecar from S3 key: %s", spreadsheet_sidecar_s3_key)
+        return rows, sheet_data.columns.tolist()
+    except Exception as e:
+        logger.error("Error in read sheet sidecar from s3: %s", e)
+        raise
+
+
 def read_file_from_s3(bucket_name, s3_key):
     """
     Read the content of a file from S3 bucket.
@@ -0,0 +1,125 @@
+import json
+import logging
+import os
+import uuid
+
+import time_util
+from botocore.exceptions import ClientError
+from s3 import put_json_object
+from sqs import send_message_to_queue
+
+# Configure logging
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+BUCKET_NAME = os.getenv("BUCKET_NAME")
+EXPORT_EMAILS_SQS_QUEUE_URL = os.getenv("EXPORT_EMAILS_SQS_QUEUE_URL")
+EXPORT_S3_KEY_PREFIX = "exports/runs"
+
+SUPPORTED_EXPORT_FORMATS = ("ndjson", "csv")
+DEFAULT_EXPORT_FORMAT = "ndjson"
+
+
+def export_job_key(run_id: str, job_id: str) -> str:
+    """The S3 key of the state object of an export job"""
+    return f"{EXPORT_S3_KEY_PREFIX}/{run_id}/jobs/{job_id}.json"
+
+
+def lambda_handler(event: dict[str, any], context: object) -> dict[str, any]:
+    """
+    Lambda function handler queueing the export of a run's emails to S3.
+
+    The file is built by export_emails_worker; the client polls
+    GET /runs/{run_id}/emails/export/{job_id} for its download URL.
+    """
+    aws_request_id = context.aws_request_id
+
+    if event.get("action") == "PREWARM":
+        logger.info("Received a prewarm request. Skipping business logic.")
+        return {"statusCode": 200, "body": "Successfully warmed up"}
+
+    path_parameters = event.get("pathParameters") or {}
+    run_id: str | None = path_parameters.get("run_id")
+    if not run_id:
+        logger.error("Missing run_id in path parameters")
+        return {
+            "statusCode": 400,
+            "body": json.dumps({"message": "Missing run_id in path parameters"}),
+        }
+
+    query_params = event.get("queryStringParameters") or {}
+    export_format = query_params.get("format", DEFAULT_EXPORT_FORMAT).lower()
+    status: str | None = query_params.get("status")
+    if export_format not in SUPPORTED_EXPORT_FORMATS:
+        return {
+            "statusCode": 400,
+            "body": json.dumps(
+                {
+                    "message": f"Invalid format: {export_format}. Valid formats are: {', '.join(SUPPORTED_EXPORT_FORMATS)}"
+                }
+            ),
+        }
+
+    created_at = time_util.get_current_utc_time()
+    job_id = uuid.uuid4().hex
+    file_name = f"{run_id}_emails_{created_at.replace(':', '-')}.{export_format}.gz"
+    export_job = {
+        "job_id": job_id,
+        "run_id": run_id,
+        "format": export_format,
+        "status": status,
+        "job_status": "PENDING",
+        "s3_object_key": f"{EXPORT_S3_KEY_PREFIX}/{run_id}/{file_name}",
+        "file_name": file_name,
+        "total_items": None,
+        "error": None,
+        "created_at": created_at,
+        "updated_at": created_at,
+    }
+
+    try:
+        if not EXPORT_EMAILS_SQS_QUEUE_URL:
+            raise ValueError(
+                "EXPORT_EMAILS_SQS_QUEUE_URL environment variable not set."
+            )
+        put_json_object(BUCKET_NAME, export_job_key(run_id, job_id), export_job)
+        send_message_to_queue(EXPORT_EMAILS_SQS_QUEUE_URL, export_job)
+    except ClientError as e:
+        logger.error("Failed to queue the export: %s", e)
+        return {
+            "statusCode": 500,
+            "body": json.dumps(
+                {
+                    "message": f"Error exporting emails: {e} Request Id: {aws_request_id}",
+                }
+            ),
+        }
+    except Exception as e:
+        logger.error("An unexpected error occurred: %s", e)
+        return {
+            "statusCode": 500,
+            "body": json.dumps(
+                {
+                    "message": f"An unexpected error occurred: {e} Request Id: {aws_request_id}",
+                }
+            ),
+        }
+
+    logger.info("Queued export job %s of run %s", job_id, run_id)
+    result = {
+        "job_id": job_id,
+        "run_id": run_id,
+        "format": export_format,
+        "status": status,
+        "job_status": "PENDING",
+        "status_url": f"/runs/{run_id}/emails/export/{job_id}",
+        "created_at": created_at,
+    }
+
+    return {
+        "statusCode": 202,
+        "headers": {
+            "Content-Type": "application/json",
+        },
+        "body": json.dumps(result),
+    }
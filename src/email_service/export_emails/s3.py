@@ -0,0 +1,25 @@
+import json
+import logging
+
+import boto3
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+s3_client = boto3.client("s3")
+
+
+def put_json_object(bucket: str, key: str, data: dict) -> None:
+    """
+    Write a JSON object, e.g. the state of an export job.
+
+    :param bucket: The name of the S3 bucket
+    :param key: The key of the object
+    :param data: The data to write
+    """
+    s3_client.put_object(
+        Bucket=bucket,
+        Key=key,
+        Body=json.dumps(data).encode("utf-8"),
+        ContentType="application/json",
+    )
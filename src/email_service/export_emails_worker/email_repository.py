@@ -0,0 +1,530 @@
+import json
+import logging
+import os
+from decimal import Decimal  # Added import
+
+import boto3
+import time_util
+from postgres_client import get_postgres_client
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+JSONB_COLUMNS = {"bcc", "cc", "attachment_file_ids", "row_data", "status_counts"}
+TIMESTAMP_COLUMNS = {"created_at", "sent_at", "updated_at"}
+
+DATABASE_NAME = os.environ["DATABASE_NAME"]
+RDS_CLUSTER_ARN = os.environ["RDS_CLUSTER_ARN"]
+RDS_CLUSTER_MASTER_USER_SECRET_ARN = os.environ["RDS_CLUSTER_MASTER_USER_SECRET_ARN"]
+
+
+# Custom JSON encoder to handle Decimal types
+class DecimalEncoder(json.JSONEncoder):
+    """Custom JSON encoder for Decimal objects."""
+
+    def default(self, o: object) -> object:
+        if isinstance(o, Decimal):
+            return float(o)
+        return super().default(o)
+
+
+def parse_field(col_name, field):
+    """
+    Parse field values returned by RDS Data API
+
+    :param col_name: Field name
+    :param field: Field value returned by RDS Data API
+    :return: Converted Python type value
+    """
+    # Handle NULL values
+    if "isNull" in field and field["isNull"]:
+        return None
+
+    # Handle basic types
+    if "stringValue" in field:
+        value = field["stringValue"]
+        # Handle JSONB type
+        if col_name in JSONB_COLUMNS:
+            try:
+                return json.loads(value)
+            except json.JSONDecodeError:
+                # If cannot be parsed as JSON, return the original string
+                return value
+        return value
+    if "longValue" in field:
+        return field["longValue"]
+    elif "doubleValue" in field:
+        return field["doubleValue"]
+    elif "booleanValue" in field:
+        return field["booleanValue"]
+    elif "blobValue" in field:
+        return field["blobValue"]
+
+    # Handle array types
+    elif "arrayValue" in field:
+        array = field["arrayValue"]
+
+        # Handle various array types
+        if "stringValues" in array:
+            return array["stringValues"]
+        elif "longValues" in array:
+            return array["longValues"]
+        elif "doubleValues" in array:
+            return array["doubleValues"]
+        elif "booleanValues" in array:
+            return array["booleanValues"]
+        elif "arrayValues" in array:
+            # Recursively process nested arrays
+            return [parse_field(col_name, v) for v in array["arrayValues"]]
+        # Empty array
+        return []
+
+    # If type cannot be identified, return the original field
+    return field
+
+
+# Data API field key holding the values of each PostgreSQL type,
+# every type not listed here is returned as a stringValue
+DATA_API_VALUE_KEYS = {
+    "bool": "booleanValue",
+    "int2": "longValue",
+    "int4": "longValue",
+    "int8": "longValue",
+    "serial": "longValue",
+    "bigserial": "longValue",
+    "float4": "doubleValue",
+    "float8": "doubleValue",
+    "bytea": "blobValue",
+}
+
+
+def decode_json_column(col_name, values):
+    """
+    Decode the JSONB strings of one column with a single json.loads call
+
+    :param col_name: Column name
+    :param values: The column's raw strings, None for NULL
+    :return: The decoded values
+    """
+    present_values = [value for value in values if value is not None]
+    try:
+        decoded_values = json.loads("[" + ",".join(present_values) + "]")
+    except json.JSONDecodeError:
+        decoded_values = None
+    if decoded_values is None or len(decoded_values) != len(present_values):
+        # Decode cell by cell, parse_field keeps strings that are not JSON
+        return [
+            None if value is None else parse_field(col_name, {"stringValue": value})
+            for value in values
+        ]
+
+    decoded_iter = iter(decoded_values)
+    return [None if value is None else next(decoded_iter) for value in values]
+
+
+def decode_records(column_metadata, records):
+    """
+    Decode a Data API result set column by column. The decoder of each column
+    is picked once from columnMetadata instead of inspecting every cell, and
+    JSONB columns are decoded in bulk.
+
+    :param column_metadata: columnMetadata of the Data API response
+    :param records: records of the Data API response
+    :return: List of rows as dicts
+    """
+    if not records:
+        return []
+
+    columns = []
+    decoded_columns = []
+    for index, col in enumerate(column_metadata):
+        col_name = col["name"]
+        columns.append(col_name)
+        value_key = DATA_API_VALUE_KEYS.get(col.get("typeName"), "stringValue")
+        first_value = next(
+            (record[index] for record in records if not record[index].get("isNull")),
+            None,
+        )
+        if first_value is not None and value_key not in first_value:
+            # Arrays and unexpected value types keep the generic parse_field
+            decoded_columns.append(
+                [parse_field(col_name, record[index]) for record in records]
+            )
+            continue
+
+        # NULL cells only carry isNull, so they decode to None
+        values = [record[index].get(value_key) for record in records]
+        if value_key == "stringValue" and col_name in JSONB_COLUMNS:
+            values = decode_json_column(col_name, values)
+        decoded_columns.append(values)
+
+    return [
+        dict(zip(columns, row, strict=True))
+        for row in zip(*decoded_columns, strict=True)
+    ]
+
+
+class EmailRepositoryError(Exception):
+    """Email repository error"""
+
+    def __init__(self, message, sql=None, params=None, original_exception=None):
+        super().__init__(message)
+        self.sql = sql
+        self.params = params
+        self.original_exception = original_exception
+
+
+class EmailRepository:
+    """Email data access layer"""
+
+    def __init__(self):
+        """Initialize email repository"""
+        self._rds_data = boto3.client("rds-data")
+        self._database_name = DATABASE_NAME
+        self._resource_arn = RDS_CLUSTER_ARN
+        self._secret_arn = RDS_CLUSTER_MASTER_USER_SECRET_ARN
+        # Pooled PostgreSQL connection when DATABASE_BACKEND=postgres
+        self._postgres_client = get_postgres_client()
+
+    def list_emails(self, filter_criteria_dict):
+        """Get email list"""
+        # Build base SQL
+        # Run-level values of normalized rows are joined from runs
+        sql_string = "SELECT * FROM emails_with_run WHERE 1=1 "
+        sql_parameters_list = []
+
+        # Add filter conditions
+        sql_string, sql_parameters_list = self._add_filtering_sql(
+            sql_string_in=sql_string,
+            sql_parameters_list_out=sql_parameters_list,
+            filter_criteria_dict=filter_criteria_dict,
+        )
+
+        # Add sorting
+        sort_by = filter_criteria_dict.get("sort_by", "created_at")
+        sort_order = filter_criteria_dict.get("sort_order", "DESC").upper()
+
+        # Continue after the cursor row instead of skipping rows with OFFSET
+        cursor = filter_criteria_dict.get("cursor")
+        if cursor:
+            if sort_by != "created_at":
+                raise ValueError("Cursor pagination is only supported for created_at")
+            sql_string, sql_parameters_list = self._add_keyset_sql(
+                sql_string_in=sql_string,
+                sql_parameters_list_out=sql_parameters_list,
+                cursor_dict=cursor,
+                sort_order=sort_order,
+            )
+
+        # Add a secondary, unique sort key to ensure stable pagination
+        sql_string += f" ORDER BY {sort_by} {sort_order}, email_id {sort_order}"
+
+        # Add pagination
+        sql_string, sql_parameters_list = self._add_pagination_sql(
+            sql_string_in=sql_string,
+            sql_parameters_list_out=sql_parameters_list,
+            pagination_criteria_dict=filter_criteria_dict,
+        )
+
+        # Execute query
+        emails = self._execute(sql_string, sql_parameters_list, fetch=True)
+
+        return emails
+
+    def count_emails(self, filter_criteria_dict):
+        """Count emails matching the criteria"""
+        sql_string = "SELECT COUNT(*) as count FROM emails WHERE 1=1 "
+        sql_parameters_list = []
+
+        # Add filter conditions
+        sql_string, sql_parameters_list = self._add_filtering_sql(
+            sql_string_in=sql_string,
+            sql_parameters_list_out=sql_parameters_list,
+            filter_criteria_dict=filter_criteria_dict,
+        )
+
+        # Execute query
+        result = self._execute(sql_string, sql_parameters_list, fetch=True)
+        return result[0]["count"] if result else 0
+
+    def get_email_by_id(self, run_id, email_id):
+        """Get a single email by ID"""
+        sql_string = "SELECT * FROM emails_with_run WHERE run_id = :run_id AND email_id = :email_id"
+        sql_parameters = [
+            {"name": "run_id", "value": {"stringValue": run_id}},
+            {"name": "email_id", "value": {"stringValue": email_id}},
+        ]
+        results = self._execute(sql_string, sql_parameters, fetch=True)
+        return results[0] if results else None
+
+    def list_email_archives(self, run_id):
+        """
+        Get the S3 archives holding the emails of a run's archived partitions
+
+        :param run_id: The run ID
+        :return: List of dicts with s3_object_key, email_count and status_counts
+        """
+        sql_string = """
+            SELECT s3_object_key, email_count, status_counts
+            FROM email_archives
+            WHERE run_id = :run_id AND archived_at IS NOT NULL
+            ORDER BY partition_name
+        """
+        sql_parameters = [{"name": "run_id", "value": {"stringValue": run_id}}]
+        return self._execute(sql_string, sql_parameters, fetch=True)
+
+    def upsert_email(self, email):
+        """Insert or update email"""
+        try:
+            now_utc = time_util.get_current_utc_time()
+            if "created_at" not in email:
+                email["created_at"] = now_utc
+            email["updated_at"] = now_utc  # Always set/update updated_at
+
+            columns = list(email.keys())
+            columns_str = ", ".join(columns)
+            placeholders = ", ".join(f":{k}" for k in columns)
+            # Ensure updated_at is part of the update set
+            # run_id and email_id are part of the conflict target, created_at should not change on update
+            update_cols = [
+                k for k in columns if k not in ("run_id", "email_id", "created_at")
+            ]
+            # If 'updated_at' was not already in update_cols (e.g. if it was in the exclusion list before)
+            # ensure it's added for the SET clause.
+            # However, by adding it to the email dict unconditionally above, it will be in 'columns'
+            # and thus included here if not in the exclusion list.
+            # The current exclusion list is ("run_id", "email_id", "created_at"), so updated_at will be included.
+
+            update_str = ", ".join(f"{k} = EXCLUDED.{k}" for k in update_cols)
+            # If we wanted to be absolutely certain updated_at is set to current time on update:
+            # update_clauses = [f"{k} = EXCLUDED.{k}" for k in update_cols if k != "updated_at"]
+            # update_clauses.append("updated_at = CURRENT_TIMESTAMP") # Or use EXCLUDED.updated_at if now_utc is passed
+            # update_str = ", ".join(update_clauses)
+            # For now, relying on EXCLUDED.updated_at (which we set to now_utc) is fine.
+
+            sql_string = f"""
+                INSERT INTO emails ({columns_str})
+                VALUES ({placeholders})
+                ON CONFLICT (email_id, created_at)
+                DO UPDATE SET {update_str}
+            """
+
+            # Handle JSONB fields serialization before creating params
+            for column in JSONB_COLUMNS:
+                if column in email and not isinstance(email[column], str):
+                    email[column] = json.dumps(
+                        email[column],
+                        cls=DecimalEncoder,  # Use DecimalEncoder here
+                    )
+
+            sql_parameters = []
+            for k, v in email.items():
+                sql_parameters.append(
+                    self._create_param(k, v)
+                )  # Use the new _create_param
+
+            self._execute(sql_string, sql_parameters)
+            return email.get("email_id")
+        except Exception as e:
+            logger.error("Error saving email: %s", e)
+            return None
+
+    def delete_email(self, run_id, email_id):
+        """Delete email"""
+        sql_string = (
+            "DELETE FROM emails WHERE run_id = :run_id AND email_id = :email_id"
+        )
+        sql_parameters = [
+            {"name": "run_id", "value": {"stringValue": run_id}},
+            {"name": "email_id", "value": {"stringValue": email_id}},
+        ]
+        self._execute(sql_string, sql_parameters)
+
+    def update_email_status(self, run_id, email_id, status):
+        """Update email status"""
+        now = time_util.get_current_utc_time()
+        sql_string = """
+            UPDATE emails
+            SET status = :status, sent_at = :sent_at, updated_at = :updated_at
+            WHERE run_id = :run_id AND email_id = :email_id
+        """
+        sql_parameters = [
+            self._create_param("status", status),
+            self._create_param(
+                "sent_at", now
+            ),  # 'now' is from time_util.get_current_utc_time()
+            self._create_param(
+                "updated_at", now
+            ),  # 'now' is from time_util.get_current_utc_time()
+            self._create_param("run_id", run_id),
+            self._create_param("email_id", email_id),
+        ]
+        self._execute(sql_string, sql_parameters)
+
+    def _add_filtering_sql(
+        self,
+        sql_string_in: str,
+        sql_parameters_list_out: list,
+        filter_criteria_dict: dict,
+    ):
+        """Add filter conditions to SQL statement"""
+        current_sql_string = sql_string_in
+        # Extract filter conditions from filter_criteria_dict
+        # The 'filters' key itself is not expected directly inside filter_criteria_dict based on usage.
+        # We iterate directly over filter_criteria_dict for relevant keys.
+
+        processed_filters = {}
+        for key, value in filter_criteria_dict.items():
+            if (
+                key
+                not in (
+                    "page",
+                    "limit",
+                    "offset",
+                    "cursor",
+                    "sort_by",
+                    "sort_order",
+                )  # Exclude pagination/sorting keys
+                and value is not None
+            ):
+                processed_filters[key] = value
+
+        # Build WHERE clause
+        for key, value in processed_filters.items():
+            if value is not None:  # Redundant check, but kept for safety
+                current_sql_string += f" AND {key} = :{key}"
+                sql_parameters_list_out.append(self._create_param(key, value))
+
+        return current_sql_string, sql_parameters_list_out
+
+    def _add_pagination_sql(
+        self,
+        sql_string_in: str,
+        sql_parameters_list_out: list,
+        pagination_criteria_dict: dict,
+    ):
+        """Add pagination to SQL statement"""
+        current_sql_string = sql_string_in
+        limit = int(pagination_criteria_dict.get("limit", 10))
+        if "offset" in pagination_criteria_dict:
+            offset = int(pagination_criteria_dict["offset"])
+        elif pagination_criteria_dict.get("cursor"):
+            # The keyset condition already positions the page
+            offset = 0
+        else:
+            page = int(pagination_criteria_dict.get("page", 1))
+            offset = (page - 1) * limit
+
+        current_sql_string += " LIMIT :limit OFFSET :offset"
+        sql_parameters_list_out.append({"name": "limit", "value": {"longValue": limit}})
+        sql_parameters_list_out.append(
+            {"name": "offset", "value": {"longValue": offset}}
+        )
+
+        return current_sql_string, sql_parameters_list_out
+
+    def _add_keyset_sql(
+        self,
+        sql_string_in: str,
+        sql_parameters_list_out: list,
+        cursor_dict: dict,
+        sort_order: str,
+    ):
+        """Add a (created_at, email_id) keyset condition to SQL statement"""
+        comparator = "<" if sort_order == "DESC" else ">"
+        current_sql_string = (
+            sql_string_in
+            + f" AND (created_at, email_id) {comparator} (:cursor_created_at, :cursor_email_id)"
+        )
+        sql_parameters_list_out.append(
+            {
+                "name": "cursor_created_at",
+                "value": {
+                    "stringValue": self._format_cursor_timestamp(
+                        cursor_dict["created_at"]
+                    )
+                },
+                "typeHint": "TIMESTAMP",
+            }
+        )
+        sql_parameters_list_out.append(
+            {
+                "name": "cursor_email_id",
+                "value": {"stringValue": cursor_dict["email_id"]},
+            }
+        )
+        return current_sql_string, sql_parameters_list_out
+
+    def _format_cursor_timestamp(self, value: str) -> str:
+        """Normalize a cursor timestamp to the format expected by RDS Data API"""
+        try:
+            dt_obj = time_util.parse_iso8601_to_datetime(value)
+            return time_util.format_datetime_for_rds(dt_obj)
+        except ValueError:
+            # Already in the 'YYYY-MM-DD HH:MM:SS[.ffffff]' form returned by RDS
+            return value
+
+    def _create_param(self, key, value):
+        """Create SQL parameter"""
+        if value is None:
+            return {"name": key, "value": {"isNull": True}}
+
+        if isinstance(value, bool):
+            return {"name": key, "value": {"booleanValue": value}}
+        elif isinstance(value, int):
+            return {"name": key, "value": {"longValue": value}}
+        elif key in JSONB_COLUMNS and isinstance(value, str):
+            return {
+                "name": key,
+                "value": {"stringValue": value},
+                "typeHint": "JSON",
+            }
+        elif key in TIMESTAMP_COLUMNS and isinstance(value, str):
+            # Assume value is an ISO 8601 string from time_util
+            try:
+                dt_obj = time_util.parse_iso8601_to_datetime(value)
+                formatted_ts = time_util.format_datetime_for_rds(dt_obj)
+                return {
+                    "name": key,
+                    "value": {"stringValue": formatted_ts},
+                    "typeHint": "TIMESTAMP",
+                }
+            except ValueError:  # Should not happen if time_util is used consistently
+                logger.warning(
+                    "Could not parse timestamp string '%s' for key '%s'. Sending as string.",
+                    value,
+                    key,
+                )
+                return {"name": key, "value": {"stringValue": str(value)}}
+        else:
+            return {"name": key, "value": {"stringValue": str(value)}}
+
+    def _execute(self, sql, parameters, fetch=False):
+        """Execute SQL query"""
+        try:
+            if os.getenv("DEBUG_SQL", "false").lower() == "true":
+                logger.debug("Executing SQL:\n%s\nParams:\n%s", sql, parameters)
+
+            if self._postgres_client:
+                return self._postgres_client.execute(sql, parameters, fetch)
+
+            response = self._rds_data.execute_statement(
+                resourceArn=self._resource_arn,
+                secretArn=self._secret_arn,
+                database=self._database_name,
+                sql=sql,
+                parameters=parameters,
+                includeResultMetadata=True if fetch else False,
+            )
+
+            if not fetch:
+                return None
+
+            return decode_records(response["columnMetadata"], response["records"])
+        except Exception as e:
+            logger.error(
+                "SQL execution failed: %s\nSQL: %s\nParams: %s", e, sql, parameters
+            )
+            raise EmailRepositoryError(
+                "SQL execution failed", sql, parameters, e
+            ) from e
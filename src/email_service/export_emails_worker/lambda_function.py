@@ -0,0 +1,250 @@
+import csv
+import io
+import json
+import logging
+import os
+from decimal import Decimal
+
+import time_util
+from email_repository import EmailRepository
+from s3 import (
+    S3GzipStreamWriter,
+    get_json_object,
+    iter_gzip_ndjson_object,
+    put_json_object,
+)
+
+# Configure logging
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+BUCKET_NAME = os.getenv("BUCKET_NAME")
+
+# Calculate batch size to avoid RDS Data API 1MB limit
+RDS_DATA_API_SAFE_BATCH_SIZE = 500  # Safe limit to avoid 1MB response size
+EXPORT_S3_KEY_PREFIX = "exports/runs"
+
+# Column order of the CSV export, matching the EMAILS table
+EMAIL_EXPORT_COLUMNS = [
+    "email_id",
+    "run_id",
+    "recipient_email",
+    "status",
+    "subject",
+    "display_name",
+    "template_file_id",
+    "spreadsheet_file_id",
+    "attachment_file_ids",
+    "cc",
+    "bcc",
+    "reply_to",
+    "sender_id",
+    "sender_local_part",
+    "sender_username",
+    "is_generate_certificate",
+    "row_data",
+    "created_at",
+    "sent_at",
+    "updated_at",
+]
+
+
+class DecimalEncoder(json.JSONEncoder):
+    """Custom JSON encoder for Decimal objects."""
+
+    def default(self, o: object) -> object:
+        if isinstance(o, Decimal):
+            return float(o)
+        return super().default(o)
+
+
+def format_emails_as_ndjson(emails: list[dict[str, any]]) -> str:
+    """Serialize a page of emails as newline-delimited JSON."""
+    return "".join(
+        json.dumps(email, cls=DecimalEncoder, ensure_ascii=False) + "\n"
+        for email in emails
+    )
+
+
+def format_emails_as_csv(emails: list[dict[str, any]], include_header: bool) -> str:
+    """Serialize a page of emails as CSV rows, JSONB columns as JSON text."""
+    output = io.StringIO()
+    writer = csv.writer(output)
+    if include_header:
+        writer.writerow(EMAIL_EXPORT_COLUMNS)
+    for email in emails:
+        row = []
+        for column in EMAIL_EXPORT_COLUMNS:
+            value = email.get(column)
+            if isinstance(value, list | dict):
+                value = json.dumps(value, cls=DecimalEncoder, ensure_ascii=False)
+            row.append("" if value is None else value)
+        writer.writerow(row)
+    return output.getvalue()
+
+
+def export_emails_to_s3(
+    email_repo: EmailRepository,
+    run_id: str,
+    status: str | None,
+    export_format: str,
+    s3_key: str,
+) -> int:
+    """
+    Stream all emails of a run to a gzipped object on S3, one page at a time.
+    Emails of archived partitions are older than every row left in EMAILS, so
+    their archives are written first to keep the created_at order.
+
+    :param email_repo: The email repository
+    :param run_id: The run whose emails are exported
+    :param status: Optional status filter
+    :param export_format: Either 'ndjson' or 'csv'
+    :param s3_key: The key of the exported object
+    :return: The number of exported emails
+    """
+    filter_criteria = {
+        "run_id": run_id,
+        "limit": RDS_DATA_API_SAFE_BATCH_SIZE,
+        "sort_by": "created_at",
+        "sort_order": "ASC",
+    }
+    if status:
+        filter_criteria["status"] = status
+
+    email_archives = email_repo.list_email_archives(run_id)
+
+    writer = S3GzipStreamWriter(BUCKET_NAME, s3_key)
+    exported_count = 0
+    header_written = False
+
+    def write_emails(emails: list[dict[str, any]]) -> None:
+        nonlocal exported_count, header_written
+        if not emails and header_written:
+            return
+        if export_format == "csv":
+            writer.write(
+                format_emails_as_csv(emails, include_header=not header_written)
+            )
+            header_written = True
+        else:
+            writer.write(format_emails_as_ndjson(emails))
+        exported_count += len(emails)
+
+    try:
+        for email_archive in email_archives:
+            # Archives are streamed, one batch of lines in memory at a time
+            archived_emails = []
+            for email in iter_gzip_ndjson_object(
+                BUCKET_NAME, email_archive["s3_object_key"]
+            ):
+                if status and email.get("status") != status:
+                    continue
+                archived_emails.append(email)
+                if len(archived_emails) >= RDS_DATA_API_SAFE_BATCH_SIZE:
+                    write_emails(archived_emails)
+                    archived_emails = []
+            write_emails(archived_emails)
+
+        while True:
+            emails = email_repo.list_emails(filter_criteria) or []
+            write_emails(emails)
+
+            if len(emails) < RDS_DATA_API_SAFE_BATCH_SIZE:
+                break
+
+            # Keyset: the next page starts right after the last exported row
+            filter_criteria["cursor"] = {
+                "created_at": emails[-1]["created_at"],
+                "email_id": emails[-1]["email_id"],
+            }
+
+        writer.close()
+    except Exception:
+        writer.abort()
+        raise
+
+    logger.info("Exported %d emails of run %s to %s", exported_count, run_id, s3_key)
+    return exported_count
+
+
+def export_job_key(run_id: str, job_id: str) -> str:
+    """The S3 key of the state object of an export job"""
+    return f"{EXPORT_S3_KEY_PREFIX}/{run_id}/jobs/{job_id}.json"
+
+
+def save_export_job(export_job: dict[str, any], job_status: str, **changes) -> None:
+    """
+    Update the state of an export job, read by GET /runs/{run_id}/emails/export/{job_id}.
+
+    :param export_job: The export job, updated in place
+    :param job_status: The new job status
+    :param changes: Other fields to set on the job
+    """
+    export_job.update(changes)
+    export_job["job_status"] = job_status
+    export_job["updated_at"] = time_util.get_current_utc_time()
+    put_json_object(
+        BUCKET_NAME,
+        export_job_key(export_job["run_id"], export_job["job_id"]),
+        export_job,
+    )
+
+
+def process_export_job(email_repo: EmailRepository, message: dict[str, any]) -> None:
+    """
+    Build the export file of a job queued by POST /runs/{run_id}/emails/export.
+
+    :param email_repo: The email repository
+    :param message: The SQS message, with the run_id and job_id of the job
+    """
+    run_id = message["run_id"]
+    job_id = message["job_id"]
+    # The job state was written when it was queued
+    export_job = get_json_object(BUCKET_NAME, export_job_key(run_id, job_id)) or dict(
+        message
+    )
+    if export_job["job_status"] == "SUCCEEDED":
+        # A redelivered message of a finished job
+        logger.info("Export job %s already succeeded, skipping", job_id)
+        return
+
+    save_export_job(export_job, "RUNNING")
+    try:
+        exported_count = export_emails_to_s3(
+            email_repo,
+            run_id,
+            export_job.get("status"),
+            export_job["format"],
+            export_job["s3_object_key"],
+        )
+    except Exception as e:
+        save_export_job(export_job, "FAILED", error=str(e))
+        raise
+
+    save_export_job(
+        export_job,
+        "SUCCEEDED",
+        total_items=exported_count,
+        exported_at=time_util.get_current_utc_time(),
+        error=None,
+    )
+
+
+def lambda_handler(event: dict[str, any], context: object) -> dict[str, any]:
+    """
+    Lambda function handler building the export files of queued export jobs.
+
+    :param event: The SQS event with one export job per record
+    :param context: The context object providing runtime information
+    :return: The records that failed, to be retried by SQS
+    """
+    email_repo = EmailRepository()
+    batch_item_failures = []
+    for record in event.get("Records", []):
+        try:
+            process_export_job(email_repo, json.loads(record["body"]))
+        except Exception as e:
+            logger.error("Error processing export job: %s", e)
+            batch_item_failures.append({"itemIdentifier": record["messageId"]})
+
+    return {"batchItemFailures": batch_item_failures}
@@ -0,0 +1,141 @@
+import gzip
+import io
+import json
+import logging
+import zlib
+from collections.abc import Iterator
+
+import boto3
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+# S3 requires every part of a multipart upload except the last one to be at least 5 MiB
+MULTIPART_UPLOAD_PART_SIZE = 8 * 1024 * 1024
+
+s3_client = boto3.client("s3")
+
+
+class S3GzipStreamWriter:
+    """
+    Gzip text as it is written and stream it to S3 as a multipart upload.
+
+    At most one part of compressed data is held in memory at a time, so the
+    memory footprint does not depend on the size of the exported object.
+    """
+
+    def __init__(self, bucket: str, key: str):
+        self._bucket = bucket
+        self._key = key
+        # wbits=31 produces a gzip container instead of a raw zlib stream
+        self._compressor = zlib.compressobj(level=6, wbits=31)
+        self._buffer = bytearray()
+        self._parts = []
+        response = s3_client.create_multipart_upload(
+            Bucket=bucket,
+            Key=key,
+            ContentType="application/gzip",
+        )
+        self._upload_id = response["UploadId"]
+        logger.info("Started multipart upload for s3://%s/%s", bucket, key)
+
+    def write(self, text: str) -> None:
+        """
+        Compress text and upload a part whenever enough data is buffered.
+
+        :param text: The text to append to the object
+        """
+        self._buffer += self._compressor.compress(text.encode("utf-8"))
+        if len(self._buffer) >= MULTIPART_UPLOAD_PART_SIZE:
+            self._upload_part()
+
+    def close(self) -> None:
+        """Flush the compressor, upload the last part and complete the upload."""
+        self._buffer += self._compressor.flush()
+        self._upload_part()
+        s3_client.complete_multipart_upload(
+            Bucket=self._bucket,
+            Key=self._key,
+            UploadId=self._upload_id,
+            MultipartUpload={"Parts": self._parts},
+        )
+        logger.info(
+            "Completed multipart upload for s3://%s/%s with %d part(s)",
+            self._bucket,
+            self._key,
+            len(self._parts),
+        )
+
+    def abort(self) -> None:
+        """Abort the upload so that no incomplete parts are left behind."""
+        try:
+            s3_client.abort_multipart_upload(
+                Bucket=self._bucket, Key=self._key, UploadId=self._upload_id
+            )
+            logger.info(
+                "Aborted multipart upload for s3://%s/%s", self._bucket, self._key
+            )
+        except Exception as e:
+            logger.error("Error aborting multipart upload: %s", e)
+
+    def _upload_part(self) -> None:
+        """Upload the buffered compressed bytes as the next part."""
+        if not self._buffer and self._parts:
+            return
+        part_number = len(self._parts) + 1
+        response = s3_client.upload_part(
+            Bucket=self._bucket,
+            Key=self._key,
+            UploadId=self._upload_id,
+            PartNumber=part_number,
+            Body=bytes(self._buffer),
+        )
+        self._parts.append({"ETag": response["ETag"], "PartNumber": part_number})
+        self._buffer = bytearray()
+
+
+def iter_gzip_ndjson_object(bucket: str, key: str) -> Iterator[dict]:
+    """
+    Stream a gzipped NDJSON object, e.g. an email archive, line by line so
+    that only one line is decoded in memory at a time.
+
+    :param bucket: The name of the S3 bucket
+    :param key: The key of the object
+    :return: Iterator of the decoded lines
+    """
+    response = s3_client.get_object(Bucket=bucket, Key=key)
+    with gzip.GzipFile(fileobj=response["Body"]) as body:
+        for line in io.TextIOWrapper(body, encoding="utf-8"):
+            if line.strip():
+                yield json.loads(line)
+
+
+def get_json_object(bucket: str, key: str) -> dict | None:
+    """
+    Read a JSON object, e.g. the state of an export job.
+
+    :param bucket: The name of the S3 bucket
+    :param key: The key of the object
+    :return: The decoded object, or None if it does not exist
+    """
+    try:
+        response = s3_client.get_object(Bucket=bucket, Key=key)
+    except s3_client.exceptions.NoSuchKey:
+        return None
+    return json.loads(response["Body"].read())
+
+
+def put_json_object(bucket: str, key: str, data: dict) -> None:
+    """
+    Write a JSON object, e.g. the state of an export job.
+
+    :param bucket: The name of the S3 bucket
+    :param key: The key of the object
+    :param data: The data to write
+    """
+    s3_client.put_object(
+        Bucket=bucket,
+        Key=key,
+        Body=json.dumps(data).encode("utf-8"),
+        ContentType="application/json",
+    )
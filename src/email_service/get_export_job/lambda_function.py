@@ -0,0 +1,87 @@
+import json
+import logging
+import os
+import re
+
+from botocore.exceptions import ClientError
+from s3 import generate_presigned_download_url, get_json_object
+
+# Configure logging
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+BUCKET_NAME = os.getenv("BUCKET_NAME")
+
+PRESIGNED_URL_EXPIRES_IN = 3600  # Seconds
+EXPORT_S3_KEY_PREFIX = "exports/runs"
+# job_id as issued by POST /runs/{run_id}/emails/export
+JOB_ID_PATTERN = re.compile(r"[0-9a-f]{32}")
+
+
+def export_job_key(run_id: str, job_id: str) -> str:
+    """The S3 key of the state object of an export job"""
+    return f"{EXPORT_S3_KEY_PREFIX}/{run_id}/jobs/{job_id}.json"
+
+
+def lambda_handler(event: dict[str, any], context: object) -> dict[str, any]:
+    """
+    Lambda function handler returning the state of an export job, with the
+    download URL of the file once the job succeeded.
+    """
+    aws_request_id = context.aws_request_id
+
+    if event.get("action") == "PREWARM":
+        logger.info("Received a prewarm request. Skipping business logic.")
+        return {"statusCode": 200, "body": "Successfully warmed up"}
+
+    path_parameters = event.get("pathParameters") or {}
+    run_id: str | None = path_parameters.get("run_id")
+    job_id: str | None = path_parameters.get("job_id")
+    if not run_id or not job_id:
+        logger.error("Missing run_id or job_id in path parameters")
+        return {
+            "statusCode": 400,
+            "body": json.dumps(
+                {"message": "Missing run_id or job_id in path parameters"}
+            ),
+        }
+    if not JOB_ID_PATTERN.fullmatch(job_id):
+        return {
+            "statusCode": 404,
+            "body": json.dumps({"message": "Export job not found"}),
+        }
+
+    try:
+        export_job = get_json_object(BUCKET_NAME, export_job_key(run_id, job_id))
+        if not export_job:
+            return {
+                "statusCode": 404,
+                "body": json.dumps({"message": "Export job not found"}),
+            }
+
+        if export_job["job_status"] == "SUCCEEDED":
+            export_job["download_url"] = generate_presigned_download_url(
+                BUCKET_NAME,
+                export_job["s3_object_key"],
+                export_job["file_name"],
+                PRESIGNED_URL_EXPIRES_IN,
+            )
+            export_job["expires_in"] = PRESIGNED_URL_EXPIRES_IN
+    except ClientError as e:
+        logger.error("Failed to read export job %s: %s", job_id, e)
+        return {
+            "statusCode": 500,
+            "body": json.dumps(
+                {
+                    "message": f"Error reading the export job: {e} Request Id: {aws_request_id}",
+                }
+            ),
+        }
+
+    return {
+        "statusCode": 200,
+        "headers": {
+            "Content-Type": "application/json",
+        },
+        "body": json.dumps(export_job),
+    }
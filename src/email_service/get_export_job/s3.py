@@ -0,0 +1,47 @@
+import json
+import logging
+
+import boto3
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+s3_client = boto3.client("s3")
+
+
+def get_json_object(bucket: str, key: str) -> dict | None:
+    """
+    Read a JSON object, e.g. the state of an export job.
+
+    :param bucket: The name of the S3 bucket
+    :param key: The key of the object
+    :return: The decoded object, or None if it does not exist
+    """
+    try:
+        response = s3_client.get_object(Bucket=bucket, Key=key)
+    except s3_client.exceptions.NoSuchKey:
+        return None
+    return json.loads(response["Body"].read())
+
+
+def generate_presigned_download_url(
+    bucket: str, key: str, file_name: str, expires_in: int
+) -> str:
+    """
+    Generate a presigned GET URL for an object.
+
+    :param bucket: The name of the S3 bucket
+    :param key: The key of the object
+    :param file_name: The file name suggested to the browser
+    :param expires_in: Number of seconds the URL stays valid
+    :return: The presigned URL
+    """
+    return s3_client.generate_presigned_url(
+        "get_object",
+        Params={
+            "Bucket": bucket,
+            "Key": key,
+            "ResponseContentDisposition": f'attachment; filename="{file_name}"',
+        },
+        ExpiresIn=expires_in,
+    )
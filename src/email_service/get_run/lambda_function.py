@@ -1,8 +1,11 @@
+import hashlib
 import json
 import logging
+import os
+import time
 
 from botocore.exceptions import ClientError
-from run_repository import RunRepository
+from run_repository import RUN_COLUMNS, RUN_VERSION_COLUMNS, RunRepository
 
 # current_user_util might be needed if we enforce run access by sender_id
 # from current_user_util import CurrentUserUtil
@@ -14,6 +17,103 @@ logger.setLevel(logging.INFO)
 # No DecimalEncoder needed as RunRepository's parse_field should handle it.
 # No extract_query_params needed for get_run by ID.
 
+RUN_COUNTER_FIELDS = (
+    "failed_email_count",
+    "expected_email_send_count",
+    "success_email_count",
+)
+
+# Progress polls within this window are answered from memory
+RUN_CACHE_TTL_SECONDS = float(os.getenv("RUN_CACHE_TTL_SECONDS", "2"))
+RUN_CACHE_MAX_ENTRIES = 256
+
+# Reused across invocations of the same container
+run_repo = RunRepository()
+# (run_id, fields) -> (expires_at, etag, run_item)
+_run_cache: dict[tuple, tuple[float, str, dict]] = {}
+
+
+def build_etag(run_id: str, fields: list[str] | None, run_version: dict) -> str:
+    """Build a strong ETag from the columns that change while a run progresses."""
+    version = [run_id, fields] + [
+        run_version.get(column) for column in RUN_VERSION_COLUMNS
+    ]
+    digest = hashlib.sha256(json.dumps(version).encode("utf-8")).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Check an If-None-Match header against the current ETag."""
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or any(
+        candidate.removeprefix("W/") == etag for candidate in candidates
+    )
+
+
+def get_header(event: dict[str, any], name: str) -> str | None:
+    """Case-insensitive lookup of a request header."""
+    for key, value in (event.get("headers") or {}).items():
+        if key.lower() == name:
+            return value
+    return None
+
+
+def get_cached_run(cache_key: tuple) -> tuple[str, dict] | None:
+    """Return the cached (etag, run_item) if it has not expired yet."""
+    cached = _run_cache.get(cache_key)
+    if not cached:
+        return None
+    expires_at, etag, run_item = cached
+    if expires_at < time.monotonic():
+        _run_cache.pop(cache_key, None)
+        return None
+    return etag, run_item
+
+
+def cache_run(cache_key: tuple, etag: str, run_item: dict) -> None:
+    """Cache a run for RUN_CACHE_TTL_SECONDS, evicting the oldest entry when full."""
+    if RUN_CACHE_TTL_SECONDS <= 0:
+        return
+    _run_cache.pop(cache_key, None)
+    if len(_run_cache) >= RUN_CACHE_MAX_ENTRIES:
+        _run_cache.pop(next(iter(_run_cache)))
+    _run_cache[cache_key] = (time.monotonic() + RUN_CACHE_TTL_SECONDS, etag, run_item)
+
+
+def not_modified_response(etag: str) -> dict[str, any]:
+    """Build the 304 response of an unchanged run."""
+    return {
+        "statusCode": 304,
+        "headers": {"ETag": etag, "Cache-Control": "no-cache"},
+        "body": "",
+    }
+
+
+def parse_fields(fields_param: str | None) -> list[str] | None:
+    """Parse the comma-separated 'fields' parameter, None selects every column."""
+    if fields_param is None:
+        return None
+
+    requested_fields = [
+        field.strip() for field in fields_param.split(",") if field.strip()
+    ]
+    if not requested_fields:
+        raise ValueError("'fields' must name at least one field.")
+
+    invalid_fields = [field for field in requested_fields if field not in RUN_COLUMNS]
+    if invalid_fields:
+        raise ValueError(
+            f"Invalid fields: {', '.join(invalid_fields)}. Valid fields are: {', '.join(RUN_COLUMNS)}"
+        )
+
+    fields = ["run_id"]
+    for field in requested_fields:
+        if field not in fields:
+            fields.append(field)
+    return fields
+
 
 def lambda_handler(event: dict[str, any], context: object) -> dict[str, any]:
     """Lambda function handler for retrieving a single run by its ID."""
@@ -54,6 +154,15 @@ def lambda_handler(event: dict[str, any], context: object) -> dict[str, any]:
             ),
         }
 
+    try:
+        fields = parse_fields((event.get("queryStringParameters") or {}).get("fields"))
+    except ValueError as e:
+        logger.error("Invalid fields: %s. Request ID: %s", e, aws_request_id)
+        return {
+            "statusCode": 400,
+            "body": json.dumps({"message": "Invalid query parameter: " + str(e)}),
+        }
+
     # Authentication (optional, based on requirements, e.g., if user can only get their own runs)
     # authorization_header = event["headers"].get("authorization")
     # if not authorization_header or not authorization_header.startswith("Bearer "):
@@ -72,49 +181,66 @@ def lambda_handler(event: dict[str, any], context: object) -> dict[str, any]:
     #         "body": json.dumps({"message": "Invalid or expired access token"}),
     #     }
 
-    run_repo = RunRepository()
+    if_none_match = get_header(event, "if-none-match")
+    cache_key = (run_id, tuple(fields) if fields else None)
 
     try:
-        run_item = run_repo.get_run_by_id(run_id)
-        run_item = dict(run_item)  # Create a mutable copy of run_item
-
-        if not run_item:
-            logger.warning(
-                "Run with run_id: %s not found. Request ID: %s", run_id, aws_request_id
+        cached = get_cached_run(cache_key)
+        if cached:
+            etag, run_item = cached
+            logger.info(
+                "Serving run %s from the container cache. Request ID: %s",
+                run_id,
+                aws_request_id,
             )
-            return {
-                "statusCode": 404,
-                "body": json.dumps({"message": f"Run with ID '{run_id}' not found"}),
-            }
+        else:
+            if if_none_match:
+                # Revalidate with the version columns only, the full row is
+                # fetched only when the run has changed
+                run_version = run_repo.get_run_version(run_id)
+                if run_version is not None:
+                    etag = build_etag(run_id, fields, run_version)
+                    if etag_matches(if_none_match, etag):
+                        logger.info(
+                            "Run %s not modified. Request ID: %s",
+                            run_id,
+                            aws_request_id,
+                        )
+                        return not_modified_response(etag)
 
-        # Ensure failed_email_count is present and is an integer, defaulting to 0 if not.
-        # The runs table should ideally store this value directly.
-        run_item["failed_email_count"] = int(run_item.get("failed_email_count", 0) or 0)
-        # Ensure other counts are also integers if they are used or returned.
-        run_item["expected_email_send_count"] = int(
-            run_item.get("expected_email_send_count", 0) or 0
-        )
-        run_item["success_email_count"] = int(
-            run_item.get("success_email_count", 0) or 0
-        )
+            # The version columns are always selected to build the ETag
+            select_fields = None
+            if fields is not None:
+                select_fields = fields + [
+                    column for column in RUN_VERSION_COLUMNS if column not in fields
+                ]
+            run_item = run_repo.get_run_by_id(run_id, select_fields)
 
-        # Ensure all timestamps within nested objects are also ISO8601.
-        # The `parse_field` in RunRepository should handle top-level `created_at`.
-        # For nested objects like `template_file`, `spreadsheet_file`, `attachment_files`,
-        # if they contain `created_at` or `updated_at` fields, these should have been
-        # stored as ISO8601 strings in the JSONB, or `parse_field` needs to be enhanced
-        # to recursively format them. Assuming they are stored correctly for now.
+            if not run_item:
+                logger.warning(
+                    "Run with run_id: %s not found. Request ID: %s",
+                    run_id,
+                    aws_request_id,
+                )
+                return {
+                    "statusCode": 404,
+                    "body": json.dumps(
+                        {"message": f"Run with ID '{run_id}' not found"}
+                    ),
+                }
 
-        logger.info(
-            "Successfully retrieved run: %s. Request ID: %s", run_id, aws_request_id
-        )
-        return {
-            "statusCode": 200,
-            "headers": {"Content-Type": "application/json"},
-            "body": json.dumps(
-                run_item
-            ),  # parse_field in repo should ensure ISO8601 for created_at
-        }
+            run_item = dict(run_item)  # Create a mutable copy of run_item
+            etag = build_etag(run_id, fields, run_item)
+            if fields is not None:
+                run_item = {field: run_item.get(field) for field in fields}
+
+            # Ensure the counters are integers, defaulting to 0 if not.
+            # Counters left out of a 'fields' projection are not added back.
+            for counter_field in RUN_COUNTER_FIELDS:
+                if fields is None or counter_field in fields:
+                    run_item[counter_field] = int(run_item.get(counter_field, 0) or 0)
+
+            cache_run(cache_key, etag, run_item)
 
     except ClientError as e:
         logger.error(
@@ -144,3 +270,29 @@ def lambda_handler(event: dict[str, any], context: object) -> dict[str, any]:
                 }
             ),
         }
+
+    if etag_matches(if_none_match, etag):
+        return not_modified_response(etag)
+
+    # Ensure all timestamps within nested objects are also ISO8601.
+    # The `parse_field` in RunRepository should handle top-level `created_at`.
+    # For nested objects like `template_file`, `spreadsheet_file`, `attachment_files`,
+    # if they contain `created_at` or `updated_at` fields, these should have been
+    # stored as ISO8601 strings in the JSONB, or `parse_field` needs to be enhanced
+    # to recursively format them. Assuming they are stored correctly for now.
+
+    logger.info(
+        "Successfully retrieved run: %s. Request ID: %s", run_id, aws_request_id
+    )
+    return {
+        "statusCode": 200,
+        "headers": {
+            "Content-Type": "application/json",
+            "ETag": etag,
+            # Clients must revalidate, unchanged polls are answered with 304
+            "Cache-Control": "no-cache",
+        },
+        "body": json.dumps(
+            run_item
+        ),  # parse_field in repo should ensure ISO8601 for created_at
+    }
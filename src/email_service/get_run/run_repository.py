@@ -6,6 +6,7 @@ from decimal import Decimal
 
 import boto3
 import time_util
+from postgres_client import get_postgres_client
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
@@ -20,7 +21,44 @@ JSONB_COLUMNS = {
     "spreadsheet_file",
     "template_file",
 }
-TIMESTAMP_COLUMNS = {"created_at"}  # Added for consistency
+TIMESTAMP_COLUMNS = {"created_at", "updated_at"}  # Added for consistency
+# Columns of the RUNS table that may be requested through a field projection
+RUN_COLUMNS = (
+    "run_id",
+    "run_type",
+    "attachment_file_ids",
+    "attachment_files",
+    "bcc",
+    "cc",
+    "created_at",
+    "created_year",
+    "created_year_month",
+    "created_year_month_day",
+    "display_name",
+    "expected_email_send_count",
+    "is_generate_certificate",
+    "recipients",
+    "recipient_source",
+    "reply_to",
+    "sender",
+    "sender_id",
+    "sender_local_part",
+    "spreadsheet_file",
+    "spreadsheet_file_id",
+    "subject",
+    "success_email_count",
+    "failed_email_count",
+    "template_file",
+    "template_file_id",
+    "updated_at",
+)
+# Columns that identify a version of a run, used to build its ETag
+RUN_VERSION_COLUMNS = (
+    "expected_email_send_count",
+    "success_email_count",
+    "failed_email_count",
+    "updated_at",
+)
 
 DATABASE_NAME = os.environ["DATABASE_NAME"]
 RDS_CLUSTER_ARN = os.environ["RDS_CLUSTER_ARN"]
@@ -98,6 +136,92 @@ def parse_field(col_name, field):
     return field
 
 
+# Data API field key holding the values of each PostgreSQL type,
+# every type not listed here is returned as a stringValue
+DATA_API_VALUE_KEYS = {
+    "bool": "booleanValue",
+    "int2": "longValue",
+    "int4": "longValue",
+    "int8": "longValue",
+    "serial": "longValue",
+    "bigserial": "longValue",
+    "float4": "doubleValue",
+    "float8": "doubleValue",
+    "bytea": "blobValue",
+}
+
+
+def decode_json_column(col_name, values):
+    """
+    Decode the JSONB strings of one column with a single json.loads call
+
+    :param col_name: Column name
+    :param values: The column's raw strings, None for NULL
+    :return: The decoded values
+    """
+    present_values = [value for value in values if value is not None]
+    try:
+        decoded_values = json.loads("[" + ",".join(present_values) + "]")
+    except json.JSONDecodeError:
+        decoded_values = None
+    if decoded_values is None or len(decoded_values) != len(present_values):
+        # Decode cell by cell, parse_field keeps strings that are not JSON
+        return [
+            None if value is None else parse_field(col_name, {"stringValue": value})
+            for value in values
+        ]
+
+    decoded_iter = iter(decoded_values)
+    return [None if value is None else next(decoded_iter) for value in values]
+
+
+def decode_records(column_metadata, records):
+    """
+    Decode a Data API result set column by column. The decoder of each column
+    is picked once from columnMetadata instead of inspecting every cell, and
+    JSONB columns are decoded in bulk.
+
+    :param column_metadata: columnMetadata of the Data API response
+    :param records: records of the Data API response
+    :return: List of rows as dicts
+    """
+    if not records:
+        return []
+
+    columns = []
+    decoded_columns = []
+    for index, col in enumerate(column_metadata):
+        col_name = col["name"]
+        columns.append(col_name)
+        value_key = DATA_API_VALUE_KEYS.get(col.get("typeName"), "stringValue")
+        first_value = next(
+            (record[index] for record in records if not record[index].get("isNull")),
+            None,
+        )
+        if first_value is not None and value_key not in first_value:
+            # Arrays and unexpected value types keep the generic parse_field
+            decoded_columns.append(
+                [parse_field(col_name, record[index]) for record in records]
+            )
+            continue
+
+        # NULL cells only carry isNull, so they decode to None
+        values = [record[index].get(value_key) for record in records]
+        if value_key == "stringValue" and col_name in JSONB_COLUMNS:
+            values = decode_json_column(col_name, values)
+        elif value_key == "stringValue" and col_name in TIMESTAMP_COLUMNS:
+            values = [
+                None if value is None else parse_field(col_name, {"stringValue": value})
+                for value in values
+            ]
+        decoded_columns.append(values)
+
+    return [
+        dict(zip(columns, row, strict=True))
+        for row in zip(*decoded_columns, strict=True)
+    ]
+
+
 # Custom JSON encoder to handle Decimal types
 class DecimalEncoder(json.JSONEncoder):
     """Custom JSON encoder for Decimal objects."""
@@ -129,16 +253,21 @@ class RunRepository:
         self._database_name = DATABASE_NAME
         self._resource_arn = RDS_CLUSTER_ARN
         self._secret_arn = RDS_CLUSTER_MASTER_USER_SECRET_ARN
+        # Pooled PostgreSQL connection when DATABASE_BACKEND=postgres
+        self._postgres_client = get_postgres_client()
 
-    def get_run_by_id(self, run_id: str) -> dict | None:
+    def get_run_by_id(
+        self, run_id: str, fields: list[str] | None = None
+    ) -> dict | None:
         """
         Retrieve a run by its ID from the PostgreSQL database.
 
         :param run_id: The ID of the run to retrieve
+        :param fields: The columns to select, all columns if omitted
         :return: The run item, or None if not found
         """
         try:
-            sql = "SELECT * FROM runs WHERE run_id = :run_id"
+            sql = f"SELECT {self._build_select_clause(fields)} FROM runs_with_counters WHERE run_id = :run_id"
             params = [
                 {"name": "run_id", "value": {"stringValue": run_id}},
             ]
@@ -149,6 +278,21 @@ class RunRepository:
             logger.error("Error getting run by ID: %s", e)
             return None
 
+    def get_run_version(self, run_id: str) -> dict | None:
+        """
+        Retrieve only the columns that change while a run is in progress.
+
+        :param run_id: The ID of the run
+        :return: The counters and updated_at of the run, or None if not found
+        """
+        sql = f"SELECT {', '.join(RUN_VERSION_COLUMNS)} FROM runs_with_counters WHERE run_id = :run_id"
+        params = [
+            {"name": "run_id", "value": {"stringValue": run_id}},
+        ]
+
+        results = self._execute(sql, params, fetch=True)
+        return results[0] if results else None
+
     def upsert_run(self, run: dict) -> str | None:
         """
         Insert or update a run in the PostgreSQL database.
@@ -359,6 +503,16 @@ class RunRepository:
         result = self._execute(sql, query_params, fetch=True)
         return result[0]["count"] if result else 0
 
+    def _build_select_clause(self, fields):
+        """Turn a field projection into an explicit column list, all columns if empty"""
+        if not fields:
+            return "*"
+
+        invalid_fields = [field for field in fields if field not in RUN_COLUMNS]
+        if invalid_fields:
+            raise ValueError(f"Invalid fields: {', '.join(invalid_fields)}")
+        return ", ".join(fields)
+
     def _add_filtering_sql(self, sql, params, query_params):
         """Add filter conditions to SQL statement"""
         # Extract filter conditions from query_params
@@ -437,6 +591,16 @@ class RunRepository:
             if os.getenv("DEBUG_SQL", "false").lower() == "true":
                 logger.debug("Executing SQL:\n%s\nParams:\n%s", sql, parameters)
 
+            if self._postgres_client:
+                rows = self._postgres_client.execute(sql, parameters, fetch)
+                if fetch:
+                    # Same ISO 8601 timestamps as parse_field returns
+                    for row in rows:
+                        for col in TIMESTAMP_COLUMNS & row.keys():
+                            if row[col] is not None:
+                                row[col] = parse_field(col, {"stringValue": row[col]})
+                return rows
+
             response = self._rds_data.execute_statement(
                 resourceArn=self._resource_arn,
                 secretArn=self._secret_arn,
@@ -451,14 +615,7 @@ class RunRepository:
             if not fetch:
                 return None
 
-            columns = [col["name"] for col in response["columnMetadata"]]
-            return [
-                {
-                    col: parse_field(col, val)
-                    for col, val in zip(columns, row, strict=False)
-                }
-                for row in response["records"]
-            ]
+            return decode_records(response["columnMetadata"], response["records"])
         except Exception as e:
             logger.error(
                 "SQL execution failed: %s\nSQL: %s\nParams: %s", e, sql, parameters
@@ -0,0 +1,98 @@
+import json
+import logging
+
+from botocore.exceptions import ClientError
+from email_repository import EmailRepository
+
+# Configure logging
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+EMAIL_STATUSES = ("PENDING", "SUCCESS", "FAILED")
+
+
+def lambda_handler(event: dict[str, any], context: object) -> dict[str, any]:
+    """Lambda function handler for retrieving the per-status email counts of a run."""
+
+    aws_request_id = getattr(context, "aws_request_id", None)
+
+    if event.get("action") == "PREWARM":
+        logger.info("Received a prewarm request. Skipping business logic.")
+        return {"statusCode": 200, "body": "Successfully warmed up"}
+
+    run_id = (event.get("pathParameters") or {}).get("run_id")
+    if not run_id:
+        logger.error("Missing run_id in pathParameters. Request ID: %s", aws_request_id)
+        return {
+            "statusCode": 400,
+            "body": json.dumps({"message": "Missing run_id in path parameters"}),
+        }
+
+    try:
+        run_stats = EmailRepository().get_run_email_stats(run_id)
+    except ClientError as e:
+        logger.error(
+            "Database client error while getting stats of run %s: %s. Request ID: %s",
+            run_id,
+            e,
+            aws_request_id,
+        )
+        return {
+            "statusCode": 500,
+            "body": json.dumps(
+                {"message": f"Database error: {e}. Request ID: {aws_request_id}"}
+            ),
+        }
+    except Exception as e:
+        logger.error(
+            "Unexpected error while getting stats of run %s: %s. Request ID: %s",
+            run_id,
+            e,
+            aws_request_id,
+        )
+        return {
+            "statusCode": 500,
+            "body": json.dumps(
+                {
+                    "message": f"An unexpected error occurred: {e}. Request ID: {aws_request_id}"
+                }
+            ),
+        }
+
+    if not run_stats:
+        logger.warning(
+            "Run with run_id: %s not found. Request ID: %s", run_id, aws_request_id
+        )
+        return {
+            "statusCode": 404,
+            "body": json.dumps({"message": f"Run with ID '{run_id}' not found"}),
+        }
+
+    # Always report the known statuses, even when no email has reached them yet
+    status_counts = {status: 0 for status in EMAIL_STATUSES}
+    status_counts.update(run_stats["status_counts"])
+
+    expected_email_send_count = int(run_stats["expected_email_send_count"] or 0)
+    success_email_count = int(run_stats["success_email_count"] or 0)
+    failed_email_count = int(run_stats["failed_email_count"] or 0)
+    processed_email_count = success_email_count + failed_email_count
+
+    result = {
+        "run_id": run_id,
+        "status_counts": status_counts,
+        "total_email_count": sum(status_counts.values()),
+        "expected_email_send_count": expected_email_send_count,
+        "success_email_count": success_email_count,
+        "failed_email_count": failed_email_count,
+        "progress": (
+            round(processed_email_count / expected_email_send_count, 4)
+            if expected_email_send_count > 0
+            else 0
+        ),
+    }
+
+    return {
+        "statusCode": 200,
+        "headers": {"Content-Type": "application/json"},
+        "body": json.dumps(result),
+    }
@@ -0,0 +1,229 @@
+import datetime
+import gzip
+import heapq
+import io
+import itertools
+import json
+import logging
+import os
+from collections.abc import Iterator
+
+import boto3
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+BUCKET_NAME = os.getenv("BUCKET_NAME")
+
+# Calculate batch size to avoid RDS Data API 1MB limit
+RDS_DATA_API_SAFE_BATCH_SIZE = 500  # Safe limit to avoid 1MB response size
+
+s3_client = boto3.client("s3")
+
+
+def count_archived_emails(email_archives: list[dict], status: str | None) -> int:
+    """
+    Count the archived emails of a run from the counts recorded at archival.
+
+    :param email_archives: The run's email_archives rows
+    :param status: Optional status filter
+    :return: The number of archived emails
+    """
+    if status:
+        return sum(
+            int(archive["status_counts"].get(status, 0)) for archive in email_archives
+        )
+    return sum(int(archive["email_count"]) for archive in email_archives)
+
+
+class _Descending:
+    """Sort key wrapper reversing the order of the key it holds"""
+
+    __slots__ = ("key",)
+
+    def __init__(self, key):
+        self.key = key
+
+    def __lt__(self, other):
+        return other.key < self.key
+
+    def __eq__(self, other):
+        return self.key == other.key
+
+
+def parse_timestamp(value: str) -> datetime.datetime:
+    """Parse a created_at value to a naive UTC datetime"""
+    parsed = datetime.datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(datetime.UTC).replace(tzinfo=None)
+    return parsed
+
+
+def email_key(email: dict) -> tuple[datetime.datetime, str]:
+    """The (created_at, email_id) key the emails are listed by"""
+    return parse_timestamp(email["created_at"]), email["email_id"]
+
+
+def read_archived_emails(s3_object_key: str) -> Iterator[dict]:
+    """
+    Stream the emails of a gzipped NDJSON archive object line by line.
+
+    :param s3_object_key: The key of the archive object
+    :return: Iterator of emails, in (created_at, email_id) order
+    """
+    response = s3_client.get_object(Bucket=BUCKET_NAME, Key=s3_object_key)
+    with gzip.GzipFile(fileobj=response["Body"]) as archive:
+        for line in io.TextIOWrapper(archive, encoding="utf-8"):
+            if line.strip():
+                yield json.loads(line)
+
+
+def iter_archived_emails(
+    email_archive: dict,
+    status: str | None,
+    fields: list[str] | None,
+    descending: bool,
+    cursor_key: tuple | None,
+) -> Iterator[dict]:
+    """
+    Iterate over the emails of one archive after the cursor, in list order.
+
+    An archive holds one run's emails of one month in ascending order, a
+    descending listing holds that single object in memory to reverse it.
+    """
+    emails = read_archived_emails(email_archive["s3_object_key"])
+    if descending:
+        emails = reversed(list(emails))
+
+    for email in emails:
+        if status and email.get("status") != status:
+            continue
+        if cursor_key and (
+            email_key(email) >= cursor_key
+            if descending
+            else email_key(email) <= cursor_key
+        ):
+            continue
+        yield {field: email.get(field) for field in fields} if fields else email
+
+
+def iter_live_emails(email_repo, filter_criteria: dict) -> Iterator[dict]:
+    """
+    Iterate over the run's rows still in EMAILS after the cursor, in list
+    order, fetching them in keyset batches.
+    """
+    batch_filter_criteria = {
+        "run_id": filter_criteria["run_id"],
+        "status": filter_criteria.get("status"),
+        "fields": filter_criteria.get("fields"),
+        "sort_by": "created_at",
+        "sort_order": filter_criteria.get("sort_order", "DESC").upper(),
+        "limit": RDS_DATA_API_SAFE_BATCH_SIZE,
+    }
+    if filter_criteria.get("cursor"):
+        batch_filter_criteria["cursor"] = filter_criteria["cursor"]
+
+    while True:
+        batch_emails = email_repo.list_emails(batch_filter_criteria) or []
+        yield from batch_emails
+        if len(batch_emails) < RDS_DATA_API_SAFE_BATCH_SIZE:
+            return
+        batch_filter_criteria["cursor"] = {
+            "created_at": batch_emails[-1]["created_at"],
+            "email_id": batch_emails[-1]["email_id"],
+        }
+
+
+def list_emails_with_archives(
+    email_repo, email_archives: list[dict], filter_criteria: dict
+) -> list[dict]:
+    """
+    Get a page of the emails of a run whose older partitions were archived.
+
+    The run's remaining rows and its archives are merged in (created_at,
+    email_id) order. Every source is read lazily from the cursor on, and an
+    archive is only opened once the merge reaches the start of its
+    created_at range, so a page reads about the rows it returns. Only runs
+    that span an archived month take this path.
+
+    :param email_repo: The email repository
+    :param email_archives: The run's email_archives rows
+    :param filter_criteria: Filter, sorting and pagination criteria of the request
+    :return: The page of emails
+    """
+    status = filter_criteria.get("status")
+    fields = filter_criteria.get("fields")
+    descending = filter_criteria.get("sort_order", "DESC").upper() == "DESC"
+    cursor = filter_criteria.get("cursor")
+    cursor_key = email_key(cursor) if cursor else None
+
+    def order_key(key):
+        return _Descending(key) if descending else key
+
+    # Archives with a range, skipping those entirely before the cursor, in
+    # the order the merge reaches them; unbounded older archives come first
+    pending_archives = []
+    for email_archive in email_archives:
+        first_created_at = email_archive.get("first_created_at")
+        last_created_at = email_archive.get("last_created_at")
+        if not first_created_at or not last_created_at:
+            pending_archives.append((None, email_archive))
+            continue
+        range_start = parse_timestamp(first_created_at)
+        range_end = parse_timestamp(last_created_at)
+        if cursor_key and (
+            range_start > cursor_key[0] if descending else range_end < cursor_key[0]
+        ):
+            continue
+        pending_archives.append(
+            (range_end if descending else range_start, email_archive)
+        )
+    pending_archives.sort(
+        key=lambda pending: (pending[0] is not None, order_key(pending[0]))
+    )
+    pending_archives.reverse()  # popped from the end
+
+    heap = []
+    sequence = itertools.count()
+
+    def push_next(emails):
+        email = next(emails, None)
+        if email is not None:
+            heapq.heappush(
+                heap, (order_key(email_key(email)), next(sequence), email, emails)
+            )
+
+    push_next(iter_live_emails(email_repo, filter_criteria))
+
+    limit = int(filter_criteria["limit"])
+    offset = 0 if cursor else (int(filter_criteria.get("page", 1)) - 1) * limit
+    page = []
+    read_archives = 0
+    while len(page) < offset + limit:
+        # Open every archive that may hold an email before the merge's head
+        while pending_archives:
+            boundary, email_archive = pending_archives[-1]
+            if heap and boundary is not None:
+                head_created_at = heap[0][2]["created_at"]
+                if order_key((parse_timestamp(head_created_at),)) < order_key(
+                    (boundary,)
+                ):
+                    break
+            pending_archives.pop()
+            read_archives += 1
+            push_next(
+                iter_archived_emails(
+                    email_archive, status, fields, descending, cursor_key
+                )
+            )
+
+        if not heap:
+            break
+        _, _, email, emails = heapq.heappop(heap)
+        page.append(email)
+        push_next(emails)
+
+    logger.info(
+        "Read %d of %d archives for the page", read_archives, len(email_archives)
+    )
+    return page[offset:]
@@ -5,12 +5,49 @@ from decimal import Decimal  # Added import
 
 import boto3
 import time_util
+from postgres_client import get_postgres_client
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
-JSONB_COLUMNS = {"bcc", "cc", "attachment_file_ids", "row_data"}
+JSONB_COLUMNS = {"bcc", "cc", "attachment_file_ids", "row_data", "status_counts"}
 TIMESTAMP_COLUMNS = {"created_at", "sent_at", "updated_at"}
+# Columns of the EMAILS table that may be requested through a field projection
+EMAIL_COLUMNS = (
+    "email_id",
+    "run_id",
+    "attachment_file_ids",
+    "bcc",
+    "cc",
+    "created_at",
+    "display_name",
+    "is_generate_certificate",
+    "recipient_email",
+    "reply_to",
+    "row_data",
+    "sender_id",
+    "sender_local_part",
+    "sender_username",
+    "sent_at",
+    "spreadsheet_file_id",
+    "status",
+    "subject",
+    "template_file_id",
+    "updated_at",
+)
+# Orderings read in order from an index (idx_emails_run_id_created_at_email_id
+# and idx_emails_run_id_status_created_at_email_id), every other column would
+# have to sort all of a run's emails for each page
+INDEXED_SORT_COLUMNS = ("created_at",)
+PAGINATION_AND_SORTING_KEYS = {
+    "page",
+    "limit",
+    "offset",
+    "cursor",
+    "sort_by",
+    "sort_order",
+    "fields",
+}
 
 DATABASE_NAME = os.environ["DATABASE_NAME"]
 RDS_CLUSTER_ARN = os.environ["RDS_CLUSTER_ARN"]
@@ -82,6 +119,87 @@ def parse_field(col_name, field):
     return field
 
 
+# Data API field key holding the values of each PostgreSQL type,
+# every type not listed here is returned as a stringValue
+DATA_API_VALUE_KEYS = {
+    "bool": "booleanValue",
+    "int2": "longValue",
+    "int4": "longValue",
+    "int8": "longValue",
+    "serial": "longValue",
+    "bigserial": "longValue",
+    "float4": "doubleValue",
+    "float8": "doubleValue",
+    "bytea": "blobValue",
+}
+
+
+def decode_json_column(col_name, values):
+    """
+    Decode the JSONB strings of one column with a single json.loads call
+
+    :param col_name: Column name
+    :param values: The column's raw strings, None for NULL
+    :return: The decoded values
+    """
+    present_values = [value for value in values if value is not None]
+    try:
+        decoded_values = json.loads("[" + ",".join(present_values) + "]")
+    except json.JSONDecodeError:
+        decoded_values = None
+    if decoded_values is None or len(decoded_values) != len(present_values):
+        # Decode cell by cell, parse_field keeps strings that are not JSON
+        return [
+            None if value is None else parse_field(col_name, {"stringValue": value})
+            for value in values
+        ]
+
+    decoded_iter = iter(decoded_values)
+    return [None if value is None else next(decoded_iter) for value in values]
+
+
+def decode_records(column_metadata, records):
+    """
+    Decode a Data API result set column by column. The decoder of each column
+    is picked once from columnMetadata instead of inspecting every cell, and
+    JSONB columns are decoded in bulk.
+
+    :param column_metadata: columnMetadata of the Data API response
+    :param records: records of the Data API response
+    :return: List of rows as dicts
+    """
+    if not records:
+        return []
+
+    columns = []
+    decoded_columns = []
+    for index, col in enumerate(column_metadata):
+        col_name = col["name"]
+        columns.append(col_name)
+        value_key = DATA_API_VALUE_KEYS.get(col.get("typeName"), "stringValue")
+        first_value = next(
+            (record[index] for record in records if not record[index].get("isNull")),
+            None,
+        )
+        if first_value is not None and value_key not in first_value:
+            # Arrays and unexpected value types keep the generic parse_field
+            decoded_columns.append(
+                [parse_field(col_name, record[index]) for record in records]
+            )
+            continue
+
+        # NULL cells only carry isNull, so they decode to None
+        values = [record[index].get(value_key) for record in records]
+        if value_key == "stringValue" and col_name in JSONB_COLUMNS:
+            values = decode_json_column(col_name, values)
+        decoded_columns.append(values)
+
+    return [
+        dict(zip(columns, row, strict=True))
+        for row in zip(*decoded_columns, strict=True)
+    ]
+
+
 class EmailRepositoryError(Exception):
     """Email repository error"""
 
@@ -101,11 +219,114 @@ class EmailRepository:
         self._database_name = DATABASE_NAME
         self._resource_arn = RDS_CLUSTER_ARN
         self._secret_arn = RDS_CLUSTER_MASTER_USER_SECRET_ARN
+        # Pooled PostgreSQL connection when DATABASE_BACKEND=postgres
+        self._postgres_client = get_postgres_client()
 
     def list_emails(self, filter_criteria_dict):
-        """Get email list"""
+        """Get email list, projected to filter_criteria_dict["fields"] if given"""
+        sql_string, sql_parameters_list = self._build_list_emails_sql(
+            select_clause=self._build_select_clause(filter_criteria_dict.get("fields")),
+            filter_criteria_dict=filter_criteria_dict,
+        )
+
+        # Execute query
+        emails = self._execute(sql_string, sql_parameters_list, fetch=True)
+
+        return emails
+
+    def list_emails_with_total_count(self, filter_criteria_dict):
+        """
+        Get a page of emails together with the total number of matching emails
+        in a single statement.
+
+        :param filter_criteria_dict: Filter, sorting and pagination criteria
+        :return: Tuple of (emails, total_count)
+        """
+        filter_keys = {
+            key
+            for key, value in filter_criteria_dict.items()
+            if key not in PAGINATION_AND_SORTING_KEYS and value is not None
+        }
+
+        # Unfiltered per-run listing: the run already counts its emails
+        if filter_keys == {"run_id"}:
+            return self._list_emails_with_run_counter(filter_criteria_dict)
+
+        if filter_criteria_dict.get("cursor"):
+            # A window count would only cover the rows after the cursor
+            emails = self.list_emails(filter_criteria_dict)
+            return emails, self.count_emails(filter_criteria_dict)
+
+        select_clause = self._build_select_clause(filter_criteria_dict.get("fields"))
+        sql_string, sql_parameters_list = self._build_list_emails_sql(
+            select_clause=f"{select_clause}, COUNT(*) OVER() AS total_count",
+            filter_criteria_dict=filter_criteria_dict,
+        )
+        rows = self._execute(sql_string, sql_parameters_list, fetch=True)
+        if not rows:
+            # The window count is only available on returned rows, e.g. a page
+            # past the end has to be counted separately.
+            return [], self.count_emails(filter_criteria_dict)
+
+        total_count = rows[0]["total_count"]
+        for row in rows:
+            row.pop("total_count", None)
+        return rows, total_count
+
+    def _list_emails_with_run_counter(self, filter_criteria_dict):
+        """
+        Get a page of a run's emails with the total read from the run's
+        expected_email_send_count, or counted for WEBHOOK runs
+        """
+        page_sql, sql_parameters_list = self._build_list_emails_sql(
+            select_clause=self._build_select_clause(filter_criteria_dict.get("fields")),
+            filter_criteria_dict=filter_criteria_dict,
+        )
+        sort_by = filter_criteria_dict.get("sort_by", "created_at")
+        sort_order = filter_criteria_dict.get("sort_order", "DESC").upper()
+        # LEFT JOIN LATERAL keeps the run row even when the page is empty.
+        # WEBHOOK runs grow per submission without a send count, so they are
+        # counted; CASE only evaluates the subquery for those runs.
+        sql_string = f"""
+            SELECT
+                CASE
+                    WHEN runs.run_type = 'WEBHOOK'
+                        THEN (SELECT COUNT(*) FROM emails WHERE emails.run_id = :run_id)
+                    ELSE runs.expected_email_send_count
+                END AS total_count,
+                page.*
+            FROM runs
+            LEFT JOIN LATERAL ({page_sql}) AS page ON TRUE
+            WHERE runs.run_id = :run_id
+            ORDER BY page.{sort_by} {sort_order}, page.email_id {sort_order}
+        """
+        rows = self._execute(sql_string, sql_parameters_list, fetch=True)
+        if not rows:
+            return [], 0
+
+        total_count = rows[0]["total_count"] or 0
+        emails = []
+        for row in rows:
+            row.pop("total_count", None)
+            if row.get("email_id") is not None:
+                emails.append(row)
+        return emails, total_count
+
+    def _build_select_clause(self, fields):
+        """Turn a field projection into an explicit column list, all columns if empty"""
+        if not fields:
+            return "*"
+
+        invalid_fields = [field for field in fields if field not in EMAIL_COLUMNS]
+        if invalid_fields:
+            raise ValueError(f"Invalid fields: {', '.join(invalid_fields)}")
+        return ", ".join(fields)
+
+    def _build_list_emails_sql(self, select_clause, filter_criteria_dict):
+        """Build the filtered, sorted and paginated email list statement"""
         # Build base SQL
-        sql_string = "SELECT * FROM emails WHERE 1=1 "
+        # Run-level values of normalized rows are joined from runs
+        sql_string = f"SELECT {select_clause} FROM emails_with_run WHERE 1=1 "
         sql_parameters_list = []
 
         # Add filter conditions
@@ -118,6 +339,23 @@ class EmailRepository:
         # Add sorting
         sort_by = filter_criteria_dict.get("sort_by", "created_at")
         sort_order = filter_criteria_dict.get("sort_order", "DESC").upper()
+        if sort_by not in INDEXED_SORT_COLUMNS:
+            raise ValueError(f"Invalid sort_by: {sort_by}")
+        if sort_order not in ("ASC", "DESC"):
+            raise ValueError(f"Invalid sort_order: {sort_order}")
+
+        # Continue after the cursor row instead of skipping rows with OFFSET
+        cursor = filter_criteria_dict.get("cursor")
+        if cursor:
+            if sort_by != "created_at":
+                raise ValueError("Cursor pagination is only supported for created_at")
+            sql_string, sql_parameters_list = self._add_keyset_sql(
+                sql_string_in=sql_string,
+                sql_parameters_list_out=sql_parameters_list,
+                cursor_dict=cursor,
+                sort_order=sort_order,
+            )
+
         # Add a secondary, unique sort key to ensure stable pagination
         sql_string += f" ORDER BY {sort_by} {sort_order}, email_id {sort_order}"
 
@@ -128,10 +366,7 @@ class EmailRepository:
             pagination_criteria_dict=filter_criteria_dict,
         )
 
-        # Execute query
-        emails = self._execute(sql_string, sql_parameters_list, fetch=True)
-
-        return emails
+        return sql_string, sql_parameters_list
 
     def count_emails(self, filter_criteria_dict):
         """Count emails matching the criteria"""
@@ -151,9 +386,7 @@ class EmailRepository:
 
     def get_email_by_id(self, run_id, email_id):
         """Get a single email by ID"""
-        sql_string = (
-            "SELECT * FROM emails WHERE run_id = :run_id AND email_id = :email_id"
-        )
+        sql_string = "SELECT * FROM emails_with_run WHERE run_id = :run_id AND email_id = :email_id"
         sql_parameters = [
             {"name": "run_id", "value": {"stringValue": run_id}},
             {"name": "email_id", "value": {"stringValue": email_id}},
@@ -161,6 +394,28 @@ class EmailRepository:
         results = self._execute(sql_string, sql_parameters, fetch=True)
         return results[0] if results else None
 
+    def list_email_archives(self, run_id):
+        """
+        Get the S3 archives holding the emails of a run's archived partitions
+
+        :param run_id: The run ID
+        :return: List of dicts with s3_object_key, email_count, status_counts
+            and the created_at range of the archived emails
+        """
+        sql_string = """
+            SELECT
+                s3_object_key,
+                email_count,
+                status_counts,
+                first_created_at,
+                last_created_at
+            FROM email_archives
+            WHERE run_id = :run_id AND archived_at IS NOT NULL
+            ORDER BY partition_name
+        """
+        sql_parameters = [{"name": "run_id", "value": {"stringValue": run_id}}]
+        return self._execute(sql_string, sql_parameters, fetch=True)
+
     def upsert_email(self, email):
         """Insert or update email"""
         try:
@@ -193,7 +448,7 @@ class EmailRepository:
             sql_string = f"""
                 INSERT INTO emails ({columns_str})
                 VALUES ({placeholders})
-                ON CONFLICT (email_id)
+                ON CONFLICT (email_id, created_at)
                 DO UPDATE SET {update_str}
             """
 
@@ -265,12 +520,7 @@ class EmailRepository:
         for key, value in filter_criteria_dict.items():
             if (
                 key
-                not in (
-                    "page",
-                    "limit",
-                    "sort_by",
-                    "sort_order",
-                )  # Exclude pagination/sorting keys
+                not in PAGINATION_AND_SORTING_KEYS  # Exclude pagination/sorting keys
                 and value is not None
             ):
                 processed_filters[key] = value
@@ -292,8 +542,14 @@ class EmailRepository:
         """Add pagination to SQL statement"""
         current_sql_string = sql_string_in
         limit = int(pagination_criteria_dict.get("limit", 10))
-        page = int(pagination_criteria_dict.get("page", 1))
-        offset = (page - 1) * limit
+        if "offset" in pagination_criteria_dict:
+            offset = int(pagination_criteria_dict["offset"])
+        elif pagination_criteria_dict.get("cursor"):
+            # The keyset condition already positions the page
+            offset = 0
+        else:
+            page = int(pagination_criteria_dict.get("page", 1))
+            offset = (page - 1) * limit
 
         current_sql_string += " LIMIT :limit OFFSET :offset"
         sql_parameters_list_out.append({"name": "limit", "value": {"longValue": limit}})
@@ -303,6 +559,47 @@ class EmailRepository:
 
         return current_sql_string, sql_parameters_list_out
 
+    def _add_keyset_sql(
+        self,
+        sql_string_in: str,
+        sql_parameters_list_out: list,
+        cursor_dict: dict,
+        sort_order: str,
+    ):
+        """Add a (created_at, email_id) keyset condition to SQL statement"""
+        comparator = "<" if sort_order == "DESC" else ">"
+        current_sql_string = (
+            sql_string_in
+            + f" AND (created_at, email_id) {comparator} (:cursor_created_at, :cursor_email_id)"
+        )
+        sql_parameters_list_out.append(
+            {
+                "name": "cursor_created_at",
+                "value": {
+                    "stringValue": self._format_cursor_timestamp(
+                        cursor_dict["created_at"]
+                    )
+                },
+                "typeHint": "TIMESTAMP",
+            }
+        )
+        sql_parameters_list_out.append(
+            {
+                "name": "cursor_email_id",
+                "value": {"stringValue": cursor_dict["email_id"]},
+            }
+        )
+        return current_sql_string, sql_parameters_list_out
+
+    def _format_cursor_timestamp(self, value: str) -> str:
+        """Normalize a cursor timestamp to the format expected by RDS Data API"""
+        try:
+            dt_obj = time_util.parse_iso8601_to_datetime(value)
+            return time_util.format_datetime_for_rds(dt_obj)
+        except ValueError:
+            # Already in the 'YYYY-MM-DD HH:MM:SS[.ffffff]' form returned by RDS
+            return value
+
     def _create_param(self, key, value):
         """Create SQL parameter"""
         if value is None:
@@ -344,6 +641,9 @@ class EmailRepository:
             if os.getenv("DEBUG_SQL", "false").lower() == "true":
                 logger.debug("Executing SQL:\n%s\nParams:\n%s", sql, parameters)
 
+            if self._postgres_client:
+                return self._postgres_client.execute(sql, parameters, fetch)
+
             response = self._rds_data.execute_statement(
                 resourceArn=self._resource_arn,
                 secretArn=self._secret_arn,
@@ -356,14 +656,7 @@ class EmailRepository:
             if not fetch:
                 return None
 
-            columns = [col["name"] for col in response["columnMetadata"]]
-            return [
-                {
-                    col: parse_field(col, val)
-                    for col, val in zip(columns, row, strict=False)
-                }
-                for row in response["records"]
-            ]
+            return decode_records(response["columnMetadata"], response["records"])
         except Exception as e:
             logger.error(
                 "SQL execution failed: %s\nSQL: %s\nParams: %s", e, sql, parameters
@@ -1,10 +1,12 @@
+import base64
 import json
 import logging
 import math  # Added
 from decimal import Decimal
 
+import email_archive
 from botocore.exceptions import ClientError
-from email_repository import EmailRepository
+from email_repository import EMAIL_COLUMNS, INDEXED_SORT_COLUMNS, EmailRepository
 
 # Removed EmailServicePaginationStateRepository, decode_key, encode_key, get_current_utc_time
 
@@ -15,6 +17,23 @@ logger.setLevel(logging.INFO)
 # Calculate batch size to avoid RDS Data API 1MB limit
 RDS_DATA_API_SAFE_BATCH_SIZE = 500  # Safe limit to avoid 1MB response size
 
+# Lean projection used when no 'fields' are requested: row_data and the JSONB
+# list columns are left out, they are only needed when inspecting a single email
+DEFAULT_LIST_EMAIL_FIELDS = [
+    "email_id",
+    "run_id",
+    "recipient_email",
+    "status",
+    "subject",
+    "display_name",
+    "sender_id",
+    "created_at",
+    "sent_at",
+    "updated_at",
+]
+# Always selected, the cursor is built from them
+REQUIRED_LIST_EMAIL_FIELDS = ["email_id", "created_at"]
+
 
 class DecimalEncoder(json.JSONEncoder):
     """Custom JSON encoder for Decimal objects."""
@@ -25,6 +44,63 @@ class DecimalEncoder(json.JSONEncoder):
         return super().default(o)
 
 
+def decode_cursor(encoded_cursor: str) -> dict[str, str]:
+    """Decode an opaque pagination cursor into its (created_at, email_id) key."""
+    try:
+        decoded_cursor = json.loads(
+            base64.urlsafe_b64decode(encoded_cursor.encode("utf-8")).decode("utf-8")
+        )
+    except (json.JSONDecodeError, UnicodeDecodeError, base64.binascii.Error) as e:
+        logger.error("Invalid cursor format: %s", e)
+        raise ValueError(
+            "Invalid cursor format. It must be a cursor returned by a previous request."
+        ) from e
+
+    if (
+        not isinstance(decoded_cursor, dict)
+        or not decoded_cursor.get("created_at")
+        or not decoded_cursor.get("email_id")
+    ):
+        raise ValueError(
+            "Invalid cursor format. It must be a cursor returned by a previous request."
+        )
+    return {
+        "created_at": decoded_cursor["created_at"],
+        "email_id": decoded_cursor["email_id"],
+    }
+
+
+def encode_cursor(email: dict[str, any]) -> str:
+    """Encode the (created_at, email_id) key of an email into an opaque cursor."""
+    cursor = {"created_at": email["created_at"], "email_id": email["email_id"]}
+    return base64.urlsafe_b64encode(json.dumps(cursor).encode("utf-8")).decode("utf-8")
+
+
+def parse_fields(fields_param: str | None, sort_by: str) -> list[str]:
+    """Parse the comma-separated 'fields' parameter into a validated projection."""
+    if fields_param is None:
+        requested_fields = DEFAULT_LIST_EMAIL_FIELDS
+    else:
+        requested_fields = [
+            field.strip() for field in fields_param.split(",") if field.strip()
+        ]
+        if not requested_fields:
+            raise ValueError("'fields' must name at least one field.")
+
+    invalid_fields = [field for field in requested_fields if field not in EMAIL_COLUMNS]
+    if invalid_fields:
+        raise ValueError(
+            f"Invalid fields: {', '.join(invalid_fields)}. Valid fields are: {', '.join(EMAIL_COLUMNS)}"
+        )
+
+    # The sort column has to be selected for the ordering of a projected page
+    fields = []
+    for field in [*REQUIRED_LIST_EMAIL_FIELDS, sort_by, *requested_fields]:
+        if field not in fields:
+            fields.append(field)
+    return fields
+
+
 def extract_query_params(event: dict[str, any]) -> dict[str, any]:
     """Extract query parameters from the API Gateway event."""
     query_params = event.get("queryStringParameters") or {}
@@ -52,9 +128,24 @@ def extract_query_params(event: dict[str, any]) -> dict[str, any]:
         page = int(query_params.get("page", 1))
         status = query_params.get("status", None)
         sort_by = query_params.get("sort_by", "created_at")
+        if sort_by not in INDEXED_SORT_COLUMNS:
+            raise ValueError(
+                f"Invalid sort_by: {sort_by}. Valid values are: {', '.join(INDEXED_SORT_COLUMNS)}"
+            )
         sort_order = query_params.get("sort_order", "DESC").upper()
         if sort_order not in ["ASC", "DESC"]:
             sort_order = "DESC"
+        fields = parse_fields(query_params.get("fields"), sort_by)
+
+        cursor = None
+        if query_params.get("cursor"):
+            if limit == "ALL":
+                raise ValueError("'cursor' cannot be used together with limit=ALL.")
+            if sort_by != "created_at":
+                raise ValueError(
+                    "'cursor' is only supported when sorting by created_at."
+                )
+            cursor = decode_cursor(query_params["cursor"])
 
     except ValueError as e:
         logger.error("Invalid query parameter: %s", e)
@@ -65,12 +156,14 @@ def extract_query_params(event: dict[str, any]) -> dict[str, any]:
 
     # Log the extracted parameters
     logger.info(
-        "Extracted parameters - limit: %s, page: %d, status: %s, sort_by: %s, sort_order: %s",
+        "Extracted parameters - limit: %s, page: %d, status: %s, sort_by: %s, sort_order: %s, cursor: %s, fields: %s",
         limit,
         page,
         status,
         sort_by,
         sort_order,
+        cursor,
+        fields,
     )
 
     return {
@@ -79,6 +172,8 @@ def extract_query_params(event: dict[str, any]) -> dict[str, any]:
         "status": status,
         "sort_by": sort_by,
         "sort_order": sort_order,
+        "cursor": cursor,
+        "fields": fields,
     }
 
 
@@ -99,6 +194,8 @@ def lambda_handler(event: dict[str, any], context: object) -> dict[str, any]:
     status: str | None = extracted_params["status"]
     sort_by: str = extracted_params["sort_by"]
     sort_order: str = extracted_params["sort_order"]
+    cursor: dict[str, str] | None = extracted_params["cursor"]
+    fields: list[str] = extracted_params["fields"]
 
     path_parameters = event.get("pathParameters", {})
     run_id: str | None = path_parameters.get("run_id")
@@ -118,16 +215,28 @@ def lambda_handler(event: dict[str, any], context: object) -> dict[str, any]:
         "limit": limit,
         "sort_by": sort_by,
         "sort_order": sort_order,
+        "fields": fields,
     }
     if status:
         filter_criteria["status"] = status
+    if cursor:
+        filter_criteria["cursor"] = cursor
+
+    # Filled in by whichever query can provide it for free; counted otherwise
+    total_items: int | None = None
+
+    # Emails of archived EMAILS partitions are read back from S3
+    email_archives = email_repo.list_email_archives(run_id)
+    archived_items = email_archive.count_archived_emails(email_archives, status)
 
     # Support limit=ALL: count total items and override pagination
     if limit == "ALL":
         count_filter = {"run_id": run_id}
         if status:
             count_filter["status"] = status
-        total_items = email_repo.count_emails(count_filter)  # support count first
+        total_items = (
+            email_repo.count_emails(count_filter) + archived_items
+        )  # support count first
         limit = total_items  # override limit for fetching
         page = 1  # reset to first page
         filter_criteria["limit"] = limit
@@ -136,11 +245,27 @@ def lambda_handler(event: dict[str, any], context: object) -> dict[str, any]:
     try:
         logger.info("Fetching emails with criteria: %s", filter_criteria)
 
-        requested_limit = limit
+        # A cursor page reads one row past the page to tell whether another
+        # page follows, a full last page would otherwise look continued
+        requested_limit = limit + 1 if cursor else limit
+        filter_criteria["limit"] = requested_limit
 
+        if email_archives:
+            emails = email_archive.list_emails_with_archives(
+                email_repo, email_archives, filter_criteria
+            )
+            logger.info(
+                "Archived run query successful, %d emails fetched.", len(emails)
+            )
         # If requested limit is small, use it directly
-        if requested_limit <= RDS_DATA_API_SAFE_BATCH_SIZE:
-            emails = email_repo.list_emails(filter_criteria)
+        elif requested_limit <= RDS_DATA_API_SAFE_BATCH_SIZE:
+            if total_items is None:
+                # One statement returns both the page and the total count
+                emails, total_items = email_repo.list_emails_with_total_count(
+                    filter_criteria
+                )
+            else:
+                emails = email_repo.list_emails(filter_criteria)
             # Handle potential None return from list_emails
             if emails is None:
                 emails = []
@@ -156,28 +281,25 @@ def lambda_handler(event: dict[str, any], context: object) -> dict[str, any]:
             )
 
             all_emails = []
-            current_offset = (
-                page - 1
-            ) * limit  # Calculate starting offset for the requested page
-            remaining_items = requested_limit
-
-            while remaining_items > 0:
+            batch_filter_criteria = filter_criteria.copy()
+            # Only the first batch may need an offset (page-based access);
+            # every following batch continues from the last row it received.
+            current_offset = 0 if cursor else (page - 1) * limit
+            if current_offset:
+                batch_filter_criteria["offset"] = current_offset
+
+            while len(all_emails) < requested_limit:
                 # Calculate current batch size
-                current_batch_size = min(RDS_DATA_API_SAFE_BATCH_SIZE, remaining_items)
-
-                # Calculate current page for this batch based on current_offset
-                current_page = (current_offset // current_batch_size) + 1
-
-                # Create batch filter criteria
-                batch_filter_criteria = filter_criteria.copy()
+                current_batch_size = min(
+                    RDS_DATA_API_SAFE_BATCH_SIZE, requested_limit - len(all_emails)
+                )
                 batch_filter_criteria["limit"] = current_batch_size
-                batch_filter_criteria["page"] = current_page
 
                 logger.info(
-                    "Fetching batch: page=%d, limit=%d, offset=%d",
-                    current_page,
+                    "Fetching batch: limit=%d, offset=%s, cursor=%s",
                     current_batch_size,
-                    current_offset,
+                    batch_filter_criteria.get("offset"),
+                    batch_filter_criteria.get("cursor"),
                 )
 
                 # Fetch current batch
@@ -187,18 +309,9 @@ def lambda_handler(event: dict[str, any], context: object) -> dict[str, any]:
                 if batch_emails is None:
                     batch_emails = []
 
-                # If we get less than expected, we've reached the end
-                if len(batch_emails) == 0:
-                    logger.info("No more emails to fetch, breaking from batch loop")
-                    break
-
                 # Add batch results to all_emails
                 all_emails.extend(batch_emails)
 
-                # Update counters
-                remaining_items -= len(batch_emails)
-                current_offset += len(batch_emails)
-
                 # If we got fewer items than batch size, we've reached the end
                 if len(batch_emails) < current_batch_size:
                     logger.info(
@@ -208,18 +321,37 @@ def lambda_handler(event: dict[str, any], context: object) -> dict[str, any]:
                     )
                     break
 
+                if sort_by == "created_at":
+                    # Keyset: the next batch starts right after the last row
+                    batch_filter_criteria.pop("offset", None)
+                    batch_filter_criteria["cursor"] = {
+                        "created_at": batch_emails[-1]["created_at"],
+                        "email_id": batch_emails[-1]["email_id"],
+                    }
+                else:
+                    current_offset += len(batch_emails)
+                    batch_filter_criteria["offset"] = current_offset
+
             emails = all_emails
             logger.info(
                 "Batch fetching completed, %d total emails fetched.", len(emails)
             )
 
-        # Get total count for pagination info
-        count_filter_criteria = filter_criteria.copy()
-        count_filter_criteria.pop("page", None)
-        count_filter_criteria.pop("limit", None)
-        count_filter_criteria.pop("sort_by", None)
-        count_filter_criteria.pop("sort_order", None)
-        total_items = email_repo.count_emails(count_filter_criteria)
+        has_more_emails = len(emails) > limit
+        emails = emails[:limit]
+
+        # Get total count for pagination info, unless it is already known
+        if total_items is None:
+            count_filter_criteria = filter_criteria.copy()
+            count_filter_criteria.pop("page", None)
+            count_filter_criteria.pop("limit", None)
+            count_filter_criteria.pop("cursor", None)
+            count_filter_criteria.pop("sort_by", None)
+            count_filter_criteria.pop("sort_order", None)
+            count_filter_criteria.pop("fields", None)
+            total_items = (
+                email_repo.count_emails(count_filter_criteria) + archived_items
+            )
 
         logger.info(
             "Query successful, %d emails fetched, %d total items.",
@@ -267,27 +399,44 @@ def lambda_handler(event: dict[str, any], context: object) -> dict[str, any]:
     ):  # if items exist but limit makes total_pages 0, set to 1
         total_pages = 1
 
-    has_next_page = page < total_pages
-    has_previous_page = (
-        page > 1 and page <= total_pages
-    )  # page > total_pages should not happen with correct total_pages
+    if cursor:
+        has_next_page = has_more_emails
+        has_previous_page = True
+    else:
+        has_next_page = page < total_pages
+        has_previous_page = (
+            page > 1 and page <= total_pages
+        )  # page > total_pages should not happen with correct total_pages
+
+    # A page sorted by created_at that is followed by another can be continued
+    # with a cursor
+    next_cursor = None
+    if (
+        extracted_params["limit"] != "ALL"
+        and sort_by == "created_at"
+        and emails
+        and has_next_page
+    ):
+        next_cursor = encode_cursor(emails[-1])
 
     result = {
         "data": processed_emails,
         "pagination": {
-            "page": page,
+            # Cursor pages are not numbered
+            "page": None if cursor else page,
             "limit": limit,
             "total_items": total_items,
             "total_pages": total_pages,
             "has_next_page": has_next_page,
             "has_previous_page": has_previous_page,
+            "next_cursor": next_cursor,
         },
     }
 
     logger.info(
-        "Returning response with %d emails, page %d of %d. Total items: %d",
+        "Returning response with %d emails, page %s of %d. Total items: %d",
         len(processed_emails),
-        page,
+        None if cursor else page,
         total_pages,
         total_items,
     )
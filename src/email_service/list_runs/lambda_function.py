@@ -1,9 +1,15 @@
+import base64
 import json
 import logging
 import math  # Added for math.ceil
 
 from botocore.exceptions import ClientError
-from run_repository import RunRepository
+from run_repository import (
+    FILTERED_SORT_COLUMNS,
+    INDEXED_SORT_COLUMNS,
+    RUN_COLUMNS,
+    RunRepository,
+)
 
 # Removed unused time_util import
 
@@ -13,6 +19,84 @@ logger.setLevel(logging.INFO)
 
 # DecimalEncoder is removed as RunRepository handles Decimal to float for PostgreSQL JSONB.
 
+# Lean projection used when no 'fields' are requested: the recipients, sender,
+# template and attachment JSONB blobs are only needed by GET /runs/{run_id}
+DEFAULT_LIST_RUN_FIELDS = [
+    "run_id",
+    "run_type",
+    "created_at",
+    "created_year",
+    "display_name",
+    "subject",
+    "sender_id",
+    "sender_local_part",
+    "recipient_source",
+    "template_file_id",
+    "spreadsheet_file_id",
+    "is_generate_certificate",
+    "expected_email_send_count",
+    "success_email_count",
+    "failed_email_count",
+]
+# Always selected, the cursor is built from them
+REQUIRED_LIST_RUN_FIELDS = ["run_id", "created_at"]
+
+
+def decode_cursor(encoded_cursor: str) -> dict[str, str]:
+    """Decode an opaque pagination cursor into its (created_at, run_id) key."""
+    try:
+        decoded_cursor = json.loads(
+            base64.urlsafe_b64decode(encoded_cursor.encode("utf-8")).decode("utf-8")
+        )
+    except (json.JSONDecodeError, UnicodeDecodeError, base64.binascii.Error) as e:
+        logger.error("Invalid cursor format: %s", e)
+        raise ValueError(
+            "Invalid cursor format. It must be a cursor returned by a previous request."
+        ) from e
+
+    if (
+        not isinstance(decoded_cursor, dict)
+        or not decoded_cursor.get("created_at")
+        or not decoded_cursor.get("run_id")
+    ):
+        raise ValueError(
+            "Invalid cursor format. It must be a cursor returned by a previous request."
+        )
+    return {
+        "created_at": decoded_cursor["created_at"],
+        "run_id": decoded_cursor["run_id"],
+    }
+
+
+def encode_cursor(run: dict[str, any]) -> str:
+    """Encode the (created_at, run_id) key of a run into an opaque cursor."""
+    cursor = {"created_at": run["created_at"], "run_id": run["run_id"]}
+    return base64.urlsafe_b64encode(json.dumps(cursor).encode("utf-8")).decode("utf-8")
+
+
+def parse_fields(fields_param: str | None) -> list[str]:
+    """Parse the comma-separated 'fields' parameter into a validated projection."""
+    if fields_param is None:
+        requested_fields = DEFAULT_LIST_RUN_FIELDS
+    else:
+        requested_fields = [
+            field.strip() for field in fields_param.split(",") if field.strip()
+        ]
+        if not requested_fields:
+            raise ValueError("'fields' must name at least one field.")
+
+    invalid_fields = [field for field in requested_fields if field not in RUN_COLUMNS]
+    if invalid_fields:
+        raise ValueError(
+            f"Invalid fields: {', '.join(invalid_fields)}. Valid fields are: {', '.join(RUN_COLUMNS)}"
+        )
+
+    fields = []
+    for field in [*REQUIRED_LIST_RUN_FIELDS, *requested_fields]:
+        if field not in fields:
+            fields.append(field)
+    return fields
+
 
 def extract_query_params(event: dict[str, any]) -> dict[str, any]:
     """Extract and validate query parameters from the API Gateway event."""
@@ -34,6 +118,17 @@ def extract_query_params(event: dict[str, any]) -> dict[str, any]:
         # Add any other filter parameters the user might send, e.g. sender_id
         sender_id: str | None = params.get("sender_id", None)
 
+        if sort_by not in INDEXED_SORT_COLUMNS:
+            raise ValueError(
+                f"Invalid sort_by: {sort_by}. Valid values are: {', '.join(INDEXED_SORT_COLUMNS)}"
+            )
+        if (run_type or created_year or sender_id) and (
+            sort_by not in FILTERED_SORT_COLUMNS
+        ):
+            raise ValueError(
+                f"sort_by {sort_by} cannot be combined with the run_type, created_year or sender_id filters. Valid values are: {', '.join(FILTERED_SORT_COLUMNS)}"
+            )
+
         if sort_order not in ["ASC", "DESC"]:
             logger.warning(
                 "Invalid sort_order '%s' received, defaulting to DESC.", sort_order
@@ -48,6 +143,16 @@ def extract_query_params(event: dict[str, any]) -> dict[str, any]:
             logger.warning("Invalid limit %d received, defaulting to 20.", limit)
             limit = 20
 
+        cursor: dict[str, str] | None = None
+        if params.get("cursor"):
+            if sort_by != "created_at":
+                raise ValueError(
+                    "'cursor' is only supported when sorting by created_at."
+                )
+            cursor = decode_cursor(params["cursor"])
+
+        fields = parse_fields(params.get("fields"))
+
     except ValueError as e:
         logger.error("Invalid query parameter type: %s", e)
         return {
@@ -57,7 +162,7 @@ def extract_query_params(event: dict[str, any]) -> dict[str, any]:
 
     # Log the extracted parameters
     logger.info(
-        "Extracted parameters - page: %d, limit: %d, sort_by: %s, sort_order: %s, run_type: %s, created_year: %s, sender_id: %s",
+        "Extracted parameters - page: %d, limit: %d, sort_by: %s, sort_order: %s, run_type: %s, created_year: %s, sender_id: %s, cursor: %s, fields: %s",
         page,
         limit,
         sort_by,
@@ -65,6 +170,8 @@ def extract_query_params(event: dict[str, any]) -> dict[str, any]:
         run_type,
         created_year,
         sender_id,
+        cursor,
+        fields,
     )
 
     return {
@@ -75,6 +182,8 @@ def extract_query_params(event: dict[str, any]) -> dict[str, any]:
         "run_type": run_type,
         "created_year": created_year,
         "sender_id": sender_id,  # Include sender_id if it's a filter
+        "cursor": cursor,
+        "fields": fields,
     }
 
 
@@ -96,6 +205,7 @@ def lambda_handler(event: dict[str, any], context: object) -> dict[str, any]:
     limit = query_params_result.get("limit", 100)
     sort_by = query_params_result.get("sort_by", "created_at")
     sort_order = query_params_result.get("sort_order", "DESC")
+    cursor = query_params_result.get("cursor")
     # Filters for the repository
     filters = {}
     if query_params_result.get("run_type"):
@@ -124,11 +234,13 @@ def lambda_handler(event: dict[str, any], context: object) -> dict[str, any]:
     try:
         # Prepare params for repository methods
         repo_params = {
-            "page": page,
+            # Cursor pages are not numbered
+            "page": None if cursor else page,
             "limit": limit,
             "sort_by": sort_by,
             "sort_order": sort_order,
             "filters": filters,  # Pass collected filters
+            "fields": query_params_result.get("fields"),
         }
 
         # Add specific top-level params if your repository expects them directly
@@ -140,8 +252,17 @@ def lambda_handler(event: dict[str, any], context: object) -> dict[str, any]:
         if "sender_id" in filters:
             repo_params["sender_id"] = filters["sender_id"]
 
-        runs = run_repo.list_runs(repo_params)
-        total_items = run_repo.count_runs(repo_params)
+        if cursor:
+            # Read one run past the page to tell whether another page follows,
+            # a full last page would otherwise look continued
+            repo_params["limit"] = limit + 1
+
+        # One statement returns both the page and the total count
+        runs, total_items = run_repo.list_runs_with_total_count(
+            {**repo_params, "cursor": cursor}
+        )
+        has_more_runs = len(runs) > limit
+        runs = runs[:limit]
 
         logger.info(
             "Query successful. Fetched %d runs. Total items: %d", len(runs), total_items
@@ -174,18 +295,31 @@ def lambda_handler(event: dict[str, any], context: object) -> dict[str, any]:
 
     # Calculate pagination details
     total_pages = math.ceil(total_items / limit) if limit > 0 else 0
-    has_next_page = page < total_pages
-    has_previous_page = page > 1
+
+    if cursor:
+        has_next_page = has_more_runs
+        has_previous_page = True
+    else:
+        has_next_page = page < total_pages
+        has_previous_page = page > 1
+
+    # A page sorted by created_at that is followed by another can be continued
+    # with a cursor
+    next_cursor = None
+    if sort_by == "created_at" and runs and has_next_page:
+        next_cursor = encode_cursor(runs[-1])
 
     result = {
         "data": runs,  # Assumes runs are already in correct format (e.g., Decimals handled by repo)
         "pagination": {
-            "page": page,
+            # Cursor pages are not numbered
+            "page": None if cursor else page,
             "limit": limit,
             "total_items": total_items,
             "total_pages": total_pages,
             "has_next_page": has_next_page,
             "has_previous_page": has_previous_page,
+            "next_cursor": next_cursor,
         },
     }
 
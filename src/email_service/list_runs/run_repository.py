@@ -6,6 +6,7 @@ from decimal import Decimal
 
 import boto3
 import time_util
+from postgres_client import get_postgres_client
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
@@ -20,7 +21,44 @@ JSONB_COLUMNS = {
     "spreadsheet_file",
     "template_file",
 }
-TIMESTAMP_COLUMNS = {"created_at"}  # Added for consistency
+TIMESTAMP_COLUMNS = {"created_at", "updated_at"}  # Added for consistency
+# Columns of the RUNS table that may be requested through a field projection
+RUN_COLUMNS = (
+    "run_id",
+    "run_type",
+    "attachment_file_ids",
+    "attachment_files",
+    "bcc",
+    "cc",
+    "created_at",
+    "created_year",
+    "created_year_month",
+    "created_year_month_day",
+    "display_name",
+    "expected_email_send_count",
+    "is_generate_certificate",
+    "recipients",
+    "recipient_source",
+    "reply_to",
+    "sender",
+    "sender_id",
+    "sender_local_part",
+    "spreadsheet_file",
+    "spreadsheet_file_id",
+    "subject",
+    "success_email_count",
+    "failed_email_count",
+    "template_file",
+    "template_file_id",
+    "updated_at",
+)
+# Orderings read in order from an index: the primary key, and created_at
+# through idx_runs_created_at_run_id and the (filter, created_at, run_id)
+# indexes of every list_runs filter
+INDEXED_SORT_COLUMNS = ("created_at", "run_id")
+# Orderings still read from an index once the runs are filtered; no index
+# starts with a filter column followed by run_id
+FILTERED_SORT_COLUMNS = ("created_at",)
 
 DATABASE_NAME = os.environ["DATABASE_NAME"]
 RDS_CLUSTER_ARN = os.environ["RDS_CLUSTER_ARN"]
@@ -98,6 +136,92 @@ def parse_field(col_name, field):
     return field
 
 
+# Data API field key holding the values of each PostgreSQL type,
+# every type not listed here is returned as a stringValue
+DATA_API_VALUE_KEYS = {
+    "bool": "booleanValue",
+    "int2": "longValue",
+    "int4": "longValue",
+    "int8": "longValue",
+    "serial": "longValue",
+    "bigserial": "longValue",
+    "float4": "doubleValue",
+    "float8": "doubleValue",
+    "bytea": "blobValue",
+}
+
+
+def decode_json_column(col_name, values):
+    """
+    Decode the JSONB strings of one column with a single json.loads call
+
+    :param col_name: Column name
+    :param values: The column's raw strings, None for NULL
+    :return: The decoded values
+    """
+    present_values = [value for value in values if value is not None]
+    try:
+        decoded_values = json.loads("[" + ",".join(present_values) + "]")
+    except json.JSONDecodeError:
+        decoded_values = None
+    if decoded_values is None or len(decoded_values) != len(present_values):
+        # Decode cell by cell, parse_field keeps strings that are not JSON
+        return [
+            None if value is None else parse_field(col_name, {"stringValue": value})
+            for value in values
+        ]
+
+    decoded_iter = iter(decoded_values)
+    return [None if value is None else next(decoded_iter) for value in values]
+
+
+def decode_records(column_metadata, records):
+    """
+    Decode a Data API result set column by column. The decoder of each column
+    is picked once from columnMetadata instead of inspecting every cell, and
+    JSONB columns are decoded in bulk.
+
+    :param column_metadata: columnMetadata of the Data API response
+    :param records: records of the Data API response
+    :return: List of rows as dicts
+    """
+    if not records:
+        return []
+
+    columns = []
+    decoded_columns = []
+    for index, col in enumerate(column_metadata):
+        col_name = col["name"]
+        columns.append(col_name)
+        value_key = DATA_API_VALUE_KEYS.get(col.get("typeName"), "stringValue")
+        first_value = next(
+            (record[index] for record in records if not record[index].get("isNull")),
+            None,
+        )
+        if first_value is not None and value_key not in first_value:
+            # Arrays and unexpected value types keep the generic parse_field
+            decoded_columns.append(
+                [parse_field(col_name, record[index]) for record in records]
+            )
+            continue
+
+        # NULL cells only carry isNull, so they decode to None
+        values = [record[index].get(value_key) for record in records]
+        if value_key == "stringValue" and col_name in JSONB_COLUMNS:
+            values = decode_json_column(col_name, values)
+        elif value_key == "stringValue" and col_name in TIMESTAMP_COLUMNS:
+            values = [
+                None if value is None else parse_field(col_name, {"stringValue": value})
+                for value in values
+            ]
+        decoded_columns.append(values)
+
+    return [
+        dict(zip(columns, row, strict=True))
+        for row in zip(*decoded_columns, strict=True)
+    ]
+
+
 # Custom JSON encoder to handle Decimal types
 class DecimalEncoder(json.JSONEncoder):
     """Custom JSON encoder for Decimal objects."""
@@ -129,6 +253,8 @@ class RunRepository:
         self._database_name = DATABASE_NAME
         self._resource_arn = RDS_CLUSTER_ARN
         self._secret_arn = RDS_CLUSTER_MASTER_USER_SECRET_ARN
+        # Pooled PostgreSQL connection when DATABASE_BACKEND=postgres
+        self._postgres_client = get_postgres_client()
 
     def get_run_by_id(self, run_id: str) -> dict | None:
         """
@@ -287,11 +413,60 @@ class RunRepository:
         """
         Generic query method to list email tasks based on filter conditions
 
-        :param params: Query parameters, may include filters, sorting and pagination
+        :param params: Query parameters, may include filters, sorting, pagination
+            and the fields to select
         :return: List of email tasks
         """
+        sql, query_params = self._build_list_runs_sql(
+            self._build_select_clause(params.get("fields")), params
+        )
+
+        # Execute query
+        return self._execute(sql, query_params, fetch=True)
+
+    def list_runs_with_total_count(self, params):
+        """
+        List email tasks together with the total number of matching tasks in a
+        single statement.
+
+        :param params: Query parameters, may include filters, sorting, pagination
+            and the fields to select
+        :return: Tuple of (list of email tasks, total count)
+        """
+        if params.get("cursor"):
+            # A window count would only cover the rows after the cursor
+            return self.list_runs(params), self.count_runs(params)
+
+        select_clause = self._build_select_clause(params.get("fields"))
+        sql, query_params = self._build_list_runs_sql(
+            f"{select_clause}, COUNT(*) OVER() AS total_count", params
+        )
+        rows = self._execute(sql, query_params, fetch=True)
+        if not rows:
+            # The window count is only available on returned rows, e.g. a page
+            # past the end has to be counted separately.
+            return [], self.count_runs(params)
+
+        total_count = rows[0]["total_count"]
+        for row in rows:
+            row.pop("total_count", None)
+        return rows, total_count
+
+    def _build_select_clause(self, fields):
+        """Turn a field projection into an explicit column list, all columns if empty"""
+        if not fields:
+            return "*"
+
+        invalid_fields = [field for field in fields if field not in RUN_COLUMNS]
+        if invalid_fields:
+            raise ValueError(f"Invalid fields: {', '.join(invalid_fields)}")
+        return ", ".join(fields)
+
+    def _build_list_runs_sql(self, select_clause, params):
+        """Build the filtered, sorted and paginated run list statement"""
         # Build base SQL
-        sql = "SELECT * FROM runs WHERE 1=1 "
+        # The view adds the counter shards to the run's counters
+        sql = f"SELECT {select_clause} FROM runs_with_counters WHERE 1=1 "
         query_params = []
 
         # Add filter conditions
@@ -300,17 +475,47 @@ class RunRepository:
         )
 
         # Add sorting
-        sort_by = params.get("sort_by", "created_at")
-        sort_order = params.get("sort_order", "DESC").upper()
-        sql += f" ORDER BY {sort_by} {sort_order}"
+        sort_by_input = params.get("sort_by", "created_at")
+        sort_order_input = params.get("sort_order", "DESC").upper()
+
+        # Validate the sort_by parameter against the index-backed orderings
+        if sort_by_input in INDEXED_SORT_COLUMNS:
+            sort_by = sort_by_input
+        else:
+            logger.warning(
+                "Invalid sort_by column '%s' provided. Defaulting to 'created_at'.",
+                sort_by_input,
+            )
+            sort_by = "created_at"  # Default to a known safe column
+
+        # Validate the sort_order parameter
+        if sort_order_input in ["ASC", "DESC"]:
+            sort_order = sort_order_input
+        else:
+            logger.warning(
+                "Invalid sort_order value '%s' provided. Defaulting to 'DESC'.",
+                sort_order_input,
+            )
+            sort_order = "DESC"  # Default to a known safe order
+
+        # Continue after the cursor row instead of skipping rows with OFFSET
+        cursor = params.get("cursor")
+        if cursor:
+            if sort_by != "created_at":
+                raise ValueError("Cursor pagination is only supported for created_at")
+            sql, query_params = self._add_keyset_sql(
+                sql=sql, params=query_params, cursor=cursor, sort_order=sort_order
+            )
+
+        # Add a secondary, unique sort key to ensure stable pagination
+        sql += f" ORDER BY {sort_by} {sort_order}, run_id {sort_order}"
 
         # Add pagination
         sql, query_params = self._add_pagination_sql(
             sql=sql, params=query_params, query_params=params
         )
 
-        # Execute query
-        return self._execute(sql, query_params, fetch=True)
+        return sql, query_params
 
     def count_runs(self, params):
         """
@@ -339,7 +544,16 @@ class RunRepository:
         # Also use other parameters from query_params as filter conditions
         for key, value in query_params.items():
             if (
-                key not in ("filters", "page", "limit", "sort_by", "sort_order")
+                key
+                not in (
+                    "filters",
+                    "page",
+                    "limit",
+                    "cursor",
+                    "sort_by",
+                    "sort_order",
+                    "fields",
+                )
                 and value is not None
             ):
                 filters[key] = value
@@ -355,8 +569,12 @@ class RunRepository:
     def _add_pagination_sql(self, sql, params, query_params):
         """Add pagination to SQL statement"""
         limit = int(query_params.get("limit", 10))
-        page = int(query_params.get("page", 1))
-        offset = (page - 1) * limit
+        if query_params.get("cursor"):
+            # The keyset condition already positions the page
+            offset = 0
+        else:
+            page = int(query_params.get("page", 1))
+            offset = (page - 1) * limit
 
         sql += " LIMIT :limit OFFSET :offset"
         params.append({"name": "limit", "value": {"longValue": limit}})
@@ -364,6 +582,32 @@ class RunRepository:
 
         return sql, params
 
+    def _add_keyset_sql(self, sql, params, cursor, sort_order):
+        """Add a (created_at, run_id) keyset condition to SQL statement"""
+        comparator = "<" if sort_order == "DESC" else ">"
+        sql += f" AND (created_at, run_id) {comparator} (:cursor_created_at, :cursor_run_id)"
+
+        created_at = cursor["created_at"]
+        try:
+            dt_obj = time_util.parse_iso8601_to_datetime(created_at)
+            created_at = time_util.format_datetime_for_rds(dt_obj)
+        except ValueError:
+            # Already in the 'YYYY-MM-DD HH:MM:SS[.ffffff]' form returned by RDS
+            pass
+
+        params.append(
+            {
+                "name": "cursor_created_at",
+                "value": {"stringValue": created_at},
+                "typeHint": "TIMESTAMP",
+            }
+        )
+        params.append(
+            {"name": "cursor_run_id", "value": {"stringValue": cursor["run_id"]}}
+        )
+
+        return sql, params
+
     def _create_param(self, key, value):
         """Create SQL parameter"""
         if value is None:
@@ -409,6 +653,16 @@ class RunRepository:
             if os.getenv("DEBUG_SQL", "false").lower() == "true":
                 logger.debug("Executing SQL:\n%s\nParams:\n%s", sql, parameters)
 
+            if self._postgres_client:
+                rows = self._postgres_client.execute(sql, parameters, fetch)
+                if fetch:
+                    # Same ISO 8601 timestamps as parse_field returns
+                    for row in rows:
+                        for col in TIMESTAMP_COLUMNS & row.keys():
+                            if row[col] is not None:
+                                row[col] = parse_field(col, {"stringValue": row[col]})
+                return rows
+
             response = self._rds_data.execute_statement(
                 resourceArn=self._resource_arn,
                 secretArn=self._secret_arn,
@@ -423,14 +677,7 @@ class RunRepository:
             if not fetch:
                 return None
 
-            columns = [col["name"] for col in response["columnMetadata"]]
-            return [
-                {
-                    col: parse_field(col, val)
-                    for col, val in zip(columns, row, strict=False)
-                }
-                for row in response["records"]
-            ]
+            return decode_records(response["columnMetadata"], response["records"])
         except Exception as e:
             logger.error(
                 "SQL execution failed: %s\nSQL: %s\nParams: %s", e, sql, parameters
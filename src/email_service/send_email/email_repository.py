@@ -5,6 +5,7 @@ from decimal import Decimal  # Added import
 
 import boto3
 import time_util
+from postgres_client import get_postgres_client
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
@@ -82,6 +83,87 @@ def parse_field(col_name, field):
     return field
 
 
+# Data API field key holding the values of each PostgreSQL type,
+# every type not listed here is returned as a stringValue
+DATA_API_VALUE_KEYS = {
+    "bool": "booleanValue",
+    "int2": "longValue",
+    "int4": "longValue",
+    "int8": "longValue",
+    "serial": "longValue",
+    "bigserial": "longValue",
+    "float4": "doubleValue",
+    "float8": "doubleValue",
+    "bytea": "blobValue",
+}
+
+
+def decode_json_column(col_name, values):
+    """
+    Decode the JSONB strings of one column with a single json.loads call
+
+    :param col_name: Column name
+    :param values: The column's raw strings, None for NULL
+    :return: The decoded values
+    """
+    present_values = [value for value in values if value is not None]
+    try:
+        decoded_values = json.loads("[" + ",".join(present_values) + "]")
+    except json.JSONDecodeError:
+        decoded_values = None
+    if decoded_values is None or len(decoded_values) != len(present_values):
+        # Decode cell by cell, parse_field keeps strings that are not JSON
+        return [
+            None if value is None else parse_field(col_name, {"stringValue": value})
+            for value in values
+        ]
+
+    decoded_iter = iter(decoded_values)
+    return [None if value is None else next(decoded_iter) for value in values]
+
+
+def decode_records(column_metadata, records):
+    """
+    Decode a Data API result set column by column. The decoder of each column
+    is picked once from columnMetadata instead of inspecting every cell, and
+    JSONB columns are decoded in bulk.
+
+    :param column_metadata: columnMetadata of the Data API response
+    :param records: records of the Data API response
+    :return: List of rows as dicts
+    """
+    if not records:
+        return []
+
+    columns = []
+    decoded_columns = []
+    for index, col in enumerate(column_metadata):
+        col_name = col["name"]
+        columns.append(col_name)
+        value_key = DATA_API_VALUE_KEYS.get(col.get("typeName"), "stringValue")
+        first_value = next(
+            (record[index] for record in records if not record[index].get("isNull")),
+            None,
+        )
+        if first_value is not None and value_key not in first_value:
+            # Arrays and unexpected value types keep the generic parse_field
+            decoded_columns.append(
+                [parse_field(col_name, record[index]) for record in records]
+            )
+            continue
+
+        # NULL cells only carry isNull, so they decode to None
+        values = [record[index].get(value_key) for record in records]
+        if value_key == "stringValue" and col_name in JSONB_COLUMNS:
+            values = decode_json_column(col_name, values)
+        decoded_columns.append(values)
+
+    return [
+        dict(zip(columns, row, strict=True))
+        for row in zip(*decoded_columns, strict=True)
+    ]
+
+
 class EmailRepositoryError(Exception):
     """Email repository error"""
 
@@ -101,6 +183,8 @@ class EmailRepository:
         self._database_name = DATABASE_NAME
         self._resource_arn = RDS_CLUSTER_ARN
         self._secret_arn = RDS_CLUSTER_MASTER_USER_SECRET_ARN
+        # Pooled PostgreSQL connection when DATABASE_BACKEND=postgres
+        self._postgres_client = get_postgres_client()
 
     def list_emails(self, filter_criteria_dict):
         """Get email list"""
@@ -192,7 +276,7 @@ class EmailRepository:
             sql_string = f"""
                 INSERT INTO emails ({columns_str})
                 VALUES ({placeholders})
-                ON CONFLICT (email_id)
+                ON CONFLICT (email_id, created_at)
                 DO UPDATE SET {update_str}
             """
 
@@ -343,6 +427,9 @@ class EmailRepository:
             if os.getenv("DEBUG_SQL", "false").lower() == "true":
                 logger.debug("Executing SQL:\n%s\nParams:\n%s", sql, parameters)
 
+            if self._postgres_client:
+                return self._postgres_client.execute(sql, parameters, fetch)
+
             response = self._rds_data.execute_statement(
                 resourceArn=self._resource_arn,
                 secretArn=self._secret_arn,
@@ -355,14 +442,7 @@ class EmailRepository:
             if not fetch:
                 return None
 
-            columns = [col["name"] for col in response["columnMetadata"]]
-            return [
-                {
-                    col: parse_field(col, val)
-                    for col, val in zip(columns, row, strict=False)
-                }
-                for row in response["records"]
-            ]
+            return decode_records(response["columnMetadata"], response["records"])
         except Exception as e:
             logger.error(
                 "SQL execution failed: %s\nSQL: %s\nParams: %s", e, sql, parameters
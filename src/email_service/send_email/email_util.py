@@ -5,7 +5,7 @@ from email.mime.text import MIMEText
 from email.utils import formataddr
 
 from current_user_util import current_user_util
-from file_util import download_file_content
+from file_util import download_attachment_content
 
 from file_service import FileService
 
@@ -98,7 +98,7 @@ def attach_files_to_message(msg, file_ids):
 
             if file_url and file_name:
                 # Download the file and attach it
-                file_content = download_file_content(file_url)
+                file_content = download_attachment_content(file_info)
                 attachment = MIMEApplication(file_content)
                 attachment.add_header(
                     "Content-Disposition", "attachment", filename=file_name
@@ -1,4 +1,32 @@
+import io
+import os
+
+import boto3
 import requests
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
+
+BUCKET_NAME = os.getenv("BUCKET_NAME")
+# "s3" reads attachments with the S3 client, "url" downloads their file_url
+ATTACHMENT_DOWNLOAD_MODE = os.getenv("ATTACHMENT_DOWNLOAD_MODE", "s3")
+# Objects above the threshold are fetched as parallel ranged GETs
+RANGED_GET_THRESHOLD = 8 * 1024 * 1024
+RANGED_GET_CHUNK_SIZE = 8 * 1024 * 1024
+RANGED_GET_MAX_CONCURRENCY = 8
+
+# One pooled client per container, with boto3's standard retries
+s3_client = boto3.client(
+    "s3",
+    config=Config(
+        max_pool_connections=RANGED_GET_MAX_CONCURRENCY,
+        retries={"mode": "standard"},
+    ),
+)
+transfer_config = TransferConfig(
+    multipart_threshold=RANGED_GET_THRESHOLD,
+    multipart_chunksize=RANGED_GET_CHUNK_SIZE,
+    max_concurrency=RANGED_GET_MAX_CONCURRENCY,
+)
 
 
 def download_file_content(file_url):
@@ -11,3 +39,32 @@ def download_file_content(file_url):
     response = requests.get(file_url, timeout=25)
     response.raise_for_status()
     return response.content
+
+
+def download_s3_object_content(s3_object_key, bucket_name=BUCKET_NAME):
+    """
+    Download the content of an S3 object. Large objects are downloaded as
+    parallel ranged GETs.
+
+    :param s3_object_key: Key of the object to be downloaded.
+    :param bucket_name: Bucket of the object.
+    :return: Content of the downloaded object.
+    """
+    buffer = io.BytesIO()
+    s3_client.download_fileobj(
+        bucket_name, s3_object_key, buffer, Config=transfer_config
+    )
+    return buffer.getvalue()
+
+
+def download_attachment_content(file_info):
+    """
+    Download the content of an attachment from its file service record.
+
+    :param file_info: File information from the file service.
+    :return: Content of the attachment.
+    """
+    s3_object_key = file_info.get("s3_object_key")
+    if ATTACHMENT_DOWNLOAD_MODE == "s3" and s3_object_key:
+        return download_s3_object_content(s3_object_key)
+    return download_file_content(file_info["file_url"])
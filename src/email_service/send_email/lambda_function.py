@@ -6,9 +6,10 @@ import re
 from current_user_util import current_user_util
 from email_repository import EmailRepository
 from run_repository import RunRepository
-from s3 import read_html_template_file_from_s3
+from s3 import read_html_template_file_from_s3, read_template_artifact_from_s3
 from ses import send_email
 from sqs import delete_sqs_message, get_sqs_message
+from template_util import compile_template
 
 from file_service import FileService
 
@@ -52,6 +53,32 @@ def _parse_json_field(json_string, default_value=None, field_name="field"):
     return default_value
 
 
+def load_compiled_template(template_file_info: dict) -> dict:
+    """
+    Load the template compiled by the file service at upload time, or compile
+    the HTML of templates uploaded before that.
+
+    :param template_file_info: The template file information from the file service
+    :return: The compiled template, without carriage returns in its text
+    """
+    template_artifact_s3_key = template_file_info.get("template_artifact_s3_object_key")
+    if template_artifact_s3_key:
+        compiled_template = read_template_artifact_from_s3(
+            bucket=BUCKET_NAME, template_artifact_s3_key=template_artifact_s3_key
+        )
+    else:
+        template_content = read_html_template_file_from_s3(
+            bucket=BUCKET_NAME, template_file_s3_key=template_file_info["s3_object_key"]
+        )
+        compiled_template = compile_template(template_content)
+
+    compiled_template["segments"] = [
+        segment.replace("\r", "") if isinstance(segment, str) else segment
+        for segment in compiled_template["segments"]
+    ]
+    return compiled_template
+
+
 def process_email(email_data: dict) -> None:
     """
     Process email sending for a given email record.
@@ -77,10 +104,7 @@ def process_email(email_data: dict) -> None:
             email_data.get("template_file_id"),
             current_user_util.get_current_user_access_token(),
         )
-        template_file_s3_object_key = template_file_info["s3_object_key"]
-        template_content = read_html_template_file_from_s3(
-            bucket=BUCKET_NAME, template_file_s3_key=template_file_s3_object_key
-        )
+        compiled_template = load_compiled_template(template_file_info)
 
         # Parse JSON string fields from SQS message
         row_data = _parse_json_field(
@@ -101,7 +125,7 @@ def process_email(email_data: dict) -> None:
         # Send email
         _, status = send_email(
             subject=email_data.get("subject"),
-            template_content=template_content,
+            compiled_template=compiled_template,
             row=row_data,  # Use parsed row_data
             display_name=email_data.get("display_name"),
             reply_to=email_data.get("reply_to"),
@@ -1,10 +1,12 @@
 import json
 import logging
 import os
+import random
 from decimal import Decimal  # Added import
 
 import boto3
 import time_util
+from postgres_client import get_postgres_client
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
@@ -25,6 +27,12 @@ DATABASE_NAME = os.environ["DATABASE_NAME"]
 RDS_CLUSTER_ARN = os.environ["RDS_CLUSTER_ARN"]
 RDS_CLUSTER_MASTER_USER_SECRET_ARN = os.environ["RDS_CLUSTER_MASTER_USER_SECRET_ARN"]
 
+# More shards than send_email's maximum concurrency, so concurrent containers
+# rarely share a counter row
+RUN_COUNTER_SHARD_COUNT = int(os.getenv("RUN_COUNTER_SHARD_COUNT", "32"))
+# Chosen once per container, all its increments go to the same row
+RUN_COUNTER_SHARD = random.randrange(RUN_COUNTER_SHARD_COUNT)
+
 
 def parse_field(col_name, field):
     """
@@ -81,6 +89,87 @@ def parse_field(col_name, field):
     return field
 
 
+# Data API field key holding the values of each PostgreSQL type,
+# every type not listed here is returned as a stringValue
+DATA_API_VALUE_KEYS = {
+    "bool": "booleanValue",
+    "int2": "longValue",
+    "int4": "longValue",
+    "int8": "longValue",
+    "serial": "longValue",
+    "bigserial": "longValue",
+    "float4": "doubleValue",
+    "float8": "doubleValue",
+    "bytea": "blobValue",
+}
+
+
+def decode_json_column(col_name, values):
+    """
+    Decode the JSONB strings of one column with a single json.loads call
+
+    :param col_name: Column name
+    :param values: The column's raw strings, None for NULL
+    :return: The decoded values
+    """
+    present_values = [value for value in values if value is not None]
+    try:
+        decoded_values = json.loads("[" + ",".join(present_values) + "]")
+    except json.JSONDecodeError:
+        decoded_values = None
+    if decoded_values is None or len(decoded_values) != len(present_values):
+        # Decode cell by cell, parse_field keeps strings that are not JSON
+        return [
+            None if value is None else parse_field(col_name, {"stringValue": value})
+            for value in values
+        ]
+
+    decoded_iter = iter(decoded_values)
+    return [None if value is None else next(decoded_iter) for value in values]
+
+
+def decode_records(column_metadata, records):
+    """
+    Decode a Data API result set column by column. The decoder of each column
+    is picked once from columnMetadata instead of inspecting every cell, and
+    JSONB columns are decoded in bulk.
+
+    :param column_metadata: columnMetadata of the Data API response
+    :param records: records of the Data API response
+    :return: List of rows as dicts
+    """
+    if not records:
+        return []
+
+    columns = []
+    decoded_columns = []
+    for index, col in enumerate(column_metadata):
+        col_name = col["name"]
+        columns.append(col_name)
+        value_key = DATA_API_VALUE_KEYS.get(col.get("typeName"), "stringValue")
+        first_value = next(
+            (record[index] for record in records if not record[index].get("isNull")),
+            None,
+        )
+        if first_value is not None and value_key not in first_value:
+            # Arrays and unexpected value types keep the generic parse_field
+            decoded_columns.append(
+                [parse_field(col_name, record[index]) for record in records]
+            )
+            continue
+
+        # NULL cells only carry isNull, so they decode to None
+        values = [record[index].get(value_key) for record in records]
+        if value_key == "stringValue" and col_name in JSONB_COLUMNS:
+            values = decode_json_column(col_name, values)
+        decoded_columns.append(values)
+
+    return [
+        dict(zip(columns, row, strict=True))
+        for row in zip(*decoded_columns, strict=True)
+    ]
+
+
 # Custom JSON encoder to handle Decimal types
 class DecimalEncoder(json.JSONEncoder):
     """Custom JSON encoder for Decimal objects."""
@@ -112,6 +201,8 @@ class RunRepository:
         self._database_name = DATABASE_NAME
         self._resource_arn = RDS_CLUSTER_ARN
         self._secret_arn = RDS_CLUSTER_MASTER_USER_SECRET_ARN
+        # Pooled PostgreSQL connection when DATABASE_BACKEND=postgres
+        self._postgres_client = get_postgres_client()
 
     def get_run_by_id(self, run_id: str) -> dict | None:
         """
@@ -168,8 +259,11 @@ class RunRepository:
             placeholders = ", ".join(f":{k}" for k in columns)
 
             # For UPDATE part, exclude run_id as primary key
-            update_cols = [k for k in columns if k != "run_id"]
-            update_str = ", ".join(f"{k} = EXCLUDED.{k}" for k in update_cols)
+            update_cols = [k for k in columns if k not in ("run_id", "updated_at")]
+            update_str = ", ".join(
+                [f"{k} = EXCLUDED.{k}" for k in update_cols]
+                + ["updated_at = CURRENT_TIMESTAMP"]
+            )
 
             sql = f"""
                 INSERT INTO runs ({columns_str})
@@ -208,18 +302,22 @@ class RunRepository:
 
     def increment_success_email_count(self, run_id: str) -> None:
         """
-        Increment the success_email_count for a run in the PostgreSQL database.
+        Increment the success_email_count of a run on this container's counter shard.
 
         :param run_id: The run ID to update
         """
         try:
             sql = """
-                UPDATE runs
-                SET success_email_count = success_email_count + 1
-                WHERE run_id = :run_id
+                INSERT INTO run_counter_shards (run_id, shard, success_email_count)
+                VALUES (:run_id, :shard, 1)
+                ON CONFLICT (run_id, shard)
+                DO UPDATE SET
+                    success_email_count = run_counter_shards.success_email_count + 1,
+                    updated_at = CURRENT_TIMESTAMP
             """
             params = [
                 {"name": "run_id", "value": {"stringValue": run_id}},
+                {"name": "shard", "value": {"longValue": RUN_COUNTER_SHARD}},
             ]
 
             self._execute(sql, params)
@@ -231,18 +329,22 @@ class RunRepository:
 
     def increment_failed_email_count(self, run_id: str) -> None:
         """
-        Increment the failed_email_count for a run in the PostgreSQL database.
+        Increment the failed_email_count of a run on this container's counter shard.
 
         :param run_id: The run ID to update
         """
         try:
             sql = """
-                UPDATE runs
-                SET failed_email_count = failed_email_count + 1
-                WHERE run_id = :run_id
+                INSERT INTO run_counter_shards (run_id, shard, failed_email_count)
+                VALUES (:run_id, :shard, 1)
+                ON CONFLICT (run_id, shard)
+                DO UPDATE SET
+                    failed_email_count = run_counter_shards.failed_email_count + 1,
+                    updated_at = CURRENT_TIMESTAMP
             """
             params = [
                 {"name": "run_id", "value": {"stringValue": run_id}},
+                {"name": "shard", "value": {"longValue": RUN_COUNTER_SHARD}},
             ]
 
             self._execute(sql, params)
@@ -489,6 +591,9 @@ class RunRepository:
             if os.getenv("DEBUG_SQL", "false").lower() == "true":
                 logger.debug("Executing SQL:\n%s\nParams:\n%s", sql, parameters)
 
+            if self._postgres_client:
+                return self._postgres_client.execute(sql, parameters, fetch)
+
             response = self._rds_data.execute_statement(
                 resourceArn=self._resource_arn,
                 secretArn=self._secret_arn,
@@ -503,14 +608,7 @@ class RunRepository:
             if not fetch:
                 return None
 
-            columns = [col["name"] for col in response["columnMetadata"]]
-            return [
-                {
-                    col: parse_field(col, val)
-                    for col, val in zip(columns, row, strict=False)
-                }
-                for row in response["records"]
-            ]
+            return decode_records(response["columnMetadata"], response["records"])
         except Exception as e:
             logger.error(
                 "SQL execution failed: %s\nSQL: %s\nParams: %s", e, sql, parameters
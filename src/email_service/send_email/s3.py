@@ -1,4 +1,5 @@
 import io
+import json
 import logging
 import os
 
@@ -23,6 +24,20 @@ def read_html_template_file_from_s3(bucket, template_file_s3_key):
         raise
 
 
+def read_template_artifact_from_s3(bucket, template_artifact_s3_key):
+    try:
+        s3 = boto3.client("s3")
+        request = s3.get_object(Bucket=bucket, Key=template_artifact_s3_key)
+        compiled_template = json.loads(request["Body"].read().decode("utf-8"))
+        logger.info(
+            "Fetched compiled template from S3 key: %s", template_artifact_s3_key
+        )
+        return compiled_template
+    except Exception as e:
+        logger.error("Error in read_template_artifact_from_s3: %s", e)
+        raise
+
+
 def read_sheet_data_from_s3(spreadsheet_file_s3_key):
     try:
         s3 = boto3.client("s3")
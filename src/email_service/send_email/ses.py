@@ -9,7 +9,7 @@ import time_util
 from botocore.exceptions import ClientError
 from certificate_generator import generate_certificate
 from email_util import attach_files_to_message, create_email_message
-from template_util import replace_placeholders
+from template_util import render_template
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
@@ -27,7 +27,7 @@ def send_email_with_backoff_delay(delay_factor=1):
 
 def send_email(
     subject: str,
-    template_content: str,
+    compiled_template: dict[str, any],
     row: dict[str, any],
     display_name: str,
     reply_to: str,
@@ -40,7 +40,6 @@ def send_email(
 ) -> tuple:
     try:
         logger.info("Row data before formatting: %s", row)
-        template_content = template_content.replace("\r", "")
 
         recipient_email = row.get("Email")
         if not recipient_email:
@@ -49,7 +48,7 @@ def send_email(
 
         formatted_row = {k: str(v) for k, v in row.items()}
         logger.info("Formatted row: %s", formatted_row)
-        formatted_content = replace_placeholders(template_content, formatted_row)
+        formatted_content = render_template(compiled_template, formatted_row)
 
         msg = create_email_message(
             subject,
@@ -1,5 +1,47 @@
 import re
 
+# Matches {{variable}}, the variable name is stripped of surrounding whitespace
+PLACEHOLDER_PATTERN = re.compile(r"\{\{(.*?)\}\}")
+
+
+def compile_template(template):
+    """
+    Compile a template into the segment form the file service stores when the
+    template is uploaded, for templates uploaded before that.
+
+    :param template: The template string with placeholders.
+    :return: The compiled template, with its variables and segments.
+    """
+    segments = []
+    variables = set()
+    position = 0
+    for match in PLACEHOLDER_PATTERN.finditer(template):
+        if match.start() > position:
+            segments.append(template[position : match.start()])
+        variable = match.group(1).strip()
+        variables.add(variable)
+        segments.append({"variable": variable, "placeholder": match.group(0)})
+        position = match.end()
+    if position < len(template):
+        segments.append(template[position:])
+    return {"variables": sorted(variables), "segments": segments}
+
+
+def render_template(compiled_template, values):
+    """
+    Render a compiled template with actual values.
+
+    :param compiled_template: The compiled template.
+    :param values: A dictionary of values to replace the placeholders.
+    :return: The rendered string, placeholders without a value are kept as is.
+    """
+    return "".join(
+        segment
+        if isinstance(segment, str)
+        else values.get(segment["variable"], segment["placeholder"])
+        for segment in compiled_template["segments"]
+    )
+
 
 def replace_placeholders(template, values):
     """
@@ -9,11 +51,4 @@ def replace_placeholders(template, values):
     :param values: A dictionary of values to replace the placeholders.
     :return: The template string with placeholders replaced by actual values.
     """
-
-    def replacement(match):
-        variable_name = match.group(1)
-        return values.get(variable_name, match.group(0))
-
-    # Using Regular Expressions to Match and Replace {{variable}}
-    pattern = r"\{\{(.*?)\}\}"
-    return re.sub(pattern, replacement, template)
+    return render_template(compile_template(template), values)
@@ -145,6 +145,22 @@ module "api_gateway" {
       }
     }
 
+    "GET /runs/{run_id}/stats" = {
+      detailed_metrics_enabled = true
+      throttling_rate_limit    = 80
+      throttling_burst_limit   = 40
+
+      authorization_type = "CUSTOM"
+      authorizer_key     = "lambda_authorizer"
+
+      integration = {
+        uri                    = module.get_run_stats_lambda.lambda_function_arn # Remember to change
+        type                   = "AWS_PROXY"
+        payload_format_version = "1.0"
+        timeout_milliseconds   = 29000
+      }
+    }
+
     "GET /runs/{run_id}/emails" = {
       detailed_metrics_enabled = true
       throttling_rate_limit    = 80
@@ -160,6 +176,38 @@ module "api_gateway" {
         timeout_milliseconds   = 29000
       }
     }
+
+    "POST /runs/{run_id}/emails/export" = {
+      detailed_metrics_enabled = true
+      throttling_rate_limit    = 80
+      throttling_burst_limit   = 40
+
+      authorization_type = "CUSTOM"
+      authorizer_key     = "lambda_authorizer"
+
+      integration = {
+        uri                    = module.export_emails_lambda.lambda_function_arn
+        type                   = "AWS_PROXY"
+        payload_format_version = "1.0"
+        timeout_milliseconds   = 29000
+      }
+    }
+
+    "GET /runs/{run_id}/emails/export/{job_id}" = {
+      detailed_metrics_enabled = true
+      throttling_rate_limit    = 80
+      throttling_burst_limit   = 40
+
+      authorization_type = "CUSTOM"
+      authorizer_key     = "lambda_authorizer"
+
+      integration = {
+        uri                    = module.get_export_job_lambda.lambda_function_arn
+        type                   = "AWS_PROXY"
+        payload_format_version = "1.0"
+        timeout_milliseconds   = 29000
+      }
+    }
   }
 
   # Stage
@@ -0,0 +1,29 @@
+# Create EventBridge scheduler group
+resource "aws_scheduler_schedule_group" "service_group" {
+  name = "${var.environment}-${var.service_underscore}-schedule_group"
+
+  tags = {
+    Service = var.service_underscore
+  }
+}
+
+# Create EventBridge scheduler
+resource "aws_scheduler_schedule" "archive_emails" {
+  name        = "${var.environment}-${var.service_underscore}-archive_emails"
+  group_name  = aws_scheduler_schedule_group.service_group.name
+  description = "Schedule to create upcoming email partitions and archive expired ones every day"
+
+  flexible_time_window {
+    mode = "OFF" # Run exactly at scheduled time
+  }
+
+  schedule_expression = "rate(1 day)"
+
+  target {
+    arn      = module.archive_emails_lambda.lambda_function_arn
+    role_arn = aws_iam_role.archive_emails_scheduler_role.arn
+    retry_policy {
+      maximum_retry_attempts = 0 # The next daily run picks up where this one failed
+    }
+  }
+}
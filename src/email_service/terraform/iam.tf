@@ -0,0 +1,55 @@
+# Create IAM role specifically for archiving emails
+resource "aws_iam_role" "archive_emails_scheduler_role" {
+  name = "${var.environment}-${var.service_underscore}-archive_emails-sche-${random_string.this.result}" # 64 characters max
+
+  description = "Role for EventBridge scheduler to trigger archive emails lambda"
+
+  assume_role_policy = jsonencode({
+    Version = "2012-10-17"
+    Statement = [
+      {
+        Effect = "Allow"
+        Principal = {
+          Service = "scheduler.amazonaws.com"
+        }
+        Action = "sts:AssumeRole"
+        Condition = {
+          StringEquals = {
+            "aws:SourceAccount" : data.aws_caller_identity.this.account_id
+          }
+        }
+      }
+    ]
+  })
+
+  tags = {
+    Service = var.service_underscore
+  }
+}
+
+# Create specific IAM policy for invoking the archive emails lambda
+resource "aws_iam_role_policy" "archive_emails_scheduler_policy" {
+  name = "${var.environment}-${var.service_underscore}-invoke_archive_emails_lambda-${random_string.this.result}"
+  role = aws_iam_role.archive_emails_scheduler_role.id
+
+  policy = jsonencode({
+    Version = "2012-10-17"
+    Statement = [
+      {
+        Effect = "Allow"
+        Action = [
+          "lambda:InvokeFunction"
+        ]
+        Resource = [
+          module.archive_emails_lambda.lambda_function_arn
+        ]
+        Condition = {
+          StringEquals = {
+            "aws:ResourceTag/Environment" : var.environment,
+            "aws:ResourceTag/Service" : var.service_underscore
+          }
+        }
+      }
+    ]
+  })
+}
@@ -2,8 +2,8 @@
 set -e
 
 # Validate input parameters
-if [ "$#" -ne 4 ]; then
-  echo "Usage: $0 <RESOURCE_ARN> <SECRET_ARN> <DATABASE> <AWS_REGION>"
+if [ "$#" -ne 4 ] && [ "$#" -ne 5 ]; then
+  echo "Usage: $0 <RESOURCE_ARN> <SECRET_ARN> <DATABASE> <AWS_REGION> [SQL_FILE]"
   exit 1
 fi
 
@@ -11,7 +11,7 @@ RESOURCE_ARN="$1"
 SECRET_ARN="$2"
 DATABASE="$3"
 AWS_REGION="$4"
-SQL_FILE="init-schema.sql"
+SQL_FILE="${5:-init-schema.sql}" # e.g. a file under migrations/
 
 # 1) Convert Windows CRLF (if any) to LF.
 #    On macOS/BSD, we need the '' after -i. On Linux, -i '' *may* fail,
@@ -25,18 +25,53 @@ sql=$(tr '\n' ' ' < "$SQL_FILE")
 IFS=';' read -ra statements <<< "$sql"
 
 echo "Found ${#statements[@]} statements in $SQL_FILE"
+
+# BEGIN and COMMIT statements run the statements between them in one Data API
+# transaction, which is rolled back if any of them fails.
+transaction_id=""
+rollback_transaction() {
+  if [[ -n "$transaction_id" ]]; then
+    echo "Rolling back transaction $transaction_id"
+    aws rds-data rollback-transaction \
+      --region "$AWS_REGION" \
+      --resource-arn "$RESOURCE_ARN" \
+      --secret-arn "$SECRET_ARN" \
+      --transaction-id "$transaction_id"
+  fi
+}
+trap rollback_transaction ERR
+
 for stmt in "${statements[@]}"; do
   # Trim leading/trailing whitespace.
   stmt=$(echo "$stmt" | sed 's/^[ \t]*//;s/[ \t]*$//')
+  # The statement without its block comments, to recognize BEGIN and COMMIT
+  keyword=$(echo "$stmt" | sed 's:/\*[^*]*\*/::g;s/^[ \t]*//;s/[ \t]*$//')
 
+  if [[ "${keyword^^}" == "BEGIN" ]]; then
+    transaction_id=$(aws rds-data begin-transaction \
+      --region "$AWS_REGION" \
+      --resource-arn "$RESOURCE_ARN" \
+      --secret-arn "$SECRET_ARN" \
+      --database "$DATABASE" \
+      --query transactionId --output text)
+    echo "Began transaction $transaction_id"
+  elif [[ "${keyword^^}" == "COMMIT" ]]; then
+    aws rds-data commit-transaction \
+      --region "$AWS_REGION" \
+      --resource-arn "$RESOURCE_ARN" \
+      --secret-arn "$SECRET_ARN" \
+      --transaction-id "$transaction_id"
+    echo "Committed transaction $transaction_id"
+    transaction_id=""
   # Only execute non-empty statements.
-  if [[ -n "$stmt" ]]; then
+  elif [[ -n "$stmt" ]]; then
     echo "Executing: [$stmt]"
     aws rds-data execute-statement \
       --region "$AWS_REGION" \
       --resource-arn "$RESOURCE_ARN" \
       --secret-arn "$SECRET_ARN" \
       --database "$DATABASE" \
+      ${transaction_id:+--transaction-id "$transaction_id"} \
       --sql "$stmt"
   fi
 done
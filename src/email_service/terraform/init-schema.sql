@@ -1,3 +1,12 @@
+-- Schema of a new deployment. Deployments created before partitioning are
+-- upgraded by applying the migrations, in this order, with init-schema.sh:
+--   1. migrations/run-counters-normalized-emails.sql
+--   2. migrations/partition-emails.sql
+--   3. migrations/composite-list-indexes.sql
+--   4. migrations/email-archive-ranges.sql
+-- Re-running this file on such a deployment before step 2 aborts at
+-- EMAILS_DEFAULT, since EMAILS is not partitioned yet; afterwards it is a no-op.
+
 -- Create RUNS table
 CREATE TABLE IF NOT EXISTS RUNS (
     run_id VARCHAR(255) PRIMARY KEY,
@@ -25,16 +34,24 @@ CREATE TABLE IF NOT EXISTS RUNS (
     success_email_count INTEGER NOT NULL DEFAULT 0,
     failed_email_count INTEGER NOT NULL DEFAULT 0,
     template_file JSONB NOT NULL,
-    template_file_id VARCHAR(255) NOT NULL
+    template_file_id VARCHAR(255) NOT NULL,
+    updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP
 );
 
--- Create EMAILS table with foreign key reference to RUNS
+-- Add updated_at to RUNS tables created before the column existed
+ALTER TABLE RUNS ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP;
+
+-- Create EMAILS table with foreign key reference to RUNS, partitioned by month
+-- of created_at. The monthly partitions are created ahead of time by the
+-- archive_emails Lambda, which also archives and detaches the old ones.
+-- Deployments created before partitioning are converted by
+-- migrations/partition-emails.sql, see the upgrade order above
 CREATE TABLE IF NOT EXISTS EMAILS (
-    email_id VARCHAR(255) PRIMARY KEY,
+    email_id VARCHAR(255) NOT NULL,
     run_id VARCHAR(255) NOT NULL,
-    attachment_file_ids JSONB NOT NULL DEFAULT '[]',
-    bcc JSONB NOT NULL DEFAULT '[]',
-    cc JSONB NOT NULL DEFAULT '[]',
+    attachment_file_ids JSONB,
+    bcc JSONB,
+    cc JSONB,
     created_at TIMESTAMP WITH TIME ZONE NOT NULL,
     display_name VARCHAR(255),
     is_generate_certificate BOOLEAN NOT NULL DEFAULT FALSE,
@@ -47,15 +64,16 @@ CREATE TABLE IF NOT EXISTS EMAILS (
     sent_at TIMESTAMP WITH TIME ZONE,
     spreadsheet_file_id VARCHAR(255),
     status VARCHAR(50) NOT NULL DEFAULT 'PENDING',
-    subject VARCHAR(255) NOT NULL,
-    template_file_id VARCHAR(255) NOT NULL,
+    subject VARCHAR(255),
+    template_file_id VARCHAR(255),
     updated_at TIMESTAMP WITH TIME ZONE NOT NULL,
 
+    PRIMARY KEY (email_id, created_at),
     CONSTRAINT fk_run FOREIGN KEY (run_id) REFERENCES RUNS(run_id) ON DELETE CASCADE
-);
+) PARTITION BY RANGE (created_at);
 
--- Create index on run_id in EMAILS table for faster joins
-CREATE INDEX IF NOT EXISTS idx_emails_run_id ON EMAILS(run_id);
+-- Catch rows of months whose partition does not exist yet
+CREATE TABLE IF NOT EXISTS EMAILS_DEFAULT PARTITION OF EMAILS DEFAULT;
 
 -- Create index on status in EMAILS table for faster filtering
 CREATE INDEX IF NOT EXISTS idx_emails_status ON EMAILS(status);
@@ -63,17 +81,133 @@ CREATE INDEX IF NOT EXISTS idx_emails_status ON EMAILS(status);
 -- Create index on created_at in EMAILS table for faster sorting
 CREATE INDEX IF NOT EXISTS idx_emails_created_at ON EMAILS(created_at);
 
--- Create index on created_at in RUNS table for faster sorting
-CREATE INDEX IF NOT EXISTS idx_runs_created_at ON RUNS(created_at);
+-- Create combined index on created_at and run_id for keyset (cursor) pagination of runs
+CREATE INDEX IF NOT EXISTS idx_runs_created_at_run_id ON RUNS(created_at, run_id);
+
+-- The list indexes below end with the list ordering (created_at, then the
+-- primary key), so every filter accepted by list_emails and list_runs is read
+-- in order from an index instead of being sorted. The sort_by whitelists of
+-- the repositories only allow orderings served by these indexes.
+
+-- Create combined index on run_id, created_at and email_id for listing (and keyset pagination of) a run's emails
+CREATE INDEX IF NOT EXISTS idx_emails_run_id_created_at_email_id ON EMAILS(run_id, created_at, email_id);
 
--- Create index on sender_id in RUNS table for faster filtering
-CREATE INDEX IF NOT EXISTS idx_runs_sender_id ON RUNS(sender_id);
+-- Create combined index on run_id, status, created_at and email_id for listing a run's emails by status
+CREATE INDEX IF NOT EXISTS idx_emails_run_id_status_created_at_email_id ON EMAILS(run_id, status, created_at, email_id);
 
--- Create index on created_year in RUNS table for faster filtering
-CREATE INDEX IF NOT EXISTS idx_runs_created_year ON RUNS(created_year);
+-- Create combined index on sender_id, created_at and run_id for listing a sender's runs
+CREATE INDEX IF NOT EXISTS idx_runs_sender_id_created_at_run_id ON RUNS(sender_id, created_at, run_id);
 
--- Create combined index on sender_id and created_year for common query pattern
-CREATE INDEX IF NOT EXISTS idx_runs_sender_id_created_year ON RUNS(sender_id, created_year);
+-- Create combined index on sender_id, created_year, created_at and run_id for listing a sender's runs of a year
+CREATE INDEX IF NOT EXISTS idx_runs_sender_id_created_year_created_at_run_id ON RUNS(sender_id, created_year, created_at, run_id);
 
--- Create combined index on run_id and status for email status queries
-CREATE INDEX IF NOT EXISTS idx_emails_run_id_status ON EMAILS(run_id, status);
+-- Create combined index on created_year, created_at and run_id for listing the runs of a year
+CREATE INDEX IF NOT EXISTS idx_runs_created_year_created_at_run_id ON RUNS(created_year, created_at, run_id);
+
+-- Create combined index on run_type, created_at and run_id for listing the runs of a type
+CREATE INDEX IF NOT EXISTS idx_runs_run_type_created_at_run_id ON RUNS(run_type, created_at, run_id);
+
+-- Create RUN_COUNTER_SHARDS table: each send_email container increments its own
+-- (run_id, shard) row instead of contending for the row lock of the run
+CREATE TABLE IF NOT EXISTS RUN_COUNTER_SHARDS (
+    run_id VARCHAR(255) NOT NULL,
+    shard INTEGER NOT NULL,
+    success_email_count INTEGER NOT NULL DEFAULT 0,
+    failed_email_count INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
+
+    PRIMARY KEY (run_id, shard),
+    CONSTRAINT fk_run FOREIGN KEY (run_id) REFERENCES RUNS(run_id) ON DELETE CASCADE
+);
+
+-- Create RUNS_WITH_COUNTERS view: RUNS with the counter shards summed into
+-- success_email_count and failed_email_count, read by get_run and list_runs
+CREATE OR REPLACE VIEW RUNS_WITH_COUNTERS AS
+SELECT
+    runs.run_id,
+    runs.run_type,
+    runs.attachment_file_ids,
+    runs.attachment_files,
+    runs.bcc,
+    runs.cc,
+    runs.created_at,
+    runs.created_year,
+    runs.created_year_month,
+    runs.created_year_month_day,
+    runs.display_name,
+    runs.expected_email_send_count,
+    runs.is_generate_certificate,
+    runs.recipients,
+    runs.recipient_source,
+    runs.reply_to,
+    runs.sender,
+    runs.sender_id,
+    runs.sender_local_part,
+    runs.spreadsheet_file,
+    runs.spreadsheet_file_id,
+    runs.subject,
+    (runs.success_email_count + shards.success_email_count)::INTEGER AS success_email_count,
+    (runs.failed_email_count + shards.failed_email_count)::INTEGER AS failed_email_count,
+    runs.template_file,
+    runs.template_file_id,
+    GREATEST(runs.updated_at, shards.updated_at) AS updated_at
+FROM RUNS AS runs
+CROSS JOIN LATERAL (
+    SELECT
+        COALESCE(SUM(RUN_COUNTER_SHARDS.success_email_count), 0) AS success_email_count,
+        COALESCE(SUM(RUN_COUNTER_SHARDS.failed_email_count), 0) AS failed_email_count,
+        MAX(RUN_COUNTER_SHARDS.updated_at) AS updated_at
+    FROM RUN_COUNTER_SHARDS
+    WHERE RUN_COUNTER_SHARDS.run_id = runs.run_id
+) AS shards;
+
+-- Allow normalized EMAILS rows that leave the run-level columns NULL on tables
+-- created before the columns became nullable
+ALTER TABLE EMAILS ALTER COLUMN attachment_file_ids DROP NOT NULL, ALTER COLUMN attachment_file_ids DROP DEFAULT, ALTER COLUMN bcc DROP NOT NULL, ALTER COLUMN bcc DROP DEFAULT, ALTER COLUMN cc DROP NOT NULL, ALTER COLUMN cc DROP DEFAULT, ALTER COLUMN subject DROP NOT NULL, ALTER COLUMN template_file_id DROP NOT NULL;
+
+-- Create EMAILS_WITH_RUN view: EMAILS with the run-level columns of normalized
+-- rows (NULL in EMAILS) read from RUNS, read by list_emails and export_emails
+CREATE OR REPLACE VIEW EMAILS_WITH_RUN AS
+SELECT
+    emails.email_id,
+    emails.run_id,
+    COALESCE(emails.attachment_file_ids, runs.attachment_file_ids) AS attachment_file_ids,
+    COALESCE(emails.bcc, runs.bcc) AS bcc,
+    COALESCE(emails.cc, runs.cc) AS cc,
+    emails.created_at,
+    COALESCE(emails.display_name, runs.display_name) AS display_name,
+    emails.is_generate_certificate,
+    emails.recipient_email,
+    COALESCE(emails.reply_to, runs.reply_to) AS reply_to,
+    emails.row_data,
+    COALESCE(emails.sender_id, runs.sender_id) AS sender_id,
+    COALESCE(emails.sender_local_part, runs.sender_local_part) AS sender_local_part,
+    COALESCE(emails.sender_username, runs.sender ->> 'username') AS sender_username,
+    emails.sent_at,
+    COALESCE(emails.spreadsheet_file_id, runs.spreadsheet_file_id) AS spreadsheet_file_id,
+    emails.status,
+    COALESCE(emails.subject, runs.subject) AS subject,
+    COALESCE(emails.template_file_id, runs.template_file_id) AS template_file_id,
+    emails.updated_at
+FROM EMAILS AS emails
+JOIN RUNS AS runs ON runs.run_id = emails.run_id;
+
+-- Create EMAIL_ARCHIVES table: one row per run and archived EMAILS partition,
+-- pointing at the gzipped NDJSON object holding the run's rows of that month.
+-- archived_at is set once the partition is detached, only then the object
+-- replaces the rows in reads. first_created_at and last_created_at bound the
+-- archived rows, so a page only reads the archives it reaches.
+CREATE TABLE IF NOT EXISTS EMAIL_ARCHIVES (
+    run_id VARCHAR(255) NOT NULL,
+    partition_name VARCHAR(255) NOT NULL,
+    s3_object_key VARCHAR(1024) NOT NULL,
+    email_count INTEGER NOT NULL DEFAULT 0,
+    status_counts JSONB NOT NULL DEFAULT '{}',
+    first_created_at TIMESTAMP WITH TIME ZONE,
+    last_created_at TIMESTAMP WITH TIME ZONE,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    archived_at TIMESTAMP WITH TIME ZONE,
+
+    PRIMARY KEY (run_id, partition_name),
+    CONSTRAINT fk_run FOREIGN KEY (run_id) REFERENCES RUNS(run_id) ON DELETE CASCADE
+);
@@ -0,0 +1,32 @@
+/*
+  Replace the single-column list indexes with the composite indexes of
+  init-schema.sql, which end with the list ordering (created_at, then the
+  primary key) so list_emails and list_runs never sort a filtered result.
+
+  Third step of the upgrade of an existing deployment, after
+  migrations/partition-emails.sql, see init-schema.sql. Apply with:
+  ./init-schema.sh <RESOURCE_ARN> <SECRET_ARN> <DATABASE> <AWS_REGION> migrations/composite-list-indexes.sql
+
+  RUNS is indexed CONCURRENTLY so runs keep being written meanwhile. PostgreSQL
+  cannot build indexes concurrently on a partitioned table, EMAILS partitions
+  are locked against writes while their index is built.
+*/
+
+CREATE INDEX IF NOT EXISTS idx_emails_run_id_created_at_email_id ON EMAILS(run_id, created_at, email_id);
+CREATE INDEX IF NOT EXISTS idx_emails_run_id_status_created_at_email_id ON EMAILS(run_id, status, created_at, email_id);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_runs_created_at_run_id ON RUNS(created_at, run_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_runs_sender_id_created_at_run_id ON RUNS(sender_id, created_at, run_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_runs_sender_id_created_year_created_at_run_id ON RUNS(sender_id, created_year, created_at, run_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_runs_created_year_created_at_run_id ON RUNS(created_year, created_at, run_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_runs_run_type_created_at_run_id ON RUNS(run_type, created_at, run_id);
+
+/* Superseded: each is a prefix of one of the indexes above */
+DROP INDEX IF EXISTS idx_emails_run_id;
+DROP INDEX IF EXISTS idx_emails_run_id_status;
+DROP INDEX IF EXISTS idx_emails_legacy_run_id;
+DROP INDEX IF EXISTS idx_emails_legacy_run_id_status;
+DROP INDEX CONCURRENTLY IF EXISTS idx_runs_created_at;
+DROP INDEX CONCURRENTLY IF EXISTS idx_runs_sender_id;
+DROP INDEX CONCURRENTLY IF EXISTS idx_runs_created_year;
+DROP INDEX CONCURRENTLY IF EXISTS idx_runs_sender_id_created_year;
@@ -0,0 +1,13 @@
+/*
+  Record the created_at range of each archive, list_emails uses it to read
+  only the archives a page reaches. Archives written before this migration
+  have no range and are always read.
+
+  Last step of the upgrade of an existing deployment, only needed where
+  EMAIL_ARCHIVES was created without the range columns, see init-schema.sql.
+  Apply with:
+  ./init-schema.sh <RESOURCE_ARN> <SECRET_ARN> <DATABASE> <AWS_REGION> migrations/email-archive-ranges.sql
+*/
+
+ALTER TABLE EMAIL_ARCHIVES ADD COLUMN IF NOT EXISTS first_created_at TIMESTAMP WITH TIME ZONE;
+ALTER TABLE EMAIL_ARCHIVES ADD COLUMN IF NOT EXISTS last_created_at TIMESTAMP WITH TIME ZONE;
@@ -0,0 +1,94 @@
+/*
+  Convert a non-partitioned EMAILS table into the monthly partitioned layout of
+  init-schema.sql. The existing table is kept as the EMAILS_LEGACY partition
+  holding every row created before the cutover, so no rows are copied.
+
+  Replace 2026-11-01 below with the first day of the month following the
+  migration. The archive_emails Lambda creates the monthly partitions from the
+  cutover on, and archives EMAILS_LEGACY like any other partition once the
+  cutover is older than the retention window.
+
+  Second step of the upgrade of an existing deployment, after
+  migrations/run-counters-normalized-emails.sql, see init-schema.sql.
+  Run with: ./init-schema.sh <RESOURCE_ARN> <SECRET_ARN> <DATABASE> <AWS_REGION> migrations/partition-emails.sql
+  The statements use block comments only, init-schema.sh flattens newlines.
+  They run in one transaction, a failure leaves EMAILS untouched.
+*/
+
+BEGIN;
+
+DROP VIEW IF EXISTS EMAILS_WITH_RUN;
+
+ALTER TABLE EMAILS RENAME TO EMAILS_LEGACY;
+/* A partition needs the primary key of the parent, which includes created_at */
+ALTER TABLE EMAILS_LEGACY DROP CONSTRAINT emails_pkey;
+ALTER TABLE EMAILS_LEGACY ADD CONSTRAINT emails_legacy_pkey PRIMARY KEY (email_id, created_at);
+/* Only the baseline indexes are certain to exist, the composite ones depend on earlier runs of init-schema.sql */
+ALTER INDEX IF EXISTS idx_emails_run_id RENAME TO idx_emails_legacy_run_id;
+ALTER INDEX IF EXISTS idx_emails_status RENAME TO idx_emails_legacy_status;
+ALTER INDEX IF EXISTS idx_emails_created_at RENAME TO idx_emails_legacy_created_at;
+ALTER INDEX IF EXISTS idx_emails_run_id_status RENAME TO idx_emails_legacy_run_id_status;
+ALTER INDEX IF EXISTS idx_emails_run_id_created_at_email_id RENAME TO idx_emails_legacy_run_id_created_at_email_id;
+ALTER INDEX IF EXISTS idx_emails_run_id_status_created_at_email_id RENAME TO idx_emails_legacy_run_id_status_created_at_email_id;
+
+CREATE TABLE EMAILS (
+    LIKE EMAILS_LEGACY INCLUDING DEFAULTS,
+
+    PRIMARY KEY (email_id, created_at),
+    CONSTRAINT fk_run FOREIGN KEY (run_id) REFERENCES RUNS(run_id) ON DELETE CASCADE
+) PARTITION BY RANGE (created_at);
+
+/* Validates the cutover with one scan of EMAILS_LEGACY */
+ALTER TABLE EMAILS ATTACH PARTITION EMAILS_LEGACY FOR VALUES FROM (MINVALUE) TO ('2026-11-01 00:00:00+00');
+
+CREATE TABLE IF NOT EXISTS EMAILS_DEFAULT PARTITION OF EMAILS DEFAULT;
+
+/* Matching indexes that already exist on EMAILS_LEGACY are attached, not rebuilt */
+CREATE INDEX IF NOT EXISTS idx_emails_run_id ON EMAILS(run_id);
+CREATE INDEX IF NOT EXISTS idx_emails_status ON EMAILS(status);
+CREATE INDEX IF NOT EXISTS idx_emails_created_at ON EMAILS(created_at);
+CREATE INDEX IF NOT EXISTS idx_emails_run_id_status ON EMAILS(run_id, status);
+CREATE INDEX IF NOT EXISTS idx_emails_run_id_created_at_email_id ON EMAILS(run_id, created_at, email_id);
+
+/* Recreate EMAILS_WITH_RUN on the partitioned table and add EMAIL_ARCHIVES */
+CREATE OR REPLACE VIEW EMAILS_WITH_RUN AS
+SELECT
+    emails.email_id,
+    emails.run_id,
+    COALESCE(emails.attachment_file_ids, runs.attachment_file_ids) AS attachment_file_ids,
+    COALESCE(emails.bcc, runs.bcc) AS bcc,
+    COALESCE(emails.cc, runs.cc) AS cc,
+    emails.created_at,
+    COALESCE(emails.display_name, runs.display_name) AS display_name,
+    emails.is_generate_certificate,
+    emails.recipient_email,
+    COALESCE(emails.reply_to, runs.reply_to) AS reply_to,
+    emails.row_data,
+    COALESCE(emails.sender_id, runs.sender_id) AS sender_id,
+    COALESCE(emails.sender_local_part, runs.sender_local_part) AS sender_local_part,
+    COALESCE(emails.sender_username, runs.sender ->> 'username') AS sender_username,
+    emails.sent_at,
+    COALESCE(emails.spreadsheet_file_id, runs.spreadsheet_file_id) AS spreadsheet_file_id,
+    emails.status,
+    COALESCE(emails.subject, runs.subject) AS subject,
+    COALESCE(emails.template_file_id, runs.template_file_id) AS template_file_id,
+    emails.updated_at
+FROM EMAILS AS emails
+JOIN RUNS AS runs ON runs.run_id = emails.run_id;
+
+CREATE TABLE IF NOT EXISTS EMAIL_ARCHIVES (
+    run_id VARCHAR(255) NOT NULL,
+    partition_name VARCHAR(255) NOT NULL,
+    s3_object_key VARCHAR(1024) NOT NULL,
+    email_count INTEGER NOT NULL DEFAULT 0,
+    status_counts JSONB NOT NULL DEFAULT '{}',
+    first_created_at TIMESTAMP WITH TIME ZONE,
+    last_created_at TIMESTAMP WITH TIME ZONE,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    archived_at TIMESTAMP WITH TIME ZONE,
+
+    PRIMARY KEY (run_id, partition_name),
+    CONSTRAINT fk_run FOREIGN KEY (run_id) REFERENCES RUNS(run_id) ON DELETE CASCADE
+);
+
+COMMIT;
@@ -0,0 +1,94 @@
+/*
+  Add the run counter shards and the normalized EMAILS storage of init-schema.sql
+  to a deployment created before them: RUNS.updated_at, RUN_COUNTER_SHARDS and
+  RUNS_WITH_COUNTERS, the nullable run-level EMAILS columns and EMAILS_WITH_RUN.
+  send_email, get_run, list_runs and get_run_stats read these objects.
+
+  First step of the upgrade of an existing deployment, see init-schema.sql.
+  Run with: ./init-schema.sh <RESOURCE_ARN> <SECRET_ARN> <DATABASE> <AWS_REGION> migrations/run-counters-normalized-emails.sql
+  The statements use block comments only, init-schema.sh flattens newlines.
+*/
+
+BEGIN;
+
+ALTER TABLE RUNS ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP;
+
+CREATE TABLE IF NOT EXISTS RUN_COUNTER_SHARDS (
+    run_id VARCHAR(255) NOT NULL,
+    shard INTEGER NOT NULL,
+    success_email_count INTEGER NOT NULL DEFAULT 0,
+    failed_email_count INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
+
+    PRIMARY KEY (run_id, shard),
+    CONSTRAINT fk_run FOREIGN KEY (run_id) REFERENCES RUNS(run_id) ON DELETE CASCADE
+);
+
+CREATE OR REPLACE VIEW RUNS_WITH_COUNTERS AS
+SELECT
+    runs.run_id,
+    runs.run_type,
+    runs.attachment_file_ids,
+    runs.attachment_files,
+    runs.bcc,
+    runs.cc,
+    runs.created_at,
+    runs.created_year,
+    runs.created_year_month,
+    runs.created_year_month_day,
+    runs.display_name,
+    runs.expected_email_send_count,
+    runs.is_generate_certificate,
+    runs.recipients,
+    runs.recipient_source,
+    runs.reply_to,
+    runs.sender,
+    runs.sender_id,
+    runs.sender_local_part,
+    runs.spreadsheet_file,
+    runs.spreadsheet_file_id,
+    runs.subject,
+    (runs.success_email_count + shards.success_email_count)::INTEGER AS success_email_count,
+    (runs.failed_email_count + shards.failed_email_count)::INTEGER AS failed_email_count,
+    runs.template_file,
+    runs.template_file_id,
+    GREATEST(runs.updated_at, shards.updated_at) AS updated_at
+FROM RUNS AS runs
+CROSS JOIN LATERAL (
+    SELECT
+        COALESCE(SUM(RUN_COUNTER_SHARDS.success_email_count), 0) AS success_email_count,
+        COALESCE(SUM(RUN_COUNTER_SHARDS.failed_email_count), 0) AS failed_email_count,
+        MAX(RUN_COUNTER_SHARDS.updated_at) AS updated_at
+    FROM RUN_COUNTER_SHARDS
+    WHERE RUN_COUNTER_SHARDS.run_id = runs.run_id
+) AS shards;
+
+/* Normalized rows leave the run-level columns NULL and read them from RUNS */
+ALTER TABLE EMAILS ALTER COLUMN attachment_file_ids DROP NOT NULL, ALTER COLUMN attachment_file_ids DROP DEFAULT, ALTER COLUMN bcc DROP NOT NULL, ALTER COLUMN bcc DROP DEFAULT, ALTER COLUMN cc DROP NOT NULL, ALTER COLUMN cc DROP DEFAULT, ALTER COLUMN subject DROP NOT NULL, ALTER COLUMN template_file_id DROP NOT NULL;
+
+CREATE OR REPLACE VIEW EMAILS_WITH_RUN AS
+SELECT
+    emails.email_id,
+    emails.run_id,
+    COALESCE(emails.attachment_file_ids, runs.attachment_file_ids) AS attachment_file_ids,
+    COALESCE(emails.bcc, runs.bcc) AS bcc,
+    COALESCE(emails.cc, runs.cc) AS cc,
+    emails.created_at,
+    COALESCE(emails.display_name, runs.display_name) AS display_name,
+    emails.is_generate_certificate,
+    emails.recipient_email,
+    COALESCE(emails.reply_to, runs.reply_to) AS reply_to,
+    emails.row_data,
+    COALESCE(emails.sender_id, runs.sender_id) AS sender_id,
+    COALESCE(emails.sender_local_part, runs.sender_local_part) AS sender_local_part,
+    COALESCE(emails.sender_username, runs.sender ->> 'username') AS sender_username,
+    emails.sent_at,
+    COALESCE(emails.spreadsheet_file_id, runs.spreadsheet_file_id) AS spreadsheet_file_id,
+    emails.status,
+    COALESCE(emails.subject, runs.subject) AS subject,
+    COALESCE(emails.template_file_id, runs.template_file_id) AS template_file_id,
+    emails.updated_at
+FROM EMAILS AS emails
+JOIN RUNS AS runs ON runs.run_id = emails.run_id;
+
+COMMIT;
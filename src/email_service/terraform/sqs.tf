@@ -60,3 +60,19 @@ module "upsert_run_sqs" {
     maxReceiveCount = 2
   }
 }
+
+
+module "export_emails_sqs" {
+  source  = "terraform-aws-modules/sqs/aws"
+  version = "4.2.0"
+
+  name                       = "${var.environment}-export-emails-sqs"
+  visibility_timeout_seconds = 960 # Second, make sure it is larger than the Lambda timeout
+
+  # Dead letter queue
+  create_dlq = true
+  redrive_policy = {
+    # One failure to receive a message would cause the message to move to the DLQ
+    maxReceiveCount = 2
+  }
+}
@@ -55,3 +55,27 @@ variable "rds_engine_version" {
   description = "RDS Aurora PostgreSQL engine version"
   type        = string
 }
+
+variable "email_retention_months" {
+  description = "Months of emails kept in the EMAILS partitions, older partitions are archived to S3 by archive_emails"
+  type        = number
+  default     = 12
+}
+
+variable "email_storage_mode" {
+  description = "How create_email stores email rows: denormalized (copy the run-level columns into every row) or normalized (per-recipient columns only, run-level values read from RUNS)"
+  type        = string
+  default     = "denormalized"
+}
+
+variable "database_backend" {
+  description = "How the repositories reach Aurora: data_api (RDS Data API) or postgres (pooled connection through database_proxy_endpoint)"
+  type        = string
+  default     = "data_api"
+}
+
+variable "database_proxy_endpoint" {
+  description = "RDS Proxy endpoint used when database_backend is postgres"
+  type        = string
+  default     = ""
+}
@@ -167,8 +167,11 @@ class RunRepository:
             placeholders = ", ".join(f":{k}" for k in columns)
 
             # For UPDATE part, exclude run_id as primary key
-            update_cols = [k for k in columns if k != "run_id"]
-            update_str = ", ".join(f"{k} = EXCLUDED.{k}" for k in update_cols)
+            update_cols = [k for k in columns if k not in ("run_id", "updated_at")]
+            update_str = ", ".join(
+                [f"{k} = EXCLUDED.{k}" for k in update_cols]
+                + ["updated_at = CURRENT_TIMESTAMP"]
+            )
 
             sql = f"""
                 INSERT INTO runs ({columns_str})
@@ -217,7 +220,8 @@ class RunRepository:
         try:
             sql = """
                 UPDATE runs
-                SET expected_email_send_count = expected_email_send_count + 1
+                SET expected_email_send_count = expected_email_send_count + 1,
+                    updated_at = CURRENT_TIMESTAMP
                 WHERE run_id = :run_id
             """
             params = [
@@ -249,7 +253,8 @@ class RunRepository:
         try:
             sql = """
                 UPDATE runs
-                SET success_email_count = success_email_count + 1
+                SET success_email_count = success_email_count + 1,
+                    updated_at = CURRENT_TIMESTAMP
                 WHERE run_id = :run_id
             """
             params = [
@@ -112,6 +112,38 @@ def read_sheet_data_from_s3(
         raise
 
 
+def read_sheet_sidecar_from_s3(
+    spreadsheet_sidecar_s3_key: str,
+) -> tuple[list[dict[str, Any]], list[str]]:
+    """Read the Parquet sidecar the file service stores for uploaded spreadsheets.
+
+    Args:
+        spreadsheet_sidecar_s3_key: The key of the sidecar in the bucket.
+
+    Returns:
+        The same rows and columns as read_sheet_data_from_s3, without parsing
+        Excel XML.
+    """
+    try:
+        s3 = boto3.client("s3")
+        request = s3.get_object(Bucket=BUCKET_NAME, Key=spreadsheet_sidecar_s3_key)
+        sheet_data = pd.read_parquet(
+            io.BytesIO(request["Body"].read()), engine="pyarrow"
+        )
+        # Parquet reads empty text cells as None where read_excel gives NaN
+        for column in sheet_data.select_dtypes(include="object").columns:
+            sheet_data[column] = sheet_data[column].where(
+                sheet_data[column].notna(), float("nan")
+            )
+        rows = cast(list[dict[str, Any]], sheet_data.to_dict(orient="records"))
+        if sheet_data.empty:
+            return [], []
+        return rows, sheet_data.columns.tolist()
+    except Exception as e:
+        logger.error("Error in read sheet sidecar from s3: %s", e)
+        raise
+
+
 def extract_template_variables(template_content: str) -> list[str]:
     """Extract required variables from template content.
 
@@ -123,12 +155,28 @@ def extract_template_variables(template_content: str) -> list[str]:
     """
     try:
         placeholders = re.findall(r"{{(.*?)}}", template_content)
-        return list(set(placeholders))  # Use set to remove duplicates
+        # Stripped like the variables precomputed by the file service
+        return sorted({placeholder.strip() for placeholder in placeholders})
     except Exception as e:
         logger.error("Error in extract_template_variables: %s", e)
         raise
 
 
+def get_template_variables(template_info: dict[str, Any]) -> list[str]:
+    """Get the variables of a template, precomputed at upload when available.
+
+    Args:
+        template_info: The template file information from the file service.
+
+    Returns:
+        A list of variable names that are required in the template.
+    """
+    if "template_variables" in template_info:
+        return template_info["template_variables"]
+    # Templates uploaded before the file service compiled them
+    return extract_template_variables(get_template(template_info["s3_object_key"]))
+
+
 def validate_run_type(run_type: str) -> None:
     """Validate the run_type against the RunType enum."""
     if not RunType.has_value(run_type):
@@ -139,7 +187,7 @@ def validate_run_type(run_type: str) -> None:
 
 
 def validate_template_variables(
-    template_content: str,
+    required_variables: list[str],
     recipient_source: str,
     recipients: list[dict[str, Any]] | None = None,
     rows: list[dict[str, Any]] | None = None,
@@ -147,7 +195,7 @@ def validate_template_variables(
     """Validate that all required template variables are provided.
 
     Args:
-        template_content: The content of template file.
+        required_variables: The variables required by the template.
         recipient_source: The source of recipients (SPREADSHEET or DIRECT).
         recipients: List of recipients with their template variables (for DIRECT mode).
         rows: List of spreadsheet rows (for SPREADSHEET mode).
@@ -155,7 +203,6 @@ def validate_template_variables(
     Raises:
         ValueError: If any recipient is missing required template variables.
     """
-    required_variables = extract_template_variables(template_content)
     if not required_variables:
         return
 
@@ -186,8 +233,14 @@ def validate_spreadsheet_mode(
         raise ValueError("Missing spreadsheet file ID")
 
     spreadsheet_info = get_file_info(spreadsheet_file_id, access_token)
-    spreadsheet_s3_key = spreadsheet_info["s3_object_key"]
-    rows, columns = read_sheet_data_from_s3(spreadsheet_s3_key)
+    spreadsheet_sidecar_s3_key = spreadsheet_info.get(
+        "spreadsheet_sidecar_s3_object_key"
+    )
+    if spreadsheet_sidecar_s3_key:
+        # Parsed once by the file service when the sheet was uploaded
+        rows, columns = read_sheet_sidecar_from_s3(spreadsheet_sidecar_s3_key)
+    else:
+        rows, columns = read_sheet_data_from_s3(spreadsheet_info["s3_object_key"])
 
     # Validate email format
     invalid_emails = [
@@ -356,9 +409,9 @@ def lambda_handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
                 # Reuse existing validation functions
                 validate_direct_mode(recipients)
                 template_info = get_file_info(template_file_id, access_token)
-                template_content = get_template(template_info["s3_object_key"])
+                required_variables = get_template_variables(template_info)
                 validate_template_variables(
-                    template_content,
+                    required_variables,
                     RecipientSource.DIRECT.value,
                     recipients=recipients,
                 )
@@ -441,7 +494,7 @@ def lambda_handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
 
             # Get template information
             template_info = get_file_info(template_file_id, access_token)
-            template_content = get_template(template_info["s3_object_key"])
+            required_variables = get_template_variables(template_info)
 
             # Process based on recipient source
             try:
@@ -452,12 +505,12 @@ def lambda_handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
                         validate_spreadsheet_mode(spreadsheet_file_id, access_token)
                     )
                     validate_template_variables(
-                        template_content, recipient_source, rows=rows
+                        required_variables, recipient_source, rows=rows
                     )
                 else:  # DIRECT mode
                     expected_email_send_count = validate_direct_mode(recipients)
                     validate_template_variables(
-                        template_content, recipient_source, recipients=recipients
+                        required_variables, recipient_source, recipients=recipients
                     )
 
                 # Validate certificate requirements
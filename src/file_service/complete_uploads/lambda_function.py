@@ -0,0 +1,380 @@
+import json
+import logging
+import os
+import re
+from decimal import Decimal
+from urllib.parse import quote
+
+import boto3
+import time_util
+from botocore.exceptions import ClientError
+from file_repository import FileRepository
+from spreadsheet_util import SPREADSHEET_EXTENSIONS, store_spreadsheet_sidecar
+from template_util import store_template_artifact
+
+from auth_service import AuthService
+
+# Set up logging
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+# Initialize S3 client
+s3_client = boto3.client("s3")
+
+# Initialize FileRepository
+file_repository = FileRepository()
+
+# Initialize AuthService
+auth_service = AuthService()
+
+BUCKET_NAME = os.environ["BUCKET_NAME"]
+S3_BASE_URL = f"https://{BUCKET_NAME}.s3.amazonaws.com/"
+
+# Larger templates and spreadsheets are registered without being processed,
+# parsing them could not finish within the 29 s API Gateway timeout; readers
+# then parse the raw file as before artifacts and sidecars existed
+UPLOAD_PROCESSING_MAX_FILE_SIZE = int(
+    os.getenv("UPLOAD_PROCESSING_MAX_FILE_SIZE", str(5 * 1024 * 1024))
+)
+# file_id as issued by POST /uploads
+FILE_ID_PATTERN = re.compile(r"[0-9a-f]{32}")
+
+
+class DecimalEncoder(json.JSONEncoder):
+    """Custom JSON encoder for Decimal objects."""
+
+    def default(self, o: object) -> object:
+        if isinstance(o, Decimal):
+            return float(o)
+        return super().default(o)
+
+
+class UploadVerificationError(Exception):
+    """Raised when an uploaded object does not match the declared upload"""
+
+
+def complete_multipart_upload(unique_file_name, upload_id):
+    """
+    Assemble the uploaded parts of a multipart upload into the object.
+
+    The parts are listed from S3 rather than taken from the client, so the
+    client only has to report the upload_id. S3 assembles any ascending set of
+    parts, so a gap in the part numbers is refused here; missing trailing
+    parts are caught by verify_uploaded_object.
+
+    :param unique_file_name: The S3 object key
+    :param upload_id: The multipart upload ID
+    :raises UploadVerificationError: If a part is missing
+    """
+    parts = []
+    paginator = s3_client.get_paginator("list_parts")
+    for page in paginator.paginate(
+        Bucket=BUCKET_NAME, Key=unique_file_name, UploadId=upload_id
+    ):
+        parts.extend(
+            {"PartNumber": part["PartNumber"], "ETag": part["ETag"]}
+            for part in page.get("Parts", [])
+        )
+
+    part_numbers = [part["PartNumber"] for part in parts]
+    if not parts or part_numbers != list(range(1, len(parts) + 1)):
+        raise UploadVerificationError(
+            f"Uploaded parts {part_numbers} of {unique_file_name} are not contiguous"
+        )
+
+    s3_client.complete_multipart_upload(
+        Bucket=BUCKET_NAME,
+        Key=unique_file_name,
+        UploadId=upload_id,
+        MultipartUpload={"Parts": parts},
+    )
+    logger.info(
+        "Completed multipart upload of %s from %d parts", unique_file_name, len(parts)
+    )
+
+
+def verify_uploaded_object(unique_file_name, head):
+    """
+    Compare an assembled multipart object with the file_size and part count
+    declared to POST /uploads. An object that does not match is deleted,
+    its upload cannot be resumed once completed.
+
+    :param unique_file_name: The S3 object key
+    :param head: The head_object response of the object
+    :raises UploadVerificationError: If the object does not match
+    """
+    metadata = head.get("Metadata", {})
+    declared_file_size = metadata.get("file-size")
+    declared_part_count = metadata.get("part-count")
+    if declared_file_size is None or declared_part_count is None:
+        # Single PUT uploads are complete once the object exists
+        return
+
+    # The ETag of a multipart object ends with its number of parts
+    etag = head["ETag"].strip('"')
+    part_count = int(etag.rsplit("-", 1)[1]) if "-" in etag else 1
+    if (
+        int(declared_file_size) != head["ContentLength"]
+        or int(declared_part_count) != part_count
+    ):
+        s3_client.delete_object(Bucket=BUCKET_NAME, Key=unique_file_name)
+        raise UploadVerificationError(
+            f"{unique_file_name} has {head['ContentLength']} bytes in {part_count} "
+            f"parts, {declared_file_size} bytes in {declared_part_count} parts "
+            "were declared"
+        )
+
+
+def complete_upload(upload, uploader_id):
+    """
+    Register a file uploaded through a presigned URL in the file table.
+
+    Completing the same upload twice returns the already registered file.
+
+    :param upload: Dict with file_id, file_name and, for multipart uploads, upload_id
+    :param uploader_id: The ID of the uploading user
+    :return: The file metadata, or None if it could not be saved
+    """
+    file_id = upload["file_id"]
+    file_name = upload["file_name"]
+    unique_file_name = f"{file_id}_{file_name}"
+
+    existing_file = file_repository.get_file_by_id(file_id)
+    if existing_file:
+        return existing_file
+
+    upload_id = upload.get("upload_id")
+    if upload_id:
+        try:
+            complete_multipart_upload(unique_file_name, upload_id)
+        except ClientError as e:
+            # A retried completion finds the upload already assembled
+            if e.response["Error"]["Code"] != "NoSuchUpload":
+                raise
+
+    # The object itself is the source of truth for what was uploaded
+    head = s3_client.head_object(Bucket=BUCKET_NAME, Key=unique_file_name)
+    verify_uploaded_object(unique_file_name, head)
+
+    encoded_file_name = quote(unique_file_name)
+    res_url = S3_BASE_URL + encoded_file_name
+    file_metadata = create_file_metadata_dict(
+        file_id,
+        unique_file_name,
+        res_url,
+        file_name,
+        head["ContentLength"],
+        uploader_id,
+    )
+    file_extension = file_metadata["file_extension"].lower()
+    if (file_extension == "html" or file_extension in SPREADSHEET_EXTENSIONS) and head[
+        "ContentLength"
+    ] <= UPLOAD_PROCESSING_MAX_FILE_SIZE:
+        # Templates and recipient sheets are processed once, at registration
+        response = s3_client.get_object(Bucket=BUCKET_NAME, Key=unique_file_name)
+        file_content = response["Body"].read()
+        add_template_artifact(file_metadata, file_content)
+        add_spreadsheet_sidecar(file_metadata, file_content)
+    if not file_repository.save_file(file_metadata):
+        # The object stays in S3, completing the upload again registers it
+        return None
+    logger.info("Registered uploaded file: %s", unique_file_name)
+
+    return file_metadata
+
+
+def add_spreadsheet_sidecar(file_metadata, file_content):
+    """
+    Store the columnar sidecar of an uploaded spreadsheet and reference it from
+    the file metadata. A sheet that cannot be parsed is still stored, readers
+    then fail on it the same way they did before sidecars.
+
+    :param file_metadata: The file metadata, updated in place
+    :param file_content: The uploaded file content
+    """
+    file_extension = file_metadata["file_extension"].lower()
+    if file_extension not in SPREADSHEET_EXTENSIONS:
+        return
+    try:
+        file_metadata.update(
+            store_spreadsheet_sidecar(
+                s3_client,
+                BUCKET_NAME,
+                file_metadata["s3_object_key"],
+                file_content,
+                file_extension,
+            )
+        )
+    except Exception as e:
+        logger.warning(
+            "Failed to store the spreadsheet sidecar of %s: %s",
+            file_metadata["s3_object_key"],
+            e,
+        )
+
+
+def add_template_artifact(file_metadata, file_content):
+    """
+    Compile an uploaded HTML template once, so readers of its variables and
+    send_email do not parse the HTML again, and reference the artifact from
+    the file metadata.
+
+    :param file_metadata: The file metadata, updated in place
+    :param file_content: The uploaded file content
+    """
+    if file_metadata["file_extension"].lower() != "html":
+        return
+    try:
+        html_content = file_content.decode("utf-8")
+    except UnicodeDecodeError:
+        logger.warning(
+            "Template is not UTF-8, skipping its artifact: %s",
+            file_metadata["s3_object_key"],
+        )
+        return
+    file_metadata.update(
+        store_template_artifact(
+            s3_client, BUCKET_NAME, file_metadata["s3_object_key"], html_content
+        )
+    )
+
+
+def create_file_metadata_dict(
+    file_id, unique_file_name, res_url, file_name, file_size, uploader_id
+):
+    """Create a dictionary with file metadata."""
+    formatted_now = time_util.get_current_utc_time()
+    created_year = formatted_now[:4]
+    created_year_month = formatted_now[:7]
+    created_year_month_day = formatted_now[:10]
+    return {
+        "file_id": file_id,
+        "s3_object_key": unique_file_name,
+        "created_at": formatted_now,
+        "created_year": created_year,
+        "created_year_month": created_year_month,
+        "created_year_month_day": created_year_month_day,
+        "updated_at": formatted_now,
+        "file_url": res_url,
+        "file_name": file_name,
+        "file_extension": file_name.split(".")[-1],
+        "file_size": file_size,
+        "uploader_id": uploader_id,
+    }
+
+
+def validate_upload(upload):
+    """
+    Validate one entry of the request's 'uploads' list.
+
+    :param upload: Dict with file_id, file_name and optional upload_id
+    :return: An error message, or None if the entry is valid
+    """
+    if not isinstance(upload, dict):
+        return "Each upload must be an object"
+    file_id = upload.get("file_id")
+    if not isinstance(file_id, str) or not FILE_ID_PATTERN.fullmatch(file_id):
+        return "file_id must be the ID returned by POST /uploads"
+    file_name = upload.get("file_name")
+    if not isinstance(file_name, str) or not file_name or "/" in file_name:
+        return "file_name must be a non-empty string without '/'"
+    return None
+
+
+def lambda_handler(event, context):
+    """
+    Lambda function handler for registering files uploaded directly to S3.
+
+    :param event: The event dict containing the API request details
+    :param context: The context object providing runtime information
+    :return: A dict containing the API response
+    """
+    # Identify if the incoming event is a prewarm request
+    if event.get("action") == "PREWARM":
+        logger.info("Received a prewarm request. Skipping business logic.")
+        return {"statusCode": 200, "body": "Successfully warmed up"}
+
+    # Get the access token from headers
+    authorization_header = event["headers"].get("authorization")
+    if not authorization_header or not authorization_header.startswith("Bearer "):
+        return {
+            "statusCode": 401,
+            "body": json.dumps({"message": "Missing or invalid Authorization header"}),
+            "headers": {"Content-Type": "application/json"},
+        }
+
+    try:
+        body = json.loads(event.get("body") or "{}")
+    except json.JSONDecodeError:
+        return {
+            "statusCode": 400,
+            "body": json.dumps({"message": "Invalid JSON in request body"}),
+            "headers": {"Content-Type": "application/json"},
+        }
+
+    uploads = body.get("uploads") if isinstance(body, dict) else None
+    if not isinstance(uploads, list) or not uploads:
+        return {
+            "statusCode": 400,
+            "body": json.dumps({"message": "uploads must be a non-empty list"}),
+            "headers": {"Content-Type": "application/json"},
+        }
+    for upload in uploads:
+        error_message = validate_upload(upload)
+        if error_message:
+            return {
+                "statusCode": 400,
+                "body": json.dumps({"message": error_message}),
+                "headers": {"Content-Type": "application/json"},
+            }
+
+    access_token = authorization_header.split(" ")[1]
+
+    # Retrieve user information using AuthService
+    user_info = auth_service.get_me(access_token)
+    uploader_id = user_info.get("user_id")
+
+    files_metadata = []
+    failed_uploads = []
+    for upload in uploads:
+        try:
+            file_metadata = complete_upload(upload, uploader_id)
+        except ClientError as e:
+            logger.error(
+                "Amazon S3 ClientError (%s): %s",
+                e.response["Error"]["Code"],
+                e.response["Error"]["Message"],
+            )
+            failed_uploads.append(
+                {
+                    "file_id": upload["file_id"],
+                    "message": "The file was not uploaded or the upload expired",
+                }
+            )
+        except UploadVerificationError as e:
+            logger.error("Upload verification failed: %s", e)
+            failed_uploads.append(
+                {
+                    "file_id": upload["file_id"],
+                    "message": "The upload is incomplete, upload the file again",
+                }
+            )
+        else:
+            if file_metadata:
+                files_metadata.append(file_metadata)
+            else:
+                failed_uploads.append(
+                    {
+                        "file_id": upload["file_id"],
+                        "message": "Failed to save the file metadata",
+                    }
+                )
+
+    return {
+        "statusCode": 200,
+        "body": json.dumps(
+            {"files": files_metadata, "failed_uploads": failed_uploads},
+            cls=DecimalEncoder,
+        ),
+        "headers": {"Content-Type": "application/json"},
+    }
@@ -0,0 +1,67 @@
+import json
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+# {{variable}}, the same syntax send_email substitutes
+PLACEHOLDER_PATTERN = re.compile(r"\{\{(.*?)\}\}")
+TEMPLATE_ARTIFACT_SUFFIX = ".template.json"
+TEMPLATE_ARTIFACT_VERSION = 1
+
+
+def compile_template(html_content: str) -> dict[str, any]:
+    """
+    Compile an HTML template into its variable list and segment form.
+
+    The segments alternate literal text with {"variable", "placeholder"}
+    entries, so rendering is a join instead of a regex substitution. Variable
+    names are stripped of surrounding whitespace.
+
+    :param html_content: The HTML template
+    :return: The template artifact
+    """
+    segments = []
+    variables = set()
+    position = 0
+    for match in PLACEHOLDER_PATTERN.finditer(html_content):
+        if match.start() > position:
+            segments.append(html_content[position : match.start()])
+        variable = match.group(1).strip()
+        variables.add(variable)
+        segments.append({"variable": variable, "placeholder": match.group(0)})
+        position = match.end()
+    if position < len(html_content):
+        segments.append(html_content[position:])
+
+    return {
+        "version": TEMPLATE_ARTIFACT_VERSION,
+        "variables": sorted(variables),
+        "segments": segments,
+    }
+
+
+def store_template_artifact(s3_client, bucket_name, s3_object_key, html_content):
+    """
+    Compile an uploaded HTML template and store the artifact next to it.
+
+    :param s3_client: The S3 client
+    :param bucket_name: The bucket of the template
+    :param s3_object_key: The S3 object key of the template
+    :param html_content: The HTML template
+    :return: Dict of the file item attributes describing the artifact
+    """
+    artifact = compile_template(html_content)
+    artifact_s3_object_key = s3_object_key + TEMPLATE_ARTIFACT_SUFFIX
+    s3_client.put_object(
+        Bucket=bucket_name,
+        Key=artifact_s3_object_key,
+        Body=json.dumps(artifact, ensure_ascii=False).encode("utf-8"),
+        ContentType="application/json",
+    )
+    logger.info("Stored template artifact: %s", artifact_s3_object_key)
+    return {
+        "template_variables": artifact["variables"],
+        "template_artifact_s3_object_key": artifact_s3_object_key,
+    }
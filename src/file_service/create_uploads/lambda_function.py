@@ -0,0 +1,183 @@
+import json
+import logging
+import math
+import os
+import uuid
+from urllib.parse import quote
+
+import boto3
+from botocore.config import Config
+from botocore.exceptions import ClientError
+
+# Set up logging
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+# Presigned URLs must be signed with SigV4 against the bucket's region
+s3_client = boto3.client("s3", config=Config(signature_version="s3v4"))
+
+BUCKET_NAME = os.environ["BUCKET_NAME"]
+UPLOAD_URL_EXPIRES_IN = int(os.getenv("UPLOAD_URL_EXPIRES_IN", "3600"))
+# Files larger than this are uploaded in parts
+MULTIPART_UPLOAD_THRESHOLD = int(
+    os.getenv("MULTIPART_UPLOAD_THRESHOLD", str(100 * 1024 * 1024))
+)
+MULTIPART_PART_SIZE = int(os.getenv("MULTIPART_PART_SIZE", str(64 * 1024 * 1024)))
+# S3 limits
+MAX_MULTIPART_PARTS = 10000
+MAX_UPLOAD_FILE_SIZE = 5 * 1024**4
+
+
+def validate_file_request(file_request):
+    """
+    Validate one entry of the request's 'files' list.
+
+    :param file_request: Dict with file_name, file_size and optional content_type
+    :return: An error message, or None if the entry is valid
+    """
+    if not isinstance(file_request, dict):
+        return "Each file must be an object"
+    file_name = file_request.get("file_name")
+    if not isinstance(file_name, str) or not file_name or "/" in file_name:
+        return "file_name must be a non-empty string without '/'"
+    file_size = file_request.get("file_size")
+    if (
+        not isinstance(file_size, int)
+        or isinstance(file_size, bool)
+        or not 0 < file_size <= MAX_UPLOAD_FILE_SIZE
+    ):
+        return f"file_size of {file_name} must be between 1 and {MAX_UPLOAD_FILE_SIZE} bytes"
+    return None
+
+
+def create_upload(file_request):
+    """
+    Reserve an S3 object key for a file and presign its upload.
+
+    Small files get a single presigned PUT URL. Large files get a multipart
+    upload of part_count parts; the client presigns ranges of them with
+    GET /uploads/{file_id}/parts and PUTs each part_size slice of the file to
+    its URL, in any order and in parallel. Presigning every part here would
+    exceed the Lambda response size for the largest files.
+
+    :param file_request: Dict with file_name, file_size and optional content_type
+    :return: The upload instructions for the client
+    """
+    file_name = file_request["file_name"]
+    file_size = file_request["file_size"]
+    content_type = file_request.get("content_type") or "application/octet-stream"
+
+    file_id = uuid.uuid4().hex
+    unique_file_name = f"{file_id}_{file_name}"
+    upload = {
+        "file_id": file_id,
+        "file_name": file_name,
+        "s3_object_key": unique_file_name,
+        "expires_in": UPLOAD_URL_EXPIRES_IN,
+    }
+
+    if file_size <= MULTIPART_UPLOAD_THRESHOLD:
+        upload["upload_url"] = s3_client.generate_presigned_url(
+            "put_object",
+            Params={
+                "Bucket": BUCKET_NAME,
+                "Key": unique_file_name,
+                "ContentType": content_type,
+            },
+            ExpiresIn=UPLOAD_URL_EXPIRES_IN,
+            HttpMethod="PUT",
+        )
+        return upload
+
+    part_size = max(MULTIPART_PART_SIZE, math.ceil(file_size / MAX_MULTIPART_PARTS))
+    part_count = math.ceil(file_size / part_size)
+    # The declared size and part count end up on the assembled object, so
+    # POST /uploads/complete can verify that no part is missing
+    response = s3_client.create_multipart_upload(
+        Bucket=BUCKET_NAME,
+        Key=unique_file_name,
+        ContentType=content_type,
+        Metadata={"file-size": str(file_size), "part-count": str(part_count)},
+    )
+    upload_id = response["UploadId"]
+    logger.info(
+        "Created multipart upload of %s in %d parts", unique_file_name, part_count
+    )
+
+    upload["upload_id"] = upload_id
+    upload["part_size"] = part_size
+    upload["part_count"] = part_count
+    upload["part_urls_path"] = (
+        f"/uploads/{file_id}/parts?file_name={quote(file_name, safe='')}&upload_id={quote(upload_id, safe='')}"
+    )
+    return upload
+
+
+def lambda_handler(event, context):
+    """
+    Lambda function handler issuing presigned S3 upload URLs.
+
+    The file content goes straight from the client to S3; once it is uploaded
+    the client calls POST /uploads/complete to register the files.
+
+    :param event: The event dict containing the API request details
+    :param context: The context object providing runtime information
+    :return: A dict containing the API response
+    """
+    # Identify if the incoming event is a prewarm request
+    if event.get("action") == "PREWARM":
+        logger.info("Received a prewarm request. Skipping business logic.")
+        return {"statusCode": 200, "body": "Successfully warmed up"}
+
+    authorization_header = event["headers"].get("authorization")
+    if not authorization_header or not authorization_header.startswith("Bearer "):
+        return {
+            "statusCode": 401,
+            "body": json.dumps({"message": "Missing or invalid Authorization header"}),
+            "headers": {"Content-Type": "application/json"},
+        }
+
+    try:
+        body = json.loads(event.get("body") or "{}")
+    except json.JSONDecodeError:
+        return {
+            "statusCode": 400,
+            "body": json.dumps({"message": "Invalid JSON in request body"}),
+            "headers": {"Content-Type": "application/json"},
+        }
+
+    file_requests = body.get("files") if isinstance(body, dict) else None
+    if not isinstance(file_requests, list) or not file_requests:
+        return {
+            "statusCode": 400,
+            "body": json.dumps({"message": "files must be a non-empty list"}),
+            "headers": {"Content-Type": "application/json"},
+        }
+    for file_request in file_requests:
+        error_message = validate_file_request(file_request)
+        if error_message:
+            return {
+                "statusCode": 400,
+                "body": json.dumps({"message": error_message}),
+                "headers": {"Content-Type": "application/json"},
+            }
+
+    try:
+        uploads = [create_upload(file_request) for file_request in file_requests]
+    except ClientError as e:
+        logger.error(
+            "Amazon S3 ClientError (%s): %s",
+            e.response["Error"]["Code"],
+            e.response["Error"]["Message"],
+        )
+        return {
+            "statusCode": 500,
+            "body": json.dumps({"message": "Failed to create the uploads"}),
+            "headers": {"Content-Type": "application/json"},
+        }
+
+    return {
+        "statusCode": 200,
+        "body": json.dumps({"uploads": uploads}),
+        "headers": {"Content-Type": "application/json"},
+    }
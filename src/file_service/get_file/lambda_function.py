@@ -1,6 +1,8 @@
+import hashlib
 import json
 import logging
 import os
+from collections import OrderedDict
 from decimal import Decimal
 
 import boto3
@@ -12,6 +14,12 @@ table = dynamodb.Table(os.getenv("DYNAMODB_TABLE"))
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+# File items never change after upload, so cached items never go stale
+FILE_CACHE_MAX_SIZE = int(os.getenv("FILE_CACHE_MAX_SIZE", "1024"))
+CACHE_CONTROL = "private, max-age=31536000, immutable"
+
+_file_cache: OrderedDict[str, dict] = OrderedDict()
+
 
 class DecimalEncoder(json.JSONEncoder):
     def default(self, o):
@@ -20,6 +28,40 @@ class DecimalEncoder(json.JSONEncoder):
         return super().default(o)
 
 
+def get_file_item(file_id):
+    """
+    Get a file item, from the container's LRU cache when possible.
+
+    Missing files are not cached: a presigned upload's file_id exists before
+    the file is registered.
+
+    :param file_id: The ID of the file
+    :return: The file item, or None if not found
+    """
+    file_item = _file_cache.get(file_id)
+    if file_item is not None:
+        _file_cache.move_to_end(file_id)
+        return file_item
+
+    response = table.get_item(Key={"file_id": file_id})
+    file_item = response.get("Item")
+    if file_item is None:
+        return None
+
+    _file_cache[file_id] = file_item
+    if len(_file_cache) > FILE_CACHE_MAX_SIZE:
+        _file_cache.popitem(last=False)
+    return file_item
+
+
+def etag_matches(if_none_match, etag):
+    """Whether an If-None-Match header value matches the strong ETag."""
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+
 def lambda_handler(event, context):
     # Identify if the incoming event is a prewarm request
     if event.get("action") == "PREWARM":
@@ -27,14 +69,11 @@ def lambda_handler(event, context):
         return {"statusCode": 200, "body": "Successfully warmed up"}
 
     file_id = event["pathParameters"]["file_id"]
-    print("test")
-    response = table.get_item(Key={"file_id": file_id})
+    file_item = get_file_item(file_id)
 
-    if "Item" not in response:
+    if file_item is None:
         return {"statusCode": 404, "body": json.dumps({"message": "File not found"})}
 
-    file_item = response["Item"]
-
     result = {
         "file_id": file_item["file_id"],
         "s3_object_key": file_item["s3_object_key"],
@@ -47,11 +86,36 @@ def lambda_handler(event, context):
         "uploader_id": file_item["uploader_id"],
     }
 
+    # Set on HTML templates and spreadsheets processed at upload time
+    for optional_key in (
+        "template_variables",
+        "template_artifact_s3_object_key",
+        "spreadsheet_sidecar_s3_object_key",
+        "spreadsheet_columns",
+        "spreadsheet_row_count",
+        "spreadsheet_column_stats",
+    ):
+        if optional_key in file_item:
+            result[optional_key] = file_item[optional_key]
+
+    body = json.dumps(result, cls=DecimalEncoder)
+    etag = '"' + hashlib.sha256(body.encode("utf-8")).hexdigest() + '"'
+    headers = {
+        "Content-Type": "application/json",
+        "Access-Control-Allow-Origin": "*",
+        "ETag": etag,
+        "Cache-Control": CACHE_CONTROL,
+    }
+
+    request_headers = event.get("headers") or {}
+    if_none_match = request_headers.get("if-none-match") or request_headers.get(
+        "If-None-Match"
+    )
+    if etag_matches(if_none_match, etag):
+        return {"statusCode": 304, "headers": headers, "body": ""}
+
     return {
         "statusCode": 200,
-        "headers": {
-            "Content-Type": "application/json",
-            "Access-Control-Allow-Origin": "*",
-        },
-        "body": json.dumps(result, cls=DecimalEncoder),
+        "headers": headers,
+        "body": body,
     }
@@ -97,13 +97,15 @@ def lambda_handler(event, context):
                 ),
             }
 
-        # Download file content from S3
-        s3_object_key = file_item["s3_object_key"]
-        bucket_name = os.getenv("S3_BUCKET_NAME")
-        html_content = read_html_template_file_from_s3(bucket_name, s3_object_key)
-
-        # Extract template variables
-        variables = extract_template_variables(html_content)
+        if "template_variables" in file_item:
+            # Precomputed when the template was uploaded
+            variables = file_item["template_variables"]
+        else:
+            # Templates uploaded before compilation at upload time
+            s3_object_key = file_item["s3_object_key"]
+            bucket_name = os.getenv("S3_BUCKET_NAME")
+            html_content = read_html_template_file_from_s3(bucket_name, s3_object_key)
+            variables = extract_template_variables(html_content)
 
         # Prepare response
         result = {
@@ -0,0 +1,136 @@
+import json
+import logging
+import os
+import re
+
+import boto3
+from botocore.config import Config
+
+# Set up logging
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+# Presigned URLs must be signed with SigV4 against the bucket's region
+s3_client = boto3.client("s3", config=Config(signature_version="s3v4"))
+
+BUCKET_NAME = os.environ["BUCKET_NAME"]
+UPLOAD_URL_EXPIRES_IN = int(os.getenv("UPLOAD_URL_EXPIRES_IN", "3600"))
+# Part URLs presigned per request, keeps the response far below the Lambda limit
+MAX_PART_URLS_PER_REQUEST = int(os.getenv("MAX_PART_URLS_PER_REQUEST", "100"))
+# S3 limits
+MAX_MULTIPART_PARTS = 10000
+# file_id as issued by POST /uploads
+FILE_ID_PATTERN = re.compile(r"[0-9a-f]{32}")
+
+
+def parse_part_range(query_params):
+    """
+    Parse the 'from' and 'to' part numbers of the request, both inclusive.
+
+    :param query_params: The query string parameters
+    :return: Tuple of (first part number, last part number)
+    :raises ValueError: If the range is invalid
+    """
+    try:
+        first_part_number = int(query_params.get("from", "1"))
+        last_part_number = int(
+            query_params.get(
+                "to", str(first_part_number + MAX_PART_URLS_PER_REQUEST - 1)
+            )
+        )
+    except ValueError as e:
+        raise ValueError("from and to must be part numbers") from e
+
+    if not 1 <= first_part_number <= last_part_number <= MAX_MULTIPART_PARTS:
+        raise ValueError(
+            f"from and to must satisfy 1 <= from <= to <= {MAX_MULTIPART_PARTS}"
+        )
+    if last_part_number - first_part_number + 1 > MAX_PART_URLS_PER_REQUEST:
+        raise ValueError(
+            f"At most {MAX_PART_URLS_PER_REQUEST} part URLs can be requested at once"
+        )
+    return first_part_number, last_part_number
+
+
+def lambda_handler(event, context):
+    """
+    Lambda function handler presigning a range of the part URLs of a multipart
+    upload created by POST /uploads.
+
+    :param event: The event dict containing the API request details
+    :param context: The context object providing runtime information
+    :return: A dict containing the API response
+    """
+    # Identify if the incoming event is a prewarm request
+    if event.get("action") == "PREWARM":
+        logger.info("Received a prewarm request. Skipping business logic.")
+        return {"statusCode": 200, "body": "Successfully warmed up"}
+
+    authorization_header = event["headers"].get("authorization")
+    if not authorization_header or not authorization_header.startswith("Bearer "):
+        return {
+            "statusCode": 401,
+            "body": json.dumps({"message": "Missing or invalid Authorization header"}),
+            "headers": {"Content-Type": "application/json"},
+        }
+
+    file_id = (event.get("pathParameters") or {}).get("file_id")
+    query_params = event.get("queryStringParameters") or {}
+    file_name = query_params.get("file_name")
+    upload_id = query_params.get("upload_id")
+    if not file_id or not FILE_ID_PATTERN.fullmatch(file_id):
+        error_message = "file_id must be the ID returned by POST /uploads"
+    elif not file_name or "/" in file_name:
+        error_message = "file_name must be a non-empty string without '/'"
+    elif not upload_id:
+        error_message = "upload_id is required"
+    else:
+        error_message = None
+    if error_message:
+        return {
+            "statusCode": 400,
+            "body": json.dumps({"message": error_message}),
+            "headers": {"Content-Type": "application/json"},
+        }
+
+    try:
+        first_part_number, last_part_number = parse_part_range(query_params)
+    except ValueError as e:
+        return {
+            "statusCode": 400,
+            "body": json.dumps({"message": str(e)}),
+            "headers": {"Content-Type": "application/json"},
+        }
+
+    # Presigning is local, the upload itself is checked by S3 on each PUT
+    unique_file_name = f"{file_id}_{file_name}"
+    part_urls = [
+        {
+            "part_number": part_number,
+            "upload_url": s3_client.generate_presigned_url(
+                "upload_part",
+                Params={
+                    "Bucket": BUCKET_NAME,
+                    "Key": unique_file_name,
+                    "UploadId": upload_id,
+                    "PartNumber": part_number,
+                },
+                ExpiresIn=UPLOAD_URL_EXPIRES_IN,
+                HttpMethod="PUT",
+            ),
+        }
+        for part_number in range(first_part_number, last_part_number + 1)
+    ]
+
+    return {
+        "statusCode": 200,
+        "body": json.dumps(
+            {
+                "file_id": file_id,
+                "upload_id": upload_id,
+                "expires_in": UPLOAD_URL_EXPIRES_IN,
+                "part_urls": part_urls,
+            }
+        ),
+        "headers": {"Content-Type": "application/json"},
+    }
@@ -1,20 +1,22 @@
 import base64
+import heapq
 import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from decimal import Decimal
+from itertools import islice
 
 from botocore.exceptions import ClientError
-from current_user_util import CurrentUserUtil
 from file_repository import FileRepository
-from file_service_pagination_state_repository import (
-    FileServicePaginationStateRepository,
-)
 from time_util import get_current_utc_time, get_previous_year
 
 # Configure logging
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+# One repository per concurrent partition query, reused across invocations
+_file_repositories: list[FileRepository] = []
+
 
 class DecimalEncoder(json.JSONEncoder):
     """Custom JSON encoder for Decimal objects."""
@@ -45,6 +47,206 @@ def encode_key(decoded_key: dict[str, str]) -> str:
     return encoded_key
 
 
+def gsi_key(item: dict[str, any], partition_key: str) -> dict[str, any]:
+    """Return the GSI key of an item, usable as an ExclusiveStartKey."""
+    return {
+        "file_id": item["file_id"],
+        partition_key: item[partition_key],
+        "created_at": item["created_at"],
+    }
+
+
+def decode_cursor(
+    encoded_cursor: str, partition_key: str, partitions: list[str]
+) -> dict[str, any]:
+    """
+    Decode a pagination cursor. A cursor is self-contained: whether the page
+    follows ('next') or precedes ('previous') it, and per partition the key of
+    the item the page starts after (null to start at the partition's edge), or
+    the partition is listed as exhausted in that direction.
+
+    :param encoded_cursor: The base64 encoded cursor
+    :param partition_key: The GSI partition key, created_year or file_extension
+    :param partitions: The partition values in listing order
+    :return: The decoded cursor
+    """
+    cursor = decode_key(encoded_cursor)
+    if not isinstance(cursor, dict):
+        raise ValueError("Invalid key format. It must encode a JSON object.")
+    if "positions" in cursor:
+        if cursor.get("direction") not in ("next", "previous"):
+            raise ValueError("Invalid key format. Unknown cursor direction.")
+        known_partitions = set(cursor["positions"]) | set(cursor.get("exhausted", []))
+        if known_partitions != set(partitions):
+            raise ValueError(
+                "Invalid key format. The key does not belong to this listing."
+            )
+        return cursor
+
+    # A single item key, as returned before per-partition positions
+    direction = cursor.get("direction", "next")
+    exclusive_start_key = cursor.get("exclusive_start_key", cursor)
+    if direction not in ("next", "previous"):
+        raise ValueError("Invalid key format. Unknown cursor direction.")
+    try:
+        partition_index = partitions.index(exclusive_start_key[partition_key])
+    except (KeyError, TypeError, ValueError) as e:
+        raise ValueError(
+            "Invalid key format. The key does not belong to this listing."
+        ) from e
+    if direction == "next":
+        exhausted = partitions[:partition_index]
+        pending = partitions[partition_index + 1 :]
+    else:
+        exhausted = partitions[partition_index + 1 :]
+        pending = partitions[:partition_index]
+    positions = dict.fromkeys(pending)
+    positions[partitions[partition_index]] = exclusive_start_key
+    return {"direction": direction, "positions": positions, "exhausted": exhausted}
+
+
+def query_partition(
+    file_repo: FileRepository,
+    partition_key: str,
+    partition: str,
+    limit: int,
+    exclusive_start_key: dict[str, any] | None,
+    query_order: str,
+) -> dict[str, any]:
+    """Query one GSI partition, in the given order."""
+    if partition_key == "file_extension":
+        return file_repo.query_files_by_file_extension_and_created_at_gsi(
+            partition, limit, exclusive_start_key, query_order
+        )
+    return file_repo.query_files_by_created_year_and_created_at_gsi(
+        partition, limit, exclusive_start_key, query_order
+    )
+
+
+def get_file_repositories(count: int) -> list[FileRepository]:
+    """
+    Return one FileRepository per concurrent query. boto3 resources must not be
+    shared between threads, so each worker gets its own, kept for the lifetime
+    of the container.
+    """
+    while len(_file_repositories) < count:
+        _file_repositories.append(FileRepository())
+    return _file_repositories[:count]
+
+
+def query_files_page(
+    partition_key: str,
+    partitions: list[str],
+    limit: int,
+    sort_order: str,
+    cursor: dict[str, any] | None,
+) -> tuple[list[dict[str, any]], dict[str, any] | None, dict[str, any] | None]:
+    """
+    Query one page of files across the GSI partitions, in listing order.
+
+    The partitions are queried concurrently, each from its own cursor
+    position, and their already sorted results are merged with a heap until
+    the page is full. Each partition is read one item past the page size:
+    DynamoDB returns a LastEvaluatedKey whenever a query fills its Limit, so
+    only the extra item tells a partition that ends with the page from one
+    that continues. A 'previous' cursor is served the same way with
+    ScanIndexForward flipped, so no page history has to be stored anywhere.
+
+    :param partition_key: The GSI partition key, created_year or file_extension
+    :param partitions: The partition values in listing order
+    :param limit: The page size
+    :param sort_order: The listing order, 'ASC' or 'DESC'
+    :param cursor: The decoded cursor, None for the first page
+    :return: Tuple of (files in listing order, cursor continuing in the queried
+        direction or None when nothing is left, cursor of the opposite direction)
+    """
+    direction = cursor["direction"] if cursor else "next"
+    positions = cursor["positions"] if cursor else dict.fromkeys(partitions)
+    exhausted = list(cursor.get("exhausted", [])) if cursor else []
+
+    query_order = sort_order.upper()
+    if direction == "previous":
+        query_order = "ASC" if query_order == "DESC" else "DESC"
+
+    pending = [partition for partition in partitions if partition in positions]
+    responses = {}
+    if pending:
+        file_repos = get_file_repositories(len(pending))
+        with ThreadPoolExecutor(max_workers=len(pending)) as executor:
+            futures = {
+                partition: executor.submit(
+                    query_partition,
+                    file_repo,
+                    partition_key,
+                    partition,
+                    limit + 1,
+                    positions[partition],
+                    query_order,
+                )
+                for partition, file_repo in zip(pending, file_repos, strict=True)
+            }
+            responses = {
+                partition: future.result() for partition, future in futures.items()
+            }
+
+    streams = [
+        [(item, partition) for item in responses[partition].get("Items", [])]
+        for partition in pending
+    ]
+    merged = heapq.merge(
+        *streams,
+        key=lambda entry: entry[0]["created_at"],
+        reverse=query_order == "DESC",
+    )
+    page = list(islice(merged, limit))
+    files = [item for item, _ in page]
+
+    continuation_positions = {}
+    reverse_positions = {}
+    continuation_exhausted = list(exhausted)
+    reverse_exhausted = []
+    for partition in pending:
+        items = responses[partition].get("Items", [])
+        taken = [item for item, item_partition in page if item_partition == partition]
+        last_evaluated_key = responses[partition].get("LastEvaluatedKey")
+
+        # Continue after the last item taken, or where this page started
+        if len(taken) == len(items) and last_evaluated_key is None:
+            continuation_exhausted.append(partition)
+        elif taken:
+            continuation_positions[partition] = gsi_key(taken[-1], partition_key)
+        else:
+            continuation_positions[partition] = positions[partition]
+
+        # Go back from the first item taken, or from the first one not taken
+        if taken or items:
+            reverse_positions[partition] = gsi_key(
+                taken[0] if taken else items[0], partition_key
+            )
+        else:
+            reverse_positions[partition] = None
+    for partition in exhausted:
+        # Everything of an exhausted partition lies behind the page
+        reverse_positions[partition] = None
+
+    continuation_cursor = None
+    if continuation_positions:
+        continuation_cursor = {
+            "direction": direction,
+            "positions": continuation_positions,
+            "exhausted": continuation_exhausted,
+        }
+    reverse_cursor = {
+        "direction": "next" if direction == "previous" else "previous",
+        "positions": reverse_positions,
+        "exhausted": reverse_exhausted,
+    }
+
+    if direction == "previous":
+        files.reverse()
+    return files, continuation_cursor, reverse_cursor
+
+
 def extract_query_params(event: dict[str, any]) -> dict[str, any]:
     """Extract query parameters from the API Gateway event."""
     limit: int = 10
@@ -116,32 +318,33 @@ def lambda_handler(event: dict[str, any], context: object) -> dict[str, any]:
     sort_order: str = extracted_params["sort_order"]
     created_year: str | None = extracted_params["created_year"]
 
-    # Determine the correct index_name based on the query parameters
-    if file_extension:
-        index_name = "file_extension-created_at-gsi"
-    else:
-        index_name = "created_year-created_at-gsi"
-
-    # Get access token from headers and retrieve user_id
     authorization_header = event["headers"].get("authorization")
     if not authorization_header or not authorization_header.startswith("Bearer "):
         return {
             "statusCode": 401,
             "body": json.dumps({"message": "Missing or invalid Authorization header"}),
         }
-    access_token = authorization_header.split(" ")[1]
-    user_id = CurrentUserUtil().get_user_id_from_access_token(access_token)
 
-    # Init dynamoDB entities
-    file_repo = FileRepository()
-    pagination_state_repo = FileServicePaginationStateRepository()
+    # Determine the GSI partitions to list, in listing order
+    if file_extension:
+        partition_key = "file_extension"
+        partitions = [file_extension]
+    elif created_year:
+        partition_key = "created_year"
+        partitions = [created_year]
+    else:
+        # Default to current and previous year if created_year is not provided
+        partition_key = "created_year"
+        current_year = get_current_utc_time()[:4]
+        partitions = [current_year, get_previous_year(current_year)]
+        if sort_order.upper() == "ASC":
+            partitions.reverse()
 
+    cursor = None
     if last_evaluated_key:
         try:
-            # Decode the base64 last_evaluated_key
-            current_last_evaluated_key = last_evaluated_key
-            last_evaluated_key = decode_key(last_evaluated_key)
-            logger.info("Decoded last_evaluated_key: %s", last_evaluated_key)
+            cursor = decode_cursor(last_evaluated_key, partition_key, partitions)
+            logger.info("Decoded last_evaluated_key: %s", cursor)
         except ValueError as e:
             logger.error("Invalid last_evaluated_key format: %s", e)
             return {
@@ -153,109 +356,37 @@ def lambda_handler(event: dict[str, any], context: object) -> dict[str, any]:
                     }
                 ),
             }
-    else:
-        current_last_evaluated_key = None
-        # Clear old pagination state if no last_evaluated_key is provided
-        pagination_state_repo.save_pagination_state(
-            {
-                "user_id": user_id,
-                "index_name": index_name,
-                "last_evaluated_keys": [],
-                "created_at": get_current_utc_time(),
-                "updated_at": get_current_utc_time(),
-                "limit": limit,
-            }
-        )
-
-    # Default to current and previous year for querying if created_year is not provided
-    if created_year:
-        years_to_query = [created_year]
-    else:
-        current_year = get_current_utc_time()[:4]
-        previous_year = get_previous_year(current_year)
-        years_to_query = [current_year, previous_year]
-
-    files = []
 
     # Query the table using the provided parameters
     try:
-        if file_extension:
-            response = file_repo.query_files_by_file_extension_and_created_at_gsi(
-                file_extension, limit, last_evaluated_key, sort_order
-            )
-            files.extend(response.get("Items", []))
-        else:
-            for year in years_to_query:
-                while True:
-                    response = file_repo.query_files_by_created_year_and_created_at_gsi(
-                        year, limit - len(files), last_evaluated_key, sort_order
-                    )
-                    files.extend(response.get("Items", []))
-                    last_evaluated_key = response.get("LastEvaluatedKey")
-
-                    if last_evaluated_key is None or len(files) >= limit:
-                        break
-
-                if len(files) >= limit:
-                    break
-
-        next_last_evaluated_key = response.get("LastEvaluatedKey")
-
+        files, continuation_cursor, reverse_cursor = query_files_page(
+            partition_key, partitions, limit, sort_order, cursor
+        )
         logger.info("Query successful")
     except ClientError as e:
         logger.error("Query failed: %s", e)
         return {"statusCode": 400, "body": json.dumps({"message": str(e)})}
 
-    # Encode last_evaluated_key to base64 if it's not null
-    if next_last_evaluated_key:
-        next_last_evaluated_key = encode_key(next_last_evaluated_key)
-
-    # Store the pagination state for the next request
-    pagination_state = (
-        pagination_state_repo.get_pagination_state_by_user_id_and_index_name(
-            user_id, index_name
-        )
-    )
-    last_evaluated_keys = pagination_state.get("last_evaluated_keys", [])
-
-    # Append the next_last_evaluated_key only if it is not already in the list
-    if next_last_evaluated_key and next_last_evaluated_key not in last_evaluated_keys:
-        last_evaluated_keys.append(next_last_evaluated_key)
-
-    pagination_state_repo.save_pagination_state(
-        {
-            "user_id": user_id,
-            "index_name": index_name,
-            "last_evaluated_keys": last_evaluated_keys,
-            "created_at": pagination_state.get("created_at", get_current_utc_time()),
-            "updated_at": get_current_utc_time(),
-            "limit": limit,
-        }
+    # The first page has nothing before it
+    if cursor and cursor["direction"] == "previous":
+        next_cursor, previous_cursor = reverse_cursor, continuation_cursor
+    else:
+        next_cursor = continuation_cursor
+        previous_cursor = reverse_cursor if cursor else None
+    next_last_evaluated_key = encode_key(next_cursor) if next_cursor else None
+    previous_last_evaluated_key = (
+        encode_key(previous_cursor) if previous_cursor else None
     )
 
-    # Sort the results by created_at
-    reverse_order = True if sort_order.upper() == "DESC" else False
-    files.sort(key=lambda x: x.get("created_at", ""), reverse=reverse_order)
-
-    # Encode last_evaluated_key to base64 if it's not null
     for file in files:
         for key, value in file.items():
             if isinstance(value, Decimal):
                 file[key] = float(value)
 
-    # Find the index of the current_last_evaluated_key in last_evaluated_keys
-    if current_last_evaluated_key in last_evaluated_keys:
-        current_index = last_evaluated_keys.index(current_last_evaluated_key)
-        previous_last_evaluated_key = (
-            last_evaluated_keys[current_index - 1] if current_index > 0 else None
-        )
-    else:
-        previous_last_evaluated_key = None
-
     result = {
-        "data": files[:limit],
+        "data": files,
         "previous_last_evaluated_key": previous_last_evaluated_key,
-        "current_last_evaluated_key": current_last_evaluated_key,
+        "current_last_evaluated_key": last_evaluated_key,
         "next_last_evaluated_key": next_last_evaluated_key,
     }
 
@@ -100,6 +100,54 @@ module "api_gateway" {
       }
     }
 
+    "POST /uploads" = {
+      detailed_metrics_enabled = true
+      throttling_rate_limit    = 80
+      throttling_burst_limit   = 40
+
+      authorization_type = "CUSTOM"
+      authorizer_key     = "lambda_authorizer"
+
+      integration = {
+        uri                    = module.create_uploads_lambda.lambda_function_arn
+        type                   = "AWS_PROXY"
+        payload_format_version = "1.0"
+        timeout_milliseconds   = 29000
+      }
+    }
+
+    "GET /uploads/{file_id}/parts" = {
+      detailed_metrics_enabled = true
+      throttling_rate_limit    = 80
+      throttling_burst_limit   = 40
+
+      authorization_type = "CUSTOM"
+      authorizer_key     = "lambda_authorizer"
+
+      integration = {
+        uri                    = module.get_upload_parts_lambda.lambda_function_arn
+        type                   = "AWS_PROXY"
+        payload_format_version = "1.0"
+        timeout_milliseconds   = 29000
+      }
+    }
+
+    "POST /uploads/complete" = {
+      detailed_metrics_enabled = true
+      throttling_rate_limit    = 80
+      throttling_burst_limit   = 40
+
+      authorization_type = "CUSTOM"
+      authorizer_key     = "lambda_authorizer"
+
+      integration = {
+        uri                    = module.complete_uploads_lambda.lambda_function_arn
+        type                   = "AWS_PROXY"
+        payload_format_version = "1.0"
+        timeout_milliseconds   = 29000
+      }
+    }
+
     "GET /files" = {
       detailed_metrics_enabled = true
       throttling_rate_limit    = 80
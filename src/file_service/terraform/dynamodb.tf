@@ -33,6 +33,11 @@ resource "aws_dynamodb_table" "file" {
     type = "S"
   }
 
+  attribute {
+    name = "content_sha256"
+    type = "S"
+  }
+
   global_secondary_index {
     name            = "file_extension-created_at-gsi"
     hash_key        = "file_extension"
@@ -61,30 +66,21 @@ resource "aws_dynamodb_table" "file" {
     projection_type = "ALL"
   }
 
-  deletion_protection_enabled = var.enable_deletion_protection_for_dynamodb_table
-
-  point_in_time_recovery {
-    enabled = var.enable_pitr
-  }
-  tags = {
-    Name = "file"
-  }
-}
-
-resource "aws_dynamodb_table" "file_service_pagination_state" {
-  name         = "file_service_pagination_state"
-  billing_mode = "PAY_PER_REQUEST"
-  hash_key     = "user_id"
-  range_key    = "index_name"
-
-  attribute {
-    name = "user_id"
-    type = "S"
-  }
-
-  attribute {
-    name = "index_name"
-    type = "S"
+  # Finds the stored object of re-uploaded content
+  global_secondary_index {
+    name               = "content_sha256-gsi"
+    hash_key           = "content_sha256"
+    projection_type    = "INCLUDE"
+    non_key_attributes = [
+      "s3_object_key",
+      "file_url",
+      "template_variables",
+      "template_artifact_s3_object_key",
+      "spreadsheet_sidecar_s3_object_key",
+      "spreadsheet_columns",
+      "spreadsheet_row_count",
+      "spreadsheet_column_stats",
+    ]
   }
 
   deletion_protection_enabled = var.enable_deletion_protection_for_dynamodb_table
@@ -92,9 +88,7 @@ resource "aws_dynamodb_table" "file_service_pagination_state" {
   point_in_time_recovery {
     enabled = var.enable_pitr
   }
-
-
   tags = {
-    Name = "file_service_pagination_state"
+    Name = "file"
   }
 }
@@ -53,6 +53,26 @@ class FileRepository:
             logger.error("Error querying files: %s", e)
             raise
 
+    def get_file_by_content_sha256(self, content_sha256: str) -> dict[str, str] | None:
+        """
+        Retrieve a file with the given content from the content hash GSI.
+
+        :param content_sha256: The hex SHA-256 digest of the file content
+        :return: The file's s3_object_key, file_url and the references to its
+            template artifact or spreadsheet sidecar, or None if not found
+        """
+        try:
+            response = self.table.query(
+                IndexName="content_sha256-gsi",
+                KeyConditionExpression=Key("content_sha256").eq(content_sha256),
+                Limit=1,
+            )
+            items = response.get("Items", [])
+            return items[0] if items else None
+        except ClientError as e:
+            logger.error("Error querying files by content hash: %s", e)
+            return None
+
     def get_file_by_id(self, file_id: str) -> dict[str, str] | None:
         """
         Retrieve a file by its ID from the DynamoDB table.
@@ -81,6 +101,23 @@ class FileRepository:
             logger.error("Error saving file: %s", e)
             return None
 
+    def save_files(self, files: list[dict[str, str]]) -> bool:
+        """
+        Save files to the DynamoDB table with a batch writer, which sends them
+        in BatchWriteItem requests of up to 25 items and retries unprocessed ones.
+
+        :param files: The file items to save
+        :return: True if every file was saved, False if an error occurred
+        """
+        try:
+            with self.table.batch_writer() as batch:
+                for file in files:
+                    batch.put_item(Item=file)
+            return True
+        except ClientError as e:
+            logger.error("Error saving files: %s", e)
+            return False
+
     def delete_file(self, file_id: str) -> None:
         """
         Delete a file by its ID from the DynamoDB table.
@@ -1,8 +1,10 @@
 import base64
+import hashlib
 import json
 import logging
 import os
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import quote, unquote
 
 import boto3
@@ -10,6 +12,8 @@ import time_util
 from botocore.exceptions import ClientError
 from file_repository import FileRepository
 from requests_toolbelt.multipart import decoder
+from spreadsheet_util import SPREADSHEET_EXTENSIONS, store_spreadsheet_sidecar
+from template_util import store_template_artifact
 
 from auth_service import AuthService
 
@@ -28,6 +32,16 @@ auth_service = AuthService()
 
 BUCKET_NAME = os.environ["BUCKET_NAME"]
 S3_BASE_URL = f"https://{BUCKET_NAME}.s3.amazonaws.com/"
+# Files uploaded to S3 at the same time
+UPLOAD_MAX_WORKERS = int(os.getenv("UPLOAD_MAX_WORKERS", "8"))
+# Metadata referencing the processed content, projected by the content hash GSI
+TEMPLATE_METADATA_KEYS = ("template_variables", "template_artifact_s3_object_key")
+SPREADSHEET_METADATA_KEYS = (
+    "spreadsheet_sidecar_s3_object_key",
+    "spreadsheet_columns",
+    "spreadsheet_row_count",
+    "spreadsheet_column_stats",
+)
 
 
 def decode_request_body(event):
@@ -41,25 +55,87 @@ def decode_request_body(event):
 
 
 def process_files(multipart_data, uploader_id):
-    """Process each file in the multipart data."""
+    """
+    Upload the files of the multipart data to S3 concurrently, then save their
+    metadata in one batch.
+
+    :param multipart_data: The decoded multipart body
+    :param uploader_id: The ID of the uploading user
+    :return: Tuple of (metadata of the stored files, failed files with a message)
+    """
+    parts = multipart_data.parts
+    if not parts:
+        return [], []
+
+    # Look up re-uploaded content before fanning out, the boto3 Table of the
+    # file repository is not safe to share between threads
+    content_sha256s = [hashlib.sha256(part.content).hexdigest() for part in parts]
+    existing_files = [
+        file_repository.get_file_by_content_sha256(content_sha256)
+        for content_sha256 in content_sha256s
+    ]
+
     files_metadata = []
-    for part in multipart_data.parts:
-        try:
-            file_metadata = process_single_file(part, uploader_id)
-            files_metadata.append(file_metadata)
-        except ClientError as e:
-            logger.error(
-                "Amazon S3 ClientError (%s): %s",
-                e.response["Error"]["Code"],
-                e.response["Error"]["Message"],
+    failed_files = []
+    with ThreadPoolExecutor(
+        max_workers=min(UPLOAD_MAX_WORKERS, len(parts))
+    ) as executor:
+        futures = [
+            executor.submit(
+                process_single_file, part, uploader_id, content_sha256, existing_file
             )
-        except Exception as e:
-            logger.error("Unknown error: %s", str(e))
-    return files_metadata
-
+            for part, content_sha256, existing_file in zip(
+                parts, content_sha256s, existing_files, strict=True
+            )
+        ]
+        # Collect in part order so the response matches the request
+        for part, future in zip(parts, futures, strict=True):
+            try:
+                files_metadata.append(future.result())
+            except ClientError as e:
+                logger.error(
+                    "Amazon S3 ClientError (%s): %s",
+                    e.response["Error"]["Code"],
+                    e.response["Error"]["Message"],
+                )
+                failed_files.append(
+                    {
+                        "file_name": safe_extract_filename(part),
+                        "message": "Failed to upload the file",
+                    }
+                )
+            except Exception as e:
+                logger.error("Unknown error: %s", str(e))
+                failed_files.append(
+                    {
+                        "file_name": safe_extract_filename(part),
+                        "message": "Failed to process the file",
+                    }
+                )
+
+    if files_metadata and not file_repository.save_files(files_metadata):
+        failed_files.extend(
+            {
+                "file_name": file_metadata["file_name"],
+                "message": "Failed to save the file metadata",
+            }
+            for file_metadata in files_metadata
+        )
+        files_metadata = []
+
+    return files_metadata, failed_files
+
+
+def process_single_file(part, uploader_id, content_sha256, existing_file):
+    """
+    Upload a single file from multipart data to S3 and build its metadata.
 
-def process_single_file(part, uploader_id):
-    """Process a single file from multipart data."""
+    :param part: The multipart part of the file
+    :param uploader_id: The ID of the uploading user
+    :param content_sha256: The hex SHA-256 digest of the file content
+    :param existing_file: A stored file with the same content, or None
+    :return: The file metadata
+    """
     file_name = extract_filename(part)
     content_type = part.headers.get(
         b"Content-Type", b"application/octet-stream"
@@ -67,33 +143,137 @@ def process_single_file(part, uploader_id):
     file_content = part.content
 
     file_id = uuid.uuid4().hex
-    unique_file_name = f"{file_id}_{file_name}"
-
-    # Upload file to S3
-    logger.info("Uploading file to S3: %s", unique_file_name)
-    s3_client.put_object(
-        Bucket=BUCKET_NAME,
-        Key=unique_file_name,
-        Body=file_content,
-        ContentType=content_type,
-    )
-    logger.info("File uploaded successfully: %s", unique_file_name)
 
-    # Generate S3 URL
-    encoded_file_name = quote(unique_file_name)
-    res_url = S3_BASE_URL + encoded_file_name
-    logger.info("Generated S3 URL: %s", res_url)
-
-    # Save metadata to DynamoDB using FileRepository
+    # Point the new file at the stored object when the same content was
+    # uploaded before, so content-keyed caches downstream stay warm
+    if existing_file:
+        s3_object_key = existing_file["s3_object_key"]
+        res_url = existing_file["file_url"]
+        logger.info("Reusing stored object for duplicate content: %s", s3_object_key)
+    else:
+        s3_object_key = f"{file_id}_{file_name}"
+
+        # Upload file to S3
+        logger.info("Uploading file to S3: %s", s3_object_key)
+        s3_client.put_object(
+            Bucket=BUCKET_NAME,
+            Key=s3_object_key,
+            Body=file_content,
+            ContentType=content_type,
+        )
+        logger.info("File uploaded successfully: %s", s3_object_key)
+
+        # Generate S3 URL
+        encoded_file_name = quote(s3_object_key)
+        res_url = S3_BASE_URL + encoded_file_name
+        logger.info("Generated S3 URL: %s", res_url)
+
+    # The metadata is saved for all files at once by process_files
     file_size = len(file_content)
     file_metadata = create_file_metadata_dict(
-        file_id, unique_file_name, res_url, file_name, file_size, uploader_id
+        file_id,
+        s3_object_key,
+        res_url,
+        file_name,
+        file_size,
+        uploader_id,
+        content_sha256,
     )
-    file_repository.save_file(file_metadata)
-
+    # The artifact and sidecar of stored content are keyed by its object and
+    # can be shared; they are only built when the content is new to them
+    if not (existing_file and copy_derived_metadata(file_metadata, existing_file)):
+        add_template_artifact(file_metadata, file_content)
+        add_spreadsheet_sidecar(file_metadata, file_content)
     return file_metadata
 
 
+def copy_derived_metadata(file_metadata, existing_file):
+    """
+    Reference the template artifact or spreadsheet sidecar of a stored file
+    with the same content from the file metadata.
+
+    :param file_metadata: The file metadata, updated in place
+    :param existing_file: The stored file, as projected by the content hash GSI
+    :return: Whether the file needs no artifact or sidecar of its own
+    """
+    file_extension = file_metadata["file_extension"].lower()
+    if file_extension == "html":
+        derived_keys = TEMPLATE_METADATA_KEYS
+    elif file_extension in SPREADSHEET_EXTENSIONS:
+        derived_keys = SPREADSHEET_METADATA_KEYS
+    else:
+        return True
+
+    if any(key not in existing_file for key in derived_keys):
+        return False
+    file_metadata.update({key: existing_file[key] for key in derived_keys})
+    return True
+
+
+def add_spreadsheet_sidecar(file_metadata, file_content):
+    """
+    Store the columnar sidecar of an uploaded spreadsheet and reference it from
+    the file metadata. A sheet that cannot be parsed is still stored, readers
+    then fail on it the same way they did before sidecars.
+
+    :param file_metadata: The file metadata, updated in place
+    :param file_content: The uploaded file content
+    """
+    file_extension = file_metadata["file_extension"].lower()
+    if file_extension not in SPREADSHEET_EXTENSIONS:
+        return
+    try:
+        file_metadata.update(
+            store_spreadsheet_sidecar(
+                s3_client,
+                BUCKET_NAME,
+                file_metadata["s3_object_key"],
+                file_content,
+                file_extension,
+            )
+        )
+    except Exception as e:
+        logger.warning(
+            "Failed to store the spreadsheet sidecar of %s: %s",
+            file_metadata["s3_object_key"],
+            e,
+        )
+
+
+def add_template_artifact(file_metadata, file_content):
+    """
+    Compile an uploaded HTML template once, so readers of its variables and
+    send_email do not parse the HTML again, and reference the artifact from
+    the file metadata.
+
+    :param file_metadata: The file metadata, updated in place
+    :param file_content: The uploaded file content
+    """
+    if file_metadata["file_extension"].lower() != "html":
+        return
+    try:
+        html_content = file_content.decode("utf-8")
+    except UnicodeDecodeError:
+        logger.warning(
+            "Template is not UTF-8, skipping its artifact: %s",
+            file_metadata["s3_object_key"],
+        )
+        return
+    file_metadata.update(
+        store_template_artifact(
+            s3_client, BUCKET_NAME, file_metadata["s3_object_key"], html_content
+        )
+    )
+
+
+def safe_extract_filename(part):
+    """Extract the filename for error reporting, None if the part has none."""
+    try:
+        return extract_filename(part)
+    except (KeyError, IndexError):
+        return None
+
+
 def extract_filename(part):
     """Extract filename from Content-Disposition header."""
     disposition = part.headers[b"Content-Disposition"].decode()
@@ -105,7 +285,13 @@ def extract_filename(part):
 
 
 def create_file_metadata_dict(
-    file_id, unique_file_name, res_url, file_name, file_size, uploader_id
+    file_id,
+    unique_file_name,
+    res_url,
+    file_name,
+    file_size,
+    uploader_id,
+    content_sha256,
 ):
     """Create a dictionary with file metadata."""
     formatted_now = time_util.get_current_utc_time()
@@ -125,6 +311,7 @@ def create_file_metadata_dict(
         "file_extension": file_name.split(".")[-1],
         "file_size": file_size,
         "uploader_id": uploader_id,  # Use actual uploader ID
+        "content_sha256": content_sha256,
     }
 
 
@@ -164,10 +351,10 @@ def lambda_handler(event, context):
     body = decode_request_body(event)
 
     multipart_data = decoder.MultipartDecoder(body, content_type)
-    files_metadata = process_files(multipart_data, uploader_id)
+    files_metadata, failed_files = process_files(multipart_data, uploader_id)
 
     return {
         "statusCode": 200,
-        "body": json.dumps({"files": files_metadata}),
+        "body": json.dumps({"files": files_metadata, "failed_files": failed_files}),
         "headers": {"Content-Type": "application/json"},
     }
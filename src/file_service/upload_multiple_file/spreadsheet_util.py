@@ -0,0 +1,91 @@
+import io
+import logging
+from typing import Any
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+SPREADSHEET_EXTENSIONS = ("xlsx", "csv")
+SPREADSHEET_SIDECAR_SUFFIX = ".parquet"
+
+
+def read_spreadsheet(file_content: bytes, file_extension: str) -> pd.DataFrame:
+    """
+    Parse an uploaded spreadsheet the way the email service reads it.
+
+    :param file_content: The uploaded file content
+    :param file_extension: 'xlsx' or 'csv'
+    :return: The sheet as a DataFrame
+    """
+    if file_extension == "csv":
+        return pd.read_csv(io.BytesIO(file_content))
+    return pd.read_excel(io.BytesIO(file_content), engine="openpyxl")
+
+
+def normalize_columns(data_frame: pd.DataFrame) -> pd.DataFrame:
+    """
+    Give every column a single Parquet type. Columns mixing values of several
+    types, e.g. numbers and text, have their values stored as text, which is
+    how send_email renders every value anyway.
+
+    :param data_frame: The parsed sheet
+    :return: The normalized sheet
+    """
+    data_frame.columns = [str(column) for column in data_frame.columns]
+    for column in data_frame.columns:
+        series = data_frame[column]
+        if series.dtype == object:
+            value_types = {type(value) for value in series.dropna()}
+            if len(value_types) > 1:
+                data_frame[column] = series.where(series.isna(), series.astype(str))
+    return data_frame
+
+
+def get_column_stats(data_frame: pd.DataFrame) -> list[dict[str, Any]]:
+    """Return the dtype, null count and distinct count of every column."""
+    return [
+        {
+            "name": column,
+            "dtype": str(data_frame[column].dtype),
+            "null_count": int(data_frame[column].isna().sum()),
+            "distinct_count": int(data_frame[column].nunique()),
+        }
+        for column in data_frame.columns
+    ]
+
+
+def store_spreadsheet_sidecar(
+    s3_client, bucket_name, s3_object_key, file_content, file_extension
+):
+    """
+    Parse an uploaded spreadsheet once and store it next to the upload as a
+    Parquet sidecar, so the email service reads columns instead of Excel XML.
+
+    :param s3_client: The S3 client
+    :param bucket_name: The bucket of the spreadsheet
+    :param s3_object_key: The S3 object key of the spreadsheet
+    :param file_content: The uploaded file content
+    :param file_extension: 'xlsx' or 'csv'
+    :return: Dict of the file item attributes describing the sidecar
+    """
+    data_frame = normalize_columns(read_spreadsheet(file_content, file_extension))
+
+    buffer = io.BytesIO()
+    data_frame.to_parquet(buffer, engine="pyarrow", index=False)
+    sidecar_s3_object_key = s3_object_key + SPREADSHEET_SIDECAR_SUFFIX
+    s3_client.put_object(
+        Bucket=bucket_name,
+        Key=sidecar_s3_object_key,
+        Body=buffer.getvalue(),
+        ContentType="application/vnd.apache.parquet",
+    )
+    logger.info("Stored spreadsheet sidecar: %s", sidecar_s3_object_key)
+
+    return {
+        "spreadsheet_sidecar_s3_object_key": sidecar_s3_object_key,
+        "spreadsheet_columns": list(data_frame.columns),
+        "spreadsheet_row_count": len(data_frame),
+        "spreadsheet_column_stats": get_column_stats(data_frame),
+    }
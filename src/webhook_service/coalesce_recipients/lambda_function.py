@@ -0,0 +1,117 @@
+"""
+This lambda function coalesces the webhook recipients queued by
+process_webhook. The recipients of a batch that share a run and email
+settings are sent as one DIRECT message, so that a burst of submissions
+costs one pass through the email pipeline per batch instead of one per
+respondent.
+"""
+
+import json
+import logging
+from typing import Any
+
+from config import Config
+from sqs import get_sqs_message
+
+from email_service import EmailService
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+email_service = EmailService()
+
+
+def group_email_bodies(records: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """
+    Group single recipient email bodies that only differ in their recipients.
+    A webhook edited within the batching window therefore yields two groups.
+
+    :param records: The SQS message records
+    :return: Groups of {"email_body", "message_ids"}, each email body carrying
+        at most WEBHOOK_COALESCE_MAX_RECIPIENTS recipients
+    """
+    groups: dict[str, list[dict[str, Any]]] = {}
+    for record in records:
+        email_body = get_sqs_message(record)
+        group_key = json.dumps(
+            {key: value for key, value in email_body.items() if key != "recipients"},
+            sort_keys=True,
+            default=str,
+        )
+        chunks = groups.setdefault(group_key, [])
+        if (
+            not chunks
+            or len(chunks[-1]["email_body"]["recipients"])
+            >= Config.WEBHOOK_COALESCE_MAX_RECIPIENTS
+        ):
+            chunks.append(
+                {"email_body": {**email_body, "recipients": []}, "message_ids": []}
+            )
+        chunks[-1]["email_body"]["recipients"].extend(email_body["recipients"])
+        chunks[-1]["message_ids"].append(record["messageId"])
+
+    return [chunk for chunks in groups.values() for chunk in chunks]
+
+
+def dispatch_group(email_body: dict[str, Any], message_ids: list[str]) -> list[str]:
+    """
+    Send the recipients of a group in one message. When it is rejected, the
+    recipients are sent one by one so that a single invalid submission does
+    not drop the others.
+
+    :param email_body: The email body with the coalesced recipients
+    :param message_ids: The SQS message IDs of the recipients, in order
+    :return: The message IDs to retry
+    """
+    email_status = email_service.dispatch_email(email_body)
+    logger.info(
+        "Sent %d recipients of run %s: %s",
+        len(email_body["recipients"]),
+        email_body["run_id"],
+        email_status,
+    )
+
+    status_code = email_status.get("statusCode", 500)
+    if status_code == 202:
+        return []
+    if not 400 <= status_code < 500:
+        return message_ids
+    if len(message_ids) == 1:
+        logger.error(
+            "Email of run %s rejected, dropping the recipient: %s",
+            email_body["run_id"],
+            email_status.get("body"),
+        )
+        return []
+
+    failed_message_ids = []
+    for recipient, message_id in zip(
+        email_body["recipients"], message_ids, strict=True
+    ):
+        failed_message_ids.extend(
+            dispatch_group({**email_body, "recipients": [recipient]}, [message_id])
+        )
+    return failed_message_ids
+
+
+def lambda_handler(event: dict[str, Any], context: Any) -> dict[str, Any]:  # pylint: disable=unused-argument
+    """Lambda function handler to coalesce the queued webhook recipients"""
+    if event.get("action") == "PREWARM":
+        logger.info("Received a prewarm request. Skipping business logic.")
+        return {"statusCode": 200, "body": "Successfully warmed up"}
+
+    batch_item_failures = []
+
+    for group in group_email_bodies(event["Records"]):
+        try:
+            failed_message_ids = dispatch_group(
+                group["email_body"], group["message_ids"]
+            )
+        except Exception as e:
+            logger.error("Error sending coalesced recipients: %s", e)
+            failed_message_ids = group["message_ids"]
+        batch_item_failures.extend(
+            {"itemIdentifier": message_id} for message_id in failed_message_ids
+        )
+
+    return {"batchItemFailures": batch_item_failures}
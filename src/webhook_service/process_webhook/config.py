@@ -0,0 +1,15 @@
+import os
+
+
+class Config:
+    DYNAMODB_TABLE = os.getenv("DYNAMODB_TABLE")
+    ENVIRONMENT = os.getenv("ENVIRONMENT")
+    SEND_EMAIL_API_ENDPOINT = os.getenv("SEND_EMAIL_API_ENDPOINT")
+    SERVICE_ACCOUNTS = ["surveycake"]
+    # "sqs" (default) enqueues straight onto the auto-resumer queue, "api"
+    # posts to the send-email API, "coalesce" queues the recipient for
+    # coalesce_recipients
+    WEBHOOK_DELIVERY_MODE = os.getenv("WEBHOOK_DELIVERY_MODE", "sqs")
+    AUTO_RESUMER_SQS_QUEUE_URL = os.getenv("AUTO_RESUMER_SQS_QUEUE_URL")
+    WEBHOOK_RECIPIENT_SQS_QUEUE_URL = os.getenv("WEBHOOK_RECIPIENT_SQS_QUEUE_URL")
+    FILE_DYNAMODB_TABLE = os.getenv("FILE_DYNAMODB_TABLE", "file")
@@ -0,0 +1,92 @@
+"""
+This lambda function processes the SurveyCake submissions queued by
+trigger_webhook: it fetches and decrypts each submission, extracts the
+recipient email and sends the webhook's email.
+"""
+
+import json
+import logging
+from typing import Any
+
+from sqs import get_sqs_message
+from webhook_handler import WebhookHandler
+from webhook_repository import WebhookRepository
+
+from email_service import EmailService
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+webhook_handler = WebhookHandler()
+webhook_repository = WebhookRepository()
+email_service = EmailService()
+
+
+def process_record(record: dict[str, Any]) -> None:
+    """
+    Process one queued submission. Failures that retrying cannot fix are
+    logged and dropped, the others are raised so that SQS redelivers the
+    message and finally moves it to the dead letter queue.
+
+    :param record: The SQS message record
+    """
+    submission = get_sqs_message(record)
+    webhook_id = submission["webhook_id"]
+
+    webhook_details = webhook_repository.get_webhook_details(webhook_id)
+    if not webhook_details:
+        logger.error("Webhook %s not found, dropping the submission", webhook_id)
+        return
+
+    encrypted_data = webhook_handler.get_surveycake_data(
+        submission["svid"], submission["hash"]
+    )
+    decrypted_str, webhook_details = webhook_handler.decrypt_surveycake_data(
+        webhook_repository, webhook_id, webhook_details, encrypted_data
+    )
+
+    answer_data = json.loads(decrypted_str)
+    recipient_email = webhook_handler.extract_recipient_email(answer_data)
+    logger.info("Recipient email extracted from surveycake: %s", recipient_email)
+    if not recipient_email:
+        logger.error(
+            "No email found in the surveycake data of webhook %s, dropping the submission",
+            webhook_id,
+        )
+        return
+
+    email_body = email_service.prepare_email_body(webhook_details, recipient_email)
+    email_status = email_service.dispatch_email(email_body)
+    logger.info("Email status: %s", email_status)
+
+    status_code = email_status.get("statusCode", 500)
+    if status_code == 202:
+        return
+    if 400 <= status_code < 500:
+        logger.error(
+            "Email of webhook %s rejected, dropping the submission: %s",
+            webhook_id,
+            email_status.get("body"),
+        )
+        return
+    raise RuntimeError(
+        f"Failed to send email for run {email_body['run_id']}: {email_status.get('body')}"
+    )
+
+
+def lambda_handler(event: dict[str, Any], context: Any) -> dict[str, Any]:  # pylint: disable=unused-argument
+    """Lambda function handler to process the queued webhook submissions"""
+    if event.get("action") == "PREWARM":
+        logger.info("Received a prewarm request. Skipping business logic.")
+        return {"statusCode": 200, "body": "Successfully warmed up"}
+
+    batch_item_failures = []
+
+    for record in event["Records"]:
+        try:
+            process_record(record)
+        except Exception as e:
+            logger.error("Error processing record: %s", e)
+            batch_item_failures.append({"itemIdentifier": record["messageId"]})
+
+    return {"batchItemFailures": batch_item_failures}
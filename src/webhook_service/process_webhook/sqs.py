@@ -0,0 +1,65 @@
+import json
+import logging
+from decimal import Decimal
+
+import boto3
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+# Initialize SQS client
+sqs_client = boto3.client("sqs")
+
+
+def decimal_default(obj):
+    if isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError(f"Object of type {obj.__class__.__name__} is not JSON serializable")
+
+
+def get_sqs_message(record: dict) -> dict:
+    """
+    Parse an SQS message from the record.
+
+    :param record: The SQS message record
+    :return: The parsed message body
+    """
+    return json.loads(record["body"])
+
+
+def send_message_to_queue(
+    queue_url: str,
+    message: dict,
+    message_group_id: str | None = None,
+    message_deduplication_id: str | None = None,
+) -> dict:
+    """
+    Send a message to an SQS queue.
+
+    :param queue_url: The URL of the queue to send to
+    :param message: The message to send
+    :param message_group_id: The message group ID, for FIFO queues
+    :param message_deduplication_id: The deduplication ID, for FIFO queues
+    :return: The response from SQS
+    """
+    fifo_params = {}
+    if message_group_id:
+        fifo_params["MessageGroupId"] = message_group_id
+    if message_deduplication_id:
+        fifo_params["MessageDeduplicationId"] = message_deduplication_id
+
+    try:
+        response = sqs_client.send_message(
+            QueueUrl=queue_url,
+            MessageBody=json.dumps(message, default=decimal_default),
+            **fifo_params,
+        )
+        logger.info(
+            "Successfully sent message to queue: %s, MessageId: %s",
+            queue_url,
+            response["MessageId"],
+        )
+        return response
+    except Exception as e:
+        logger.error("Failed to send message to queue %s: %s", queue_url, str(e))
+        raise
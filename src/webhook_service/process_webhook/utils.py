@@ -0,0 +1,100 @@
+"""
+This module contains utility functions that are used by the trigger_webhook module.
+"""
+
+import json
+import logging
+import os
+import time
+from decimal import Decimal
+
+import boto3
+import jwt
+from config import Config
+from Crypto.Cipher import AES
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+# Cached access tokens are read again this long before their exp claim
+ACCESS_TOKEN_REFRESH_MARGIN_SECONDS = int(
+    os.getenv("ACCESS_TOKEN_REFRESH_MARGIN_SECONDS", "300")
+)
+# Cache lifetime of a token without an exp claim
+ACCESS_TOKEN_DEFAULT_TTL_SECONDS = 300
+
+
+class DecimalEncoder(json.JSONEncoder):
+    """Custom JSON encoder to handle Decimal types"""
+
+    def default(self, o):
+        if isinstance(o, Decimal):
+            return float(o)
+        return super().default(o)
+
+
+class SecretsManager:
+    """Class to handle the Secrets Manager operations"""
+
+    def __init__(self):
+        self.client = boto3.client("secretsmanager")
+        # service_account -> (refresh_at, access_token)
+        self._access_tokens: dict[str, tuple[float, str]] = {}
+
+    def get_secret_path(self, service_account: str, secret_type: str) -> str:
+        """Get the secret path based on the service account and secret type"""
+        return f"aws-educate-tpet/{Config.ENVIRONMENT}/service-accounts/{service_account}/{secret_type}"
+
+    def get_access_token(self, service_account: str) -> str:
+        """
+        Get the access token from the Secrets Manager, cached until shortly
+        before its exp claim
+        """
+        cached = self._access_tokens.get(service_account)
+        if cached is not None and time.time() < cached[0]:
+            return cached[1]
+
+        try:
+            response = self.client.get_secret_value(
+                SecretId=self.get_secret_path(service_account, "access-token")
+            )
+            access_token = json.loads(response["SecretString"])["access_token"]
+        except Exception as e:
+            print(f"Failed to retrieve access token: {str(e)}")
+            raise
+
+        self._access_tokens[service_account] = (
+            self.get_refresh_at(access_token),
+            access_token,
+        )
+        return access_token
+
+    def get_refresh_at(self, access_token: str) -> float:
+        """Get the time at which a cached access token should be read again"""
+        try:
+            claims = jwt.decode(access_token, options={"verify_signature": False})
+        except jwt.PyJWTError as e:
+            logger.warning("Failed to decode access token: %s", str(e))
+            claims = {}
+
+        expires_at = claims.get("exp")
+        if expires_at is None:
+            return time.time() + ACCESS_TOKEN_DEFAULT_TTL_SECONDS
+        return float(expires_at) - ACCESS_TOKEN_REFRESH_MARGIN_SECONDS
+
+
+class CryptoHandler:
+    """Class to handle encryption and decryption operations"""
+
+    @staticmethod
+    def decrypt_data(encrypted_data: bytes, hash_key: str, iv_key: str) -> str:
+        """Decrypt the data using AES encryption"""
+        cipher = AES.new(hash_key.encode("utf-8"), AES.MODE_CBC, iv_key.encode("utf-8"))
+        decrypted_data = cipher.decrypt(encrypted_data).rstrip(b"\0")
+        decrypted_str = decrypted_data.decode("utf-8")
+
+        last_brace_index = decrypted_str.rfind("}")
+        if last_brace_index == -1:
+            raise ValueError("Invalid JSON data")
+
+        return decrypted_str[: last_brace_index + 1]
@@ -11,19 +11,21 @@ resource "random_string" "this" {
 }
 
 locals {
-  source_path                                     = "${path.module}/.."
-  health_check_function_name_and_ecr_repo_name    = "${var.environment}-${var.service_underscore}-health_check-${random_string.this.result}"
-  get_webhook_function_name_and_ecr_repo_name     = "${var.environment}-${var.service_underscore}-get_webhook-${random_string.this.result}"
-  update_webhook_function_name_and_ecr_repo_name  = "${var.environment}-${var.service_underscore}-update_webhook-${random_string.this.result}"
-  list_webhooks_function_name_and_ecr_repo_name   = "${var.environment}-${var.service_underscore}-list_webhooks-${random_string.this.result}"
-  save_webhook_function_name_and_ecr_repo_name    = "${var.environment}-${var.service_underscore}-save_webhook-${random_string.this.result}"
-  trigger_webhook_function_name_and_ecr_repo_name = "${var.environment}-${var.service_underscore}-trigger_webhook-${random_string.this.result}"
-  path_include                                    = ["**"]
-  path_exclude                                    = ["**/__pycache__/**"]
-  files_include                                   = setunion([for f in local.path_include : fileset(local.source_path, f)]...)
-  files_exclude                                   = setunion([for f in local.path_exclude : fileset(local.source_path, f)]...)
-  files                                           = sort(setsubtract(local.files_include, local.files_exclude))
-  dir_sha                                         = sha1(join("", [for f in local.files : filesha1("${local.source_path}/${f}")]))
+  source_path                                         = "${path.module}/.."
+  health_check_function_name_and_ecr_repo_name        = "${var.environment}-${var.service_underscore}-health_check-${random_string.this.result}"
+  get_webhook_function_name_and_ecr_repo_name         = "${var.environment}-${var.service_underscore}-get_webhook-${random_string.this.result}"
+  update_webhook_function_name_and_ecr_repo_name      = "${var.environment}-${var.service_underscore}-update_webhook-${random_string.this.result}"
+  list_webhooks_function_name_and_ecr_repo_name       = "${var.environment}-${var.service_underscore}-list_webhooks-${random_string.this.result}"
+  save_webhook_function_name_and_ecr_repo_name        = "${var.environment}-${var.service_underscore}-save_webhook-${random_string.this.result}"
+  trigger_webhook_function_name_and_ecr_repo_name     = "${var.environment}-${var.service_underscore}-trigger_webhook-${random_string.this.result}"
+  process_webhook_function_name_and_ecr_repo_name     = "${var.environment}-${var.service_underscore}-process_webhook-${random_string.this.result}"
+  coalesce_recipients_function_name_and_ecr_repo_name = "${var.environment}-${var.service_underscore}-coalesce_recipients-${random_string.this.result}"
+  path_include                                        = ["**"]
+  path_exclude                                        = ["**/__pycache__/**"]
+  files_include                                       = setunion([for f in local.path_include : fileset(local.source_path, f)]...)
+  files_exclude                                       = setunion([for f in local.path_exclude : fileset(local.source_path, f)]...)
+  files                                               = sort(setsubtract(local.files_include, local.files_exclude))
+  dir_sha                                             = sha1(join("", [for f in local.files : filesha1("${local.source_path}/${f}")]))
 }
 
 provider "docker" {
@@ -569,10 +571,15 @@ module "trigger_webhook_lambda" {
   publish = true # Whether to publish creation/change as new Lambda Function Version.
 
   environment_variables = {
-    "ENVIRONMENT"             = var.environment,
-    "SERVICE"                 = var.service_underscore,
-    "DYNAMODB_TABLE"          = var.dynamodb_table
-    "SEND_EMAIL_API_ENDPOINT" = local.api_endpoints.send_email
+    "ENVIRONMENT"                  = var.environment,
+    "SERVICE"                      = var.service_underscore,
+    "DYNAMODB_TABLE"               = var.dynamodb_table
+    "SEND_EMAIL_API_ENDPOINT"      = local.api_endpoints.send_email
+    "WEBHOOK_DELIVERY_MODE"        = "sqs"
+    "AUTO_RESUMER_SQS_QUEUE_URL"   = "https://sqs.${var.aws_region}.amazonaws.com/${data.aws_caller_identity.this.account_id}/${local.auto_resumer_sqs_queue_name}"
+    "FILE_DYNAMODB_TABLE"          = local.file_dynamodb_table
+    "WEBHOOK_INTAKE_MODE"          = "async"
+    "WEBHOOK_INTAKE_SQS_QUEUE_URL" = module.webhook_intake_sqs.queue_url
   }
 
   allowed_triggers = {
@@ -619,6 +626,25 @@ module "trigger_webhook_lambda" {
         "arn:aws:dynamodb:${var.aws_region}:${data.aws_caller_identity.this.account_id}:table/${var.dynamodb_table}"
       ]
     },
+    file_dynamodb_read = {
+      effect = "Allow",
+      actions = [
+        "dynamodb:GetItem",
+      ],
+      resources = [
+        "arn:aws:dynamodb:${var.aws_region}:${data.aws_caller_identity.this.account_id}:table/${local.file_dynamodb_table}"
+      ]
+    },
+    sqs_send_message = {
+      effect = "Allow",
+      actions = [
+        "sqs:SendMessage",
+      ],
+      resources = [
+        "arn:aws:sqs:${var.aws_region}:${data.aws_caller_identity.this.account_id}:${local.auto_resumer_sqs_queue_name}",
+        module.webhook_intake_sqs.queue_arn
+      ]
+    },
   }
 
 }
@@ -654,3 +680,303 @@ module "trigger_webhook_docker_image" {
     dir_sha = local.dir_sha
   }
 }
+
+####################################
+####################################
+####################################
+# SQS webhook-intake-sqs #########
+####################################
+####################################
+####################################
+
+module "process_webhook_lambda" {
+  source  = "terraform-aws-modules/lambda/aws"
+  version = "7.7.0"
+
+  function_name = local.process_webhook_function_name_and_ecr_repo_name
+  description   = "AWS Educate TPET ${var.service_hyphen} in ${var.environment}: SQS webhook-intake-sqs (fetch & decrypt SurveyCake submissions, send email)"
+  event_source_mapping = {
+    sqs = {
+      event_source_arn        = module.webhook_intake_sqs.queue_arn
+      function_response_types = ["ReportBatchItemFailures"] # Setting to ["ReportBatchItemFailures"] means that when the Lambda function processes a batch of SQS messages, it can report which messages failed to process.
+      batch_size              = 10
+      scaling_config = {
+        # The `maximum_concurrency` parameter limits the number of concurrent Lambda instances that can process messages from the SQS queue.
+        maximum_concurrency = 10
+      }
+    }
+  }
+  create_package = false
+  timeout        = 300 # Up to 10 submissions, each with a 20 second SurveyCake request
+
+  ##################
+  # Container Image
+  ##################
+  package_type  = "Image"
+  architectures = [var.lambda_architecture]
+  image_uri     = module.process_webhook_docker_image.image_uri
+
+  publish = true # Whether to publish creation/change as new Lambda Function Version.
+
+  environment_variables = {
+    "ENVIRONMENT"                     = var.environment,
+    "SERVICE"                         = var.service_underscore,
+    "DYNAMODB_TABLE"                  = var.dynamodb_table
+    "SEND_EMAIL_API_ENDPOINT"         = local.api_endpoints.send_email
+    "WEBHOOK_DELIVERY_MODE"           = "coalesce"
+    "AUTO_RESUMER_SQS_QUEUE_URL"      = "https://sqs.${var.aws_region}.amazonaws.com/${data.aws_caller_identity.this.account_id}/${local.auto_resumer_sqs_queue_name}"
+    "FILE_DYNAMODB_TABLE"             = local.file_dynamodb_table
+    "WEBHOOK_RECIPIENT_SQS_QUEUE_URL" = module.webhook_recipient_sqs.queue_url
+  }
+
+  allowed_triggers = {
+    allow_execution_from_sqs = {
+      principal  = "sqs.amazonaws.com"
+      source_arn = module.webhook_intake_sqs.queue_arn
+    }
+  }
+
+  tags = {
+    "Terraform"   = "true",
+    "Environment" = var.environment,
+    "Service"     = var.service_underscore
+    "Prewarm"     = "true"
+  }
+  ######################
+  # Additional policies
+  ######################
+
+  attach_policy_statements = true
+  policy_statements = {
+    secrets_manager = {
+      effect = "Allow",
+      actions = [
+        "secretsmanager:GetSecretValue",
+      ],
+      resources = [
+        "arn:aws:secretsmanager:${var.aws_region}:${data.aws_caller_identity.this.account_id}:secret:aws-educate-tpet/${var.environment}/service-accounts/*/access-token-*"
+      ]
+    },
+    dynamodb_crud = {
+      effect = "Allow",
+      actions = [
+        "dynamodb:BatchGetItem",
+        "dynamodb:BatchWriteItem",
+        "dynamodb:DeleteItem",
+        "dynamodb:GetItem",
+        "dynamodb:PutItem",
+        "dynamodb:Query",
+        "dynamodb:Scan",
+        "dynamodb:UpdateItem"
+      ],
+      resources = [
+        "arn:aws:dynamodb:${var.aws_region}:${data.aws_caller_identity.this.account_id}:table/${var.dynamodb_table}"
+      ]
+    },
+    file_dynamodb_read = {
+      effect = "Allow",
+      actions = [
+        "dynamodb:GetItem",
+      ],
+      resources = [
+        "arn:aws:dynamodb:${var.aws_region}:${data.aws_caller_identity.this.account_id}:table/${local.file_dynamodb_table}"
+      ]
+    },
+    sqs_receive_message = {
+      effect = "Allow",
+      actions = [
+        "sqs:ReceiveMessage",
+        "sqs:DeleteMessage",
+        "sqs:GetQueueAttributes"
+      ],
+      resources = [
+        module.webhook_intake_sqs.queue_arn
+      ]
+    },
+    sqs_send_message = {
+      effect = "Allow",
+      actions = [
+        "sqs:SendMessage",
+      ],
+      resources = [
+        "arn:aws:sqs:${var.aws_region}:${data.aws_caller_identity.this.account_id}:${local.auto_resumer_sqs_queue_name}",
+        module.webhook_recipient_sqs.queue_arn
+      ]
+    },
+  }
+
+}
+
+module "process_webhook_docker_image" {
+  source  = "terraform-aws-modules/lambda/aws//modules/docker-build"
+  version = "7.7.0"
+
+  create_ecr_repo      = true
+  keep_remotely        = true
+  use_image_tag        = false
+  image_tag_mutability = "MUTABLE"
+  ecr_repo             = local.process_webhook_function_name_and_ecr_repo_name
+  ecr_repo_lifecycle_policy = jsonencode({
+    "rules" : [
+      {
+        "rulePriority" : 1,
+        "description" : "Keep only the last 10 images",
+        "selection" : {
+          "tagStatus" : "any",
+          "countType" : "imageCountMoreThan",
+          "countNumber" : 10
+        },
+        "action" : {
+          "type" : "expire"
+        }
+      }
+    ]
+  })
+
+  source_path = "${local.source_path}/process_webhook/"
+  triggers = {
+    dir_sha = local.dir_sha
+  }
+}
+
+####################################
+####################################
+####################################
+# SQS webhook-recipient-sqs ######
+####################################
+####################################
+####################################
+
+module "coalesce_recipients_lambda" {
+  source  = "terraform-aws-modules/lambda/aws"
+  version = "7.7.0"
+
+  function_name = local.coalesce_recipients_function_name_and_ecr_repo_name
+  description   = "AWS Educate TPET ${var.service_hyphen} in ${var.environment}: SQS webhook-recipient-sqs (coalesce webhook recipients per run, send email)"
+  event_source_mapping = {
+    sqs = {
+      event_source_arn        = module.webhook_recipient_sqs.queue_arn
+      function_response_types = ["ReportBatchItemFailures"] # Setting to ["ReportBatchItemFailures"] means that when the Lambda function processes a batch of SQS messages, it can report which messages failed to process.
+      # Recipients arriving within the window are sent together, see WEBHOOK_COALESCE_MAX_RECIPIENTS
+      batch_size                         = 100
+      maximum_batching_window_in_seconds = 5
+      scaling_config = {
+        # The `maximum_concurrency` parameter limits the number of concurrent Lambda instances that can process messages from the SQS queue.
+        maximum_concurrency = 10
+      }
+    }
+  }
+  create_package = false
+  timeout        = 60
+
+  ##################
+  # Container Image
+  ##################
+  package_type  = "Image"
+  architectures = [var.lambda_architecture]
+  image_uri     = module.coalesce_recipients_docker_image.image_uri
+
+  publish = true # Whether to publish creation/change as new Lambda Function Version.
+
+  environment_variables = {
+    "ENVIRONMENT"                     = var.environment,
+    "SERVICE"                         = var.service_underscore,
+    "SEND_EMAIL_API_ENDPOINT"         = local.api_endpoints.send_email
+    "WEBHOOK_DELIVERY_MODE"           = "sqs"
+    "AUTO_RESUMER_SQS_QUEUE_URL"      = "https://sqs.${var.aws_region}.amazonaws.com/${data.aws_caller_identity.this.account_id}/${local.auto_resumer_sqs_queue_name}"
+    "FILE_DYNAMODB_TABLE"             = local.file_dynamodb_table
+    "WEBHOOK_COALESCE_MAX_RECIPIENTS" = "50"
+  }
+
+  allowed_triggers = {
+    allow_execution_from_sqs = {
+      principal  = "sqs.amazonaws.com"
+      source_arn = module.webhook_recipient_sqs.queue_arn
+    }
+  }
+
+  tags = {
+    "Terraform"   = "true",
+    "Environment" = var.environment,
+    "Service"     = var.service_underscore
+    "Prewarm"     = "true"
+  }
+  ######################
+  # Additional policies
+  ######################
+
+  attach_policy_statements = true
+  policy_statements = {
+    secrets_manager = {
+      effect = "Allow",
+      actions = [
+        "secretsmanager:GetSecretValue",
+      ],
+      resources = [
+        "arn:aws:secretsmanager:${var.aws_region}:${data.aws_caller_identity.this.account_id}:secret:aws-educate-tpet/${var.environment}/service-accounts/*/access-token-*"
+      ]
+    },
+    file_dynamodb_read = {
+      effect = "Allow",
+      actions = [
+        "dynamodb:GetItem",
+      ],
+      resources = [
+        "arn:aws:dynamodb:${var.aws_region}:${data.aws_caller_identity.this.account_id}:table/${local.file_dynamodb_table}"
+      ]
+    },
+    sqs_receive_message = {
+      effect = "Allow",
+      actions = [
+        "sqs:ReceiveMessage",
+        "sqs:DeleteMessage",
+        "sqs:GetQueueAttributes"
+      ],
+      resources = [
+        module.webhook_recipient_sqs.queue_arn
+      ]
+    },
+    sqs_send_message = {
+      effect = "Allow",
+      actions = [
+        "sqs:SendMessage",
+      ],
+      resources = [
+        "arn:aws:sqs:${var.aws_region}:${data.aws_caller_identity.this.account_id}:${local.auto_resumer_sqs_queue_name}"
+      ]
+    },
+  }
+
+}
+
+module "coalesce_recipients_docker_image" {
+  source  = "terraform-aws-modules/lambda/aws//modules/docker-build"
+  version = "7.7.0"
+
+  create_ecr_repo      = true
+  keep_remotely        = true
+  use_image_tag        = false
+  image_tag_mutability = "MUTABLE"
+  ecr_repo             = local.coalesce_recipients_function_name_and_ecr_repo_name
+  ecr_repo_lifecycle_policy = jsonencode({
+    "rules" : [
+      {
+        "rulePriority" : 1,
+        "description" : "Keep only the last 10 images",
+        "selection" : {
+          "tagStatus" : "any",
+          "countType" : "imageCountMoreThan",
+          "countNumber" : 10
+        },
+        "action" : {
+          "type" : "expire"
+        }
+      }
+    ]
+  })
+
+  source_path = "${local.source_path}/coalesce_recipients/"
+  triggers = {
+    dir_sha = local.dir_sha
+  }
+}
@@ -23,4 +23,8 @@ locals {
     send_email      = "${local.service_endpoints.email}/${var.environment}/send-email"
     trigger_webhook = "${local.service_endpoints.webhook}/${var.environment}/trigger-webhook"
   }
+
+  # Resources of the email and file services, enqueued to and read directly
+  auto_resumer_sqs_queue_name = "${var.environment}-auto-resumer-sqs"
+  file_dynamodb_table         = "file"
 }
@@ -0,0 +1,32 @@
+# SurveyCake submissions accepted by trigger_webhook, processed by process_webhook
+module "webhook_intake_sqs" {
+  source  = "terraform-aws-modules/sqs/aws"
+  version = "4.2.0"
+
+  name                       = "${var.environment}-webhook-intake-sqs"
+  fifo_queue                 = true
+  visibility_timeout_seconds = 360 # Second, make sure it is larger than the Lambda timeout
+
+  # Dead letter queue
+  create_dlq = true
+  redrive_policy = {
+    # Retry SurveyCake and email failures before moving the message to the DLQ
+    maxReceiveCount = 3
+  }
+}
+
+
+# Single recipient emails from process_webhook, coalesced per run by coalesce_recipients
+module "webhook_recipient_sqs" {
+  source  = "terraform-aws-modules/sqs/aws"
+  version = "4.2.0"
+
+  name                       = "${var.environment}-webhook-recipient-sqs"
+  visibility_timeout_seconds = 360 # Second, make sure it is larger than the Lambda timeout plus the batching window
+
+  # Dead letter queue
+  create_dlq = true
+  redrive_policy = {
+    maxReceiveCount = 3
+  }
+}
@@ -1,9 +1,13 @@
 import json
 import logging
+import re
 from typing import Any
 
+import boto3
+import jwt
 import requests
 from config import Config
+from sqs import send_message_to_queue
 from utils import SecretsManager
 
 # Initialize logger
@@ -12,6 +16,8 @@ logger.setLevel(logging.INFO)
 
 RECIPIENT_SOURCE = "DIRECT"
 RUN_TYPE = "WEBHOOK"
+EMAIL_PATTERN = r"[^@]+@[^@]+\.[^@]+"
+CERTIFICATE_FIELDS = ["Name", "Certificate Text"]
 
 
 class EmailService:
@@ -19,6 +25,7 @@ class EmailService:
 
     def __init__(self):
         self.secrets_manager = SecretsManager()
+        self.file_table = boto3.resource("dynamodb").Table(Config.FILE_DYNAMODB_TABLE)
 
     def prepare_email_body(
         self, webhook_details: dict[str, Any], recipient_email: str
@@ -68,3 +75,159 @@ class EmailService:
         except Exception as e:
             logger.error("Failed to send email: %s", str(e))
             return {"statusCode": 500, "body": json.dumps({"error": str(e)})}
+
+    def get_template_variables(self, template_file_id: str) -> list[str] | None:
+        """
+        Get the variables recorded for a template when it was uploaded.
+
+        :param template_file_id: The file ID of the template
+        :return: The template variables, None if the template was uploaded
+            before variables were recorded
+        """
+        response = self.file_table.get_item(
+            Key={"file_id": template_file_id},
+            ProjectionExpression="file_id, template_variables",
+        )
+        item = response.get("Item")
+        if not item:
+            raise ValueError(f"Template file not found: {template_file_id}")
+        return item.get("template_variables")
+
+    def validate_email_body(
+        self, email_body: dict[str, Any], required_variables: list[str]
+    ) -> None:
+        """
+        Apply the checks the send email API runs on a WEBHOOK request.
+
+        :param email_body: The email body from prepare_email_body
+        :param required_variables: The variables required by the template
+        """
+        for recipient in email_body["recipients"]:
+            if not re.match(EMAIL_PATTERN, recipient["email"]):
+                raise ValueError(
+                    f"Invalid email(s) in recipients list: {[recipient['email']]}"
+                )
+            template_vars = recipient["template_variables"]
+            missing_vars = [
+                var for var in required_variables if var not in template_vars
+            ]
+            if missing_vars:
+                raise ValueError(
+                    f"Email {recipient['email']} missing required template variables: {', '.join(missing_vars)}"
+                )
+            if email_body["is_generate_certificate"]:
+                missing_fields = [
+                    field for field in CERTIFICATE_FIELDS if field not in template_vars
+                ]
+                if missing_fields:
+                    raise ValueError(
+                        f"Email {recipient['email']} missing required fields for certificate generation: {', '.join(missing_fields)}"
+                    )
+
+        for email in [*email_body["cc"], *email_body["bcc"], email_body["reply_to"]]:
+            if not re.match(EMAIL_PATTERN, email):
+                raise ValueError(f"Invalid email format: {email}")
+
+    def prepare_queue_message(
+        self, email_body: dict[str, Any], access_token: str
+    ) -> dict[str, Any]:
+        """
+        Build the auto-resumer message the send email API would enqueue.
+
+        :param email_body: The validated email body
+        :param access_token: The service account access token
+        :return: The queue message
+        """
+        # The token is read from Secrets Manager, its sub is the service account
+        sender_id = jwt.decode(access_token, options={"verify_signature": False}).get(
+            "sub"
+        )
+        if not sender_id:
+            raise ValueError("sub not found in service account access token")
+
+        return {
+            **email_body,
+            "sender_id": sender_id,
+            "access_token": access_token,
+        }
+
+    def enqueue_email(self, email_body: dict[str, Any]) -> dict[str, Any]:
+        """
+        Validate the email body and put it straight onto the auto-resumer
+        queue, skipping the send email API. Templates without recorded
+        variables still go through the API, which parses them.
+        """
+        try:
+            if not email_body["subject"]:
+                raise ValueError("Missing email subject")
+            if not email_body["template_file_id"]:
+                raise ValueError("Missing template file ID")
+
+            required_variables = self.get_template_variables(
+                email_body["template_file_id"]
+            )
+            if required_variables is None:
+                logger.info(
+                    "Template %s has no recorded variables, using the send email API",
+                    email_body["template_file_id"],
+                )
+                return self.send_email(email_body)
+
+            self.validate_email_body(email_body, required_variables)
+        except ValueError as e:
+            logger.warning("Invalid webhook email: %s", str(e))
+            return {"statusCode": 400, "body": {"message": str(e)}}
+
+        try:
+            if not Config.AUTO_RESUMER_SQS_QUEUE_URL:
+                raise ValueError(
+                    "AUTO_RESUMER_SQS_QUEUE_URL environment variable not set."
+                )
+            access_token = self.secrets_manager.get_access_token("surveycake")
+            message = self.prepare_queue_message(email_body, access_token)
+            send_message_to_queue(Config.AUTO_RESUMER_SQS_QUEUE_URL, message)
+
+            return {
+                "statusCode": 202,
+                "body": {
+                    "status": "SUCCESS",
+                    "message": "Your email request has been successfully received.",
+                    "run_id": email_body["run_id"],
+                },
+            }
+
+        except Exception as e:
+            logger.error("Failed to enqueue email: %s", str(e))
+            return {"statusCode": 500, "body": json.dumps({"error": str(e)})}
+
+    def queue_recipient(self, email_body: dict[str, Any]) -> dict[str, Any]:
+        """
+        Queue a single recipient email body for coalesce_recipients,
+        which sends the recipients of a run together.
+        """
+        try:
+            if not Config.WEBHOOK_RECIPIENT_SQS_QUEUE_URL:
+                raise ValueError(
+                    "WEBHOOK_RECIPIENT_SQS_QUEUE_URL environment variable not set."
+                )
+            send_message_to_queue(Config.WEBHOOK_RECIPIENT_SQS_QUEUE_URL, email_body)
+            return {
+                "statusCode": 202,
+                "body": {
+                    "status": "SUCCESS",
+                    "message": "Your email request has been queued.",
+                    "run_id": email_body["run_id"],
+                },
+            }
+
+        except Exception as e:
+            logger.error("Failed to queue recipient: %s", str(e))
+            return {"statusCode": 500, "body": json.dumps({"error": str(e)})}
+
+    def dispatch_email(self, email_body: dict[str, Any]) -> dict[str, Any]:
+        """Send the email through the path chosen by WEBHOOK_DELIVERY_MODE"""
+        if Config.WEBHOOK_DELIVERY_MODE == "api":
+            return self.send_email(email_body)
+        if Config.WEBHOOK_DELIVERY_MODE == "coalesce":
+            return self.queue_recipient(email_body)
+        return self.enqueue_email(email_body)
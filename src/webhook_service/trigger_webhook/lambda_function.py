@@ -3,9 +3,12 @@ This lambda function triggers a webhook by processing
 the incoming request from the surveycake webhook.
 """
 
+import hashlib
 import json
 import logging
 
+from config import Config
+from sqs import send_message_to_queue
 from webhook_handler import WebhookHandler
 from webhook_repository import WebhookRepository
 
@@ -19,6 +22,30 @@ webhook_repository = WebhookRepository()
 email_service = EmailService()
 
 
+def send_submission_to_queue(webhook_id: str, svid: str, hash_value: str) -> None:
+    """
+    Queue a SurveyCake submission for process_webhook. SurveyCake retries
+    within the FIFO deduplication window are dropped by SQS.
+
+    :param webhook_id: The webhook ID
+    :param svid: The SurveyCake survey ID
+    :param hash_value: The SurveyCake submission hash
+    """
+    if not Config.WEBHOOK_INTAKE_SQS_QUEUE_URL:
+        raise ValueError("WEBHOOK_INTAKE_SQS_QUEUE_URL environment variable not set.")
+
+    # One group per submission, so submissions are not ordered behind each other
+    submission_id = hashlib.sha256(
+        f"{webhook_id}:{svid}:{hash_value}".encode()
+    ).hexdigest()
+    send_message_to_queue(
+        Config.WEBHOOK_INTAKE_SQS_QUEUE_URL,
+        {"webhook_id": webhook_id, "svid": svid, "hash": hash_value},
+        message_group_id=submission_id,
+        message_deduplication_id=submission_id,
+    )
+
+
 def lambda_handler(event, context):  # pylint: disable=unused-argument
     """Lambda function handler to trigger the webhook"""
 
@@ -69,6 +96,20 @@ def lambda_handler(event, context):  # pylint: disable=unused-argument
             )
             logger.info("Decoded svid: %s, hash: %s", svid_value, hash_value)
 
+            if Config.WEBHOOK_INTAKE_MODE == "async":
+                # Fetching, decryption and dispatch are left to process_webhook
+                send_submission_to_queue(webhook_id, svid_value, hash_value)
+                return {
+                    "statusCode": 202,
+                    "body": json.dumps(
+                        {
+                            "status": "success",
+                            "message": "Webhook submission is queued for processing",
+                            "data": {"webhook_id": webhook_id},
+                        }
+                    ),
+                }
+
             # Get the surveycake data using the svid and hash values
             encrypted_data = webhook_handler.get_surveycake_data(svid_value, hash_value)
 
@@ -78,8 +119,8 @@ def lambda_handler(event, context):  # pylint: disable=unused-argument
         try:
             # Decrypt the surveycake data using the hash and iv keys
             # hash_key and iv_key are stored in fetched dynamodb
-            decrypted_str = webhook_handler.crypto_handler.decrypt_data(
-                encrypted_data, webhook_details["hash_key"], webhook_details["iv_key"]
+            decrypted_str, webhook_details = webhook_handler.decrypt_surveycake_data(
+                webhook_repository, webhook_id, webhook_details, encrypted_data
             )
 
         except Exception as e:
@@ -102,7 +143,7 @@ def lambda_handler(event, context):  # pylint: disable=unused-argument
 
         # Prepare the email body to send the email
         email_body = email_service.prepare_email_body(webhook_details, recipient_email)
-        email_status = email_service.send_email(email_body)
+        email_status = email_service.dispatch_email(email_body)
         logger.info("Email status: %s", email_status)
 
         if email_status.get("statusCode") != 202:
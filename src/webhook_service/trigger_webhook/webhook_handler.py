@@ -77,3 +77,36 @@ class WebhookHandler:
             logger.warning("Unauthorized User-Agent: %s", user_agent)
             return False
         return True
+
+    def decrypt_surveycake_data(
+        self,
+        webhook_repository: Any,
+        webhook_id: str,
+        webhook_details: dict[str, Any],
+        encrypted_data: bytes,
+    ) -> tuple[str, dict[str, Any]]:
+        """
+        Decrypt the surveycake data with the webhook's keys. The details may
+        come from the cache, so a failure is retried once with the keys read
+        again from DynamoDB in case the webhook was updated.
+
+        :return: The decrypted data and the webhook details it was decrypted with
+        """
+        try:
+            decrypted_str = self.crypto_handler.decrypt_data(
+                encrypted_data, webhook_details["hash_key"], webhook_details["iv_key"]
+            )
+            return decrypted_str, webhook_details
+        except Exception:
+            webhook_repository.invalidate_webhook_details(webhook_id)
+            fresh_details = webhook_repository.get_webhook_details(webhook_id) or {}
+            if (fresh_details.get("hash_key"), fresh_details.get("iv_key")) == (
+                webhook_details["hash_key"],
+                webhook_details["iv_key"],
+            ):
+                raise
+            logger.info("Webhook %s keys changed, retrying decryption", webhook_id)
+            decrypted_str = self.crypto_handler.decrypt_data(
+                encrypted_data, fresh_details["hash_key"], fresh_details["iv_key"]
+            )
+            return decrypted_str, fresh_details
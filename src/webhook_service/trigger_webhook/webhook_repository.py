@@ -4,6 +4,8 @@ This module contains the repository for saving webhook data to a table named web
 
 import logging
 import os
+import time
+from collections import OrderedDict
 from typing import Any
 
 import boto3  # type: ignore # pylint: disable=import-error
@@ -11,6 +13,13 @@ import boto3  # type: ignore # pylint: disable=import-error
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+# Webhook details are cached per container, update_webhook runs in another
+# Lambda so the TTL bounds how long an edited webhook is served stale
+WEBHOOK_DETAILS_CACHE_TTL_SECONDS = int(
+    os.getenv("WEBHOOK_DETAILS_CACHE_TTL_SECONDS", "60")
+)
+WEBHOOK_DETAILS_CACHE_MAX_SIZE = int(os.getenv("WEBHOOK_DETAILS_CACHE_MAX_SIZE", "256"))
+
 
 class WebhookRepository:
     """Repository for saving webhooks to DynamoDB."""
@@ -21,16 +30,39 @@ class WebhookRepository:
         """
         self.dynamodb = boto3.resource("dynamodb")
         self.table = self.dynamodb.Table(os.getenv("DYNAMODB_TABLE"))
+        # webhook_id -> (expires_at, item)
+        self._cache: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
 
     def get_webhook_details(self, webhook_id: str) -> dict[str, Any] | None:
         """
-        Get a webhook item from the database.
+        Get a webhook item, from the container's TTL cache when possible.
         """
+        cached = self._cache.get(webhook_id)
+        if cached is not None:
+            expires_at, item = cached
+            if time.monotonic() < expires_at:
+                self._cache.move_to_end(webhook_id)
+                return item
+            del self._cache[webhook_id]
+
         try:
             response = self.table.get_item(Key={"webhook_id": webhook_id})
             item = response.get("Item")
             logger.info("Webhook details retrieved: %s", item)
+            if item is not None:
+                self._cache[webhook_id] = (
+                    time.monotonic() + WEBHOOK_DETAILS_CACHE_TTL_SECONDS,
+                    item,
+                )
+                if len(self._cache) > WEBHOOK_DETAILS_CACHE_MAX_SIZE:
+                    self._cache.popitem(last=False)
             return item
         except Exception as e:
             logger.error("Error getting webhook details: %s", str(e))
             raise
+
+    def invalidate_webhook_details(self, webhook_id: str) -> None:
+        """
+        Drop a webhook from the cache, so that the next read hits DynamoDB.
+        """
+        self._cache.pop(webhook_id, None)
@@ -0,0 +1,120 @@
+import datetime
+import logging
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import pytest
+from dotenv import load_dotenv
+
+# Load environment variables from .env file
+load_dotenv()
+
+# The repositories are imported from the Lambda source directory
+sys.path.insert(
+    0,
+    str(Path(__file__).resolve().parents[4] / "src" / "email_service" / "list_emails"),
+)
+
+from email_repository import EmailRepository  # noqa: E402
+from postgres_client import PostgresClient  # noqa: E402
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Test parameters
+BENCHMARK_RUN_ID = os.getenv("BENCHMARK_RUN_ID")
+BENCHMARK_PAGE_SIZE = int(os.getenv("BENCHMARK_PAGE_SIZE", "500"))
+BENCHMARK_ITERATIONS = int(os.getenv("BENCHMARK_ITERATIONS", "20"))
+
+
+def run_benchmark(email_repository: EmailRepository) -> dict[str, float]:
+    """
+    Lists the same page of emails repeatedly and measures each query.
+
+    Args:
+        email_repository: Repository wired to the backend under test.
+
+    Returns:
+        Latency percentiles in milliseconds and throughput in rows per second.
+    """
+    filter_criteria = {
+        "run_id": BENCHMARK_RUN_ID,
+        "limit": BENCHMARK_PAGE_SIZE,
+        "sort_by": "created_at",
+        "sort_order": "DESC",
+    }
+
+    # Warm up the connection (Data API TLS session, pool connection)
+    email_repository.list_emails(filter_criteria)
+
+    latencies = []
+    row_count = 0
+    for _ in range(BENCHMARK_ITERATIONS):
+        start = time.perf_counter()
+        emails = email_repository.list_emails(filter_criteria)
+        latencies.append(time.perf_counter() - start)
+        row_count += len(emails)
+
+    latencies.sort()
+    return {
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        "rows_per_second": row_count / sum(latencies),
+    }
+
+
+@pytest.mark.skipif(
+    not BENCHMARK_RUN_ID, reason="BENCHMARK_RUN_ID is required for the benchmark"
+)
+class TestDatabaseBackends:
+    def test_postgres_backend_against_data_api(self):
+        """
+        Compares the RDS Data API with the pooled PostgreSQL backend by:
+        1. Listing the same page of emails through both backends
+        2. Verifying both return the same rows
+        3. Logging latency and rows per second of each backend.
+        """
+        data_api_repository = EmailRepository()
+        data_api_repository._postgres_client = None
+
+        postgres_repository = EmailRepository()
+        postgres_repository._postgres_client = PostgresClient()
+
+        filter_criteria = {
+            "run_id": BENCHMARK_RUN_ID,
+            "limit": BENCHMARK_PAGE_SIZE,
+            "sort_by": "created_at",
+            "sort_order": "DESC",
+        }
+        data_api_emails = data_api_repository.list_emails(filter_criteria)
+        postgres_emails = postgres_repository.list_emails(filter_criteria)
+        assert [email["email_id"] for email in data_api_emails] == [
+            email["email_id"] for email in postgres_emails
+        ], "Both backends must return the same page"
+
+        results = {
+            "data_api": run_benchmark(data_api_repository),
+            "postgres": run_benchmark(postgres_repository),
+        }
+        for backend, result in results.items():
+            logger.info(
+                "%s: p50 %.1f ms, p95 %.1f ms, %.0f rows/s (page size %d, %d iterations)",
+                backend,
+                result["p50_ms"],
+                result["p95_ms"],
+                result["rows_per_second"],
+                BENCHMARK_PAGE_SIZE,
+                BENCHMARK_ITERATIONS,
+            )
+
+
+if __name__ == "__main__":
+    # Generate timestamp for the report file
+    timestamp = datetime.datetime.now(datetime.UTC).strftime("%Y%m%dT%H%M%SZ")
+    report_file = f"./pytest-report_{timestamp}.html"
+
+    # Run tests and generate HTML report
+    pytest.main([__file__, "-v", f"--html={report_file}", "--self-contained-html"])
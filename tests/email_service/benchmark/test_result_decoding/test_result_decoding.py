@@ -0,0 +1,160 @@
+import datetime
+import json
+import logging
+import os
+import sys
+import timeit
+from pathlib import Path
+
+import pytest
+
+# The repository reads its configuration at import time, no AWS call is made
+os.environ.setdefault("DATABASE_NAME", "email_service_db")
+os.environ.setdefault("RDS_CLUSTER_ARN", "benchmark")
+os.environ.setdefault("RDS_CLUSTER_MASTER_USER_SECRET_ARN", "benchmark")
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+
+# The repository is imported from the Lambda source directory
+sys.path.insert(
+    0,
+    str(Path(__file__).resolve().parents[4] / "src" / "email_service" / "list_emails"),
+)
+
+from email_repository import decode_records, parse_field  # noqa: E402
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Test parameters
+PAGE_SIZE = 5000  # Rows per emails page
+REPEAT = 5  # Timed repetitions of each decoder, the best one is reported
+
+# Column layout of SELECT * FROM emails as returned by the Data API
+EMAIL_COLUMN_METADATA = [
+    {"name": "email_id", "typeName": "varchar"},
+    {"name": "run_id", "typeName": "varchar"},
+    {"name": "attachment_file_ids", "typeName": "jsonb"},
+    {"name": "bcc", "typeName": "jsonb"},
+    {"name": "cc", "typeName": "jsonb"},
+    {"name": "created_at", "typeName": "timestamptz"},
+    {"name": "display_name", "typeName": "varchar"},
+    {"name": "is_generate_certificate", "typeName": "bool"},
+    {"name": "recipient_email", "typeName": "varchar"},
+    {"name": "reply_to", "typeName": "varchar"},
+    {"name": "row_data", "typeName": "jsonb"},
+    {"name": "sender_id", "typeName": "varchar"},
+    {"name": "sender_local_part", "typeName": "varchar"},
+    {"name": "sender_username", "typeName": "varchar"},
+    {"name": "sent_at", "typeName": "timestamptz"},
+    {"name": "spreadsheet_file_id", "typeName": "varchar"},
+    {"name": "status", "typeName": "varchar"},
+    {"name": "subject", "typeName": "varchar"},
+    {"name": "template_file_id", "typeName": "varchar"},
+    {"name": "updated_at", "typeName": "timestamptz"},
+]
+
+
+def build_email_records(row_count: int) -> list[list[dict]]:
+    """
+    Builds Data API records shaped like a page of the emails table.
+
+    Args:
+        row_count: Number of rows to build.
+
+    Returns:
+        The records, one list of fields per row.
+    """
+    records = []
+    for index in range(row_count):
+        row_data = {"Name": f"Recipient {index}", "Email": f"user{index}@example.com"}
+        records.append(
+            [
+                {"stringValue": f"email-{index:05d}"},
+                {"stringValue": "run-benchmark"},
+                {"stringValue": json.dumps(["file-1", "file-2"])},
+                {"stringValue": "[]"},
+                {"stringValue": json.dumps(["cc@example.com"])},
+                {"stringValue": "2025-06-01 12:00:00.123456"},
+                {"stringValue": "AWS Educate"},
+                {"booleanValue": index % 2 == 0},
+                {"stringValue": f"user{index}@example.com"},
+                {"isNull": True},
+                {"stringValue": json.dumps(row_data)},
+                {"stringValue": "sender-1"},
+                {"stringValue": "no-reply"},
+                {"stringValue": "sender"},
+                {"isNull": True}
+                if index % 3
+                else {"stringValue": "2025-06-01 12:01:00"},
+                {"stringValue": "spreadsheet-1"},
+                {"stringValue": "SUCCESS"},
+                {"stringValue": "Benchmark subject"},
+                {"stringValue": "template-1"},
+                {"stringValue": "2025-06-01 12:01:00.654321"},
+            ]
+        )
+    return records
+
+
+def decode_with_parse_field(
+    column_metadata: list[dict], records: list[list[dict]]
+) -> list[dict]:
+    """The per-cell decoding the repositories used before decode_records."""
+    columns = [col["name"] for col in column_metadata]
+    return [
+        {col: parse_field(col, val) for col, val in zip(columns, row, strict=False)}
+        for row in records
+    ]
+
+
+class TestResultDecoding:
+    @pytest.fixture(autouse=True)
+    def setup(self) -> None:
+        """Builds the emails page shared by the benchmark."""
+        self.records = build_email_records(PAGE_SIZE)
+
+    def test_decode_records_matches_parse_field(self):
+        """decode_records must return exactly what parse_field returned."""
+        assert decode_records(EMAIL_COLUMN_METADATA, self.records) == (
+            decode_with_parse_field(EMAIL_COLUMN_METADATA, self.records)
+        )
+
+    def test_decode_records_benchmark(self):
+        """
+        Benchmarks decoding a 5,000-row emails page by:
+        1. Timing the per-cell parse_field decoding
+        2. Timing the compiled, column-wise decode_records
+        3. Logging both timings and the speedup.
+        """
+        parse_field_seconds = min(
+            timeit.repeat(
+                lambda: decode_with_parse_field(EMAIL_COLUMN_METADATA, self.records),
+                number=1,
+                repeat=REPEAT,
+            )
+        )
+        decode_records_seconds = min(
+            timeit.repeat(
+                lambda: decode_records(EMAIL_COLUMN_METADATA, self.records),
+                number=1,
+                repeat=REPEAT,
+            )
+        )
+
+        logger.info(
+            "%d rows: parse_field %.1f ms, decode_records %.1f ms, %.1fx faster",
+            PAGE_SIZE,
+            parse_field_seconds * 1000,
+            decode_records_seconds * 1000,
+            parse_field_seconds / decode_records_seconds,
+        )
+        assert decode_records_seconds < parse_field_seconds
+
+
+if __name__ == "__main__":
+    # Generate timestamp for the report file
+    timestamp = datetime.datetime.now(datetime.UTC).strftime("%Y%m%dT%H%M%SZ")
+    report_file = f"./pytest-report_{timestamp}.html"
+
+    # Run tests and generate HTML report
+    pytest.main([__file__, "-v", f"--html={report_file}", "--self-contained-html"])
@@ -0,0 +1,158 @@
+import datetime
+import json
+import logging
+import os
+import sys
+from pathlib import Path
+
+import pytest
+from dotenv import load_dotenv
+
+# Load environment variables from .env file
+load_dotenv()
+
+# The repositories are imported from the Lambda source directories
+LAMBDA_SOURCE_PATH = Path(__file__).resolve().parents[4] / "src" / "email_service"
+sys.path.insert(0, str(LAMBDA_SOURCE_PATH / "list_runs"))
+sys.path.insert(0, str(LAMBDA_SOURCE_PATH / "list_emails"))
+
+import psycopg  # noqa: E402
+from email_repository import (  # noqa: E402
+    INDEXED_SORT_COLUMNS as EMAIL_SORT_COLUMNS,
+)
+from email_repository import EmailRepository  # noqa: E402
+from postgres_client import NAMED_PARAMETER_PATTERN  # noqa: E402
+from run_repository import INDEXED_SORT_COLUMNS as RUN_SORT_COLUMNS  # noqa: E402
+from run_repository import RunRepository  # noqa: E402
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+DATABASE_HOST = os.getenv("DATABASE_HOST")
+
+# Plan nodes meaning a page is sorted instead of read in order from an index
+SORT_NODE_TYPES = {"Sort", "Incremental Sort"}
+
+# Every filter combination accepted by the list endpoints
+EMAIL_FILTERS = [
+    {"run_id": "query-plan-run"},
+    {"run_id": "query-plan-run", "status": "SUCCESS"},
+]
+RUN_FILTERS = [
+    {},
+    {"sender_id": "query-plan-sender"},
+    {"sender_id": "query-plan-sender", "created_year": "2026"},
+    {"created_year": "2026"},
+    {"run_type": "WEBHOOK"},
+]
+CURSOR_CREATED_AT = "2026-01-01 00:00:00"
+
+
+@pytest.fixture(scope="module")
+def connection():
+    """A connection with sorting disabled, so any index-ordered plan wins."""
+    with psycopg.connect(
+        host=DATABASE_HOST,
+        port=int(os.getenv("DATABASE_PORT", "5432")),
+        dbname=os.getenv("DATABASE_NAME"),
+        user=os.getenv("DATABASE_USER"),
+        password=os.getenv("DATABASE_PASSWORD"),
+        autocommit=True,
+    ) as conn:
+        conn.execute("SET enable_sort = off")
+        yield conn
+
+
+def explain(connection, sql: str, parameters: list[dict]) -> dict:
+    """
+    Returns the plan of a statement written for the RDS Data API.
+
+    Args:
+        connection: The database connection.
+        sql: SQL with ':name' placeholders.
+        parameters: Data API parameter list.
+
+    Returns:
+        The root node of the JSON plan.
+    """
+    query = NAMED_PARAMETER_PATTERN.sub(r"%(\1)s", sql.replace("%", "%%"))
+    values = {}
+    for parameter in parameters:
+        value = parameter["value"]
+        values[parameter["name"]] = (
+            None if value.get("isNull") else next(iter(value.values()))
+        )
+    row = connection.execute(f"EXPLAIN (FORMAT JSON) {query}", values).fetchone()
+    return row[0][0]["Plan"]
+
+
+def find_sort_nodes(plan: dict) -> list[dict]:
+    """Returns the sort nodes of a plan tree."""
+    nodes = [plan] if plan["Node Type"] in SORT_NODE_TYPES else []
+    for child in plan.get("Plans", []):
+        nodes.extend(find_sort_nodes(child))
+    return nodes
+
+
+def assert_index_ordered(connection, sql: str, parameters: list[dict]) -> None:
+    plan = explain(connection, sql, parameters)
+    sort_nodes = find_sort_nodes(plan)
+    if sort_nodes:
+        logger.error("Plan needing a sort:\n%s", json.dumps(plan, indent=2))
+    assert not sort_nodes, (
+        f"Sorted by {[node.get('Sort Key') for node in sort_nodes]} instead of an index"
+    )
+
+
+@pytest.mark.skipif(
+    not DATABASE_HOST, reason="DATABASE_HOST is required for the query plan check"
+)
+class TestListQueryPlans:
+    @pytest.mark.parametrize("use_cursor", [False, True])
+    @pytest.mark.parametrize("sort_order", ["ASC", "DESC"])
+    @pytest.mark.parametrize("sort_by", EMAIL_SORT_COLUMNS)
+    @pytest.mark.parametrize("filters", EMAIL_FILTERS, ids=json.dumps)
+    def test_list_emails_is_index_ordered(
+        self, connection, filters, sort_by, sort_order, use_cursor
+    ):
+        filter_criteria = {
+            **filters,
+            "sort_by": sort_by,
+            "sort_order": sort_order,
+            "limit": 50,
+            "page": 2,
+        }
+        if use_cursor:
+            filter_criteria["cursor"] = {
+                "created_at": CURSOR_CREATED_AT,
+                "email_id": "query-plan-email",
+            }
+
+        sql, parameters = EmailRepository()._build_list_emails_sql(
+            select_clause="*", filter_criteria_dict=filter_criteria
+        )
+        assert_index_ordered(connection, sql, parameters)
+
+    @pytest.mark.parametrize("sort_order", ["ASC", "DESC"])
+    @pytest.mark.parametrize("sort_by", RUN_SORT_COLUMNS)
+    @pytest.mark.parametrize("filters", RUN_FILTERS, ids=json.dumps)
+    def test_list_runs_is_index_ordered(self, connection, filters, sort_by, sort_order):
+        params = {
+            **filters,
+            "sort_by": sort_by,
+            "sort_order": sort_order,
+            "limit": 50,
+            "page": 2,
+        }
+
+        sql, parameters = RunRepository()._build_list_runs_sql("*", params)
+        assert_index_ordered(connection, sql, parameters)
+
+
+if __name__ == "__main__":
+    # Generate timestamp for the report file
+    timestamp = datetime.datetime.now(datetime.UTC).strftime("%Y%m%dT%H%M%SZ")
+    report_file = f"./pytest-report_{timestamp}.html"
+
+    # Run tests and generate HTML report
+    pytest.main([__file__, "-v", f"--html={report_file}", "--self-contained-html"])